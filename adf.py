@@ -0,0 +1,244 @@
+import sys
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+# Nodes rendered on their own line(s); unknown nodes with content are treated the same
+BLOCK_NODES = {
+    "doc", "paragraph", "heading", "blockquote", "panel", "expand", "nestedExpand",
+    "mediaSingle", "mediaGroup", "layoutSection", "layoutColumn", "bodiedExtension",
+    "table",
+}
+LIST_NODES = {"bulletList", "orderedList", "taskList", "decisionList"}
+CARD_NODES = {"inlineCard", "blockCard", "embedCard"}
+# Containers whose content continues the current line (list items get their marker first)
+INLINE_CONTAINERS = {"listItem", "taskItem", "decisionItem"}
+
+# Stack control entries besides nodes and literal strings
+_BREAK = ("break", None)
+
+
+def _date(attrs: dict) -> str:
+    try:
+        return datetime.fromtimestamp(int(attrs.get("timestamp")) / 1000, tz=timezone.utc).date().isoformat()
+    except (TypeError, ValueError):
+        return ""
+
+
+def _inline_leaf(node_type: Any, attrs: dict) -> Optional[str]:
+    """Text for an inline leaf node other than ``text``; None if it isn't one."""
+    if node_type == "mention":
+        return attrs.get("text") or f"@{attrs.get('id', 'someone')}"
+    if node_type == "emoji":
+        return attrs.get("text") or attrs.get("shortName") or ""
+    if node_type == "date":
+        return _date(attrs)
+    if node_type == "status":
+        return f"[{attrs.get('text', '')}]"
+    if node_type in CARD_NODES and attrs.get("url"):
+        return f"[Link: {attrs['url']}]"
+    if node_type == "media":
+        alt = attrs.get("alt")
+        return f"[Attachment: {alt}]" if alt else "[Attachment]"
+    return None
+
+
+def _plain_text(children: Any) -> Optional[str]:
+    """The text of a run of inline leaves, or None if anything else is mixed in."""
+    texts = []
+    for child in children:
+        if type(child) is not dict:
+            return None
+        node_type = child.get("type")
+        if node_type == "text":
+            texts.append(child.get("text") or "")
+            continue
+        if node_type == "hardBreak":
+            texts.append("\n")
+            continue
+        text = _inline_leaf(node_type, child.get("attrs") or {})
+        if text is None:
+            return None
+        # Cards and lozenges often sit right after a word with no space in between
+        if texts and texts[-1] and not texts[-1][-1].isspace():
+            text = " " + text
+        texts.append(text)
+    return "".join(texts)
+
+
+def _plain_list(items: Any, start: Optional[int], indent: str) -> Optional[List[str]]:
+    """Lines for a bullet/ordered list whose items are each one plain paragraph, else None."""
+    lines = []
+    for index, item in enumerate(items):
+        content = item.get("content") if type(item) is dict and item.get("type") == "listItem" else None
+        if not content or len(content) != 1 or type(content[0]) is not dict or content[0].get("type") != "paragraph":
+            return None
+        text = _plain_text(content[0].get("content") or ())
+        if text is None or "\n" in text:
+            return None
+        lines.append(f"{indent}{start + index}. {text}" if start is not None else f"{indent}- {text}")
+    return lines
+
+
+def adf_to_text(doc: Any, max_length: Optional[int] = None) -> str:
+    """Render an Atlassian Document Format tree as plain text.
+
+    Walks the tree with an explicit stack, so nesting depth is unbounded, and
+    stops as soon as ``max_length`` characters have been produced. Paragraphs
+    and other blocks go on their own lines, lists keep their markers and
+    nesting, tables become ``a | b`` rows, code blocks are fenced, and
+    mentions, emoji, dates, status lozenges, cards and media become short
+    inline text.
+    """
+    parts: List[str] = []
+    limit = sys.maxsize if max_length is None else max_length
+    length = 0
+    blank = True     # the current line holds nothing but indentation or a list marker
+    pending = False  # a space owed between blocks inside a table cell
+    depth = 0        # list nesting
+    inline = False   # inside a table cell, where blocks run together on one line
+
+    # Children are pushed reversed so they pop in document order; control
+    # entries restore depth/inline once a list or table row is finished.
+    # Each step may ask for a line break (brk) and then emit some text.
+    if type(doc) is dict and doc.get("type") == "doc":
+        # The root needs no line breaks of its own
+        stack: List[Any] = list(reversed(doc.get("content") or ()))
+    else:
+        stack = [doc]
+    pop, push, extend = stack.pop, stack.append, stack.extend
+    while stack and length < limit:
+        item = pop()
+        kind = type(item)
+        brk = False
+        text = None
+        if kind is dict:
+            node_type = item.get("type")
+            if node_type == "text":
+                text = item.get("text")
+            else:
+                children = item.get("content") or ()
+                if node_type == "paragraph" and not inline:
+                    # Fast path for the common case: a paragraph of plain text runs
+                    text = _plain_text(children)
+                    if text is not None:
+                        if not blank:
+                            parts.append("\n")
+                            length += 1
+                        if text:
+                            parts.append(text)
+                            length += len(text)
+                            blank = text[-1] == "\n"
+                        if not blank:
+                            parts.append("\n")
+                            length += 1
+                            blank = True
+                        continue
+                if node_type == "paragraph" or node_type in BLOCK_NODES:
+                    brk = True
+                    push(_BREAK)
+                    extend(reversed(children))
+                else:
+                    attrs = item.get("attrs") or {}
+                    leaf = _inline_leaf(node_type, attrs)
+                    if node_type == "hardBreak":
+                        brk = True
+                    elif leaf is not None:
+                        text = leaf
+                        if parts and not blank and not parts[-1][-1].isspace():
+                            text = " " + text
+                    elif node_type == "rule":
+                        brk, text = True, "---"
+                        push(_BREAK)
+                    elif node_type == "codeBlock":
+                        brk = True
+                        if not inline:
+                            text = f"```{attrs.get('language') or ''}\n"
+                            push(_BREAK)
+                            push("\n```")
+                        extend(reversed(children))
+                    elif node_type in LIST_NODES:
+                        start = attrs.get("order", 1) if node_type == "orderedList" else None
+                        indent = "  " * depth
+                        lines = None if inline else _plain_list(children, start, indent)
+                        if lines is not None:
+                            # Every item is a single plain paragraph: write the list in one go
+                            text = "\n".join(lines) + "\n"
+                            if not blank:
+                                text = "\n" + text
+                            parts.append(text)
+                            length += len(text)
+                            blank = True
+                            continue
+                        push(("depth", depth))
+                        push(_BREAK)
+                        for index in range(len(children) - 1, -1, -1):
+                            child = children[index]
+                            if isinstance(child, dict) and child.get("type") == "taskItem":
+                                bullet = "[x] " if (child.get("attrs") or {}).get("state") == "DONE" else "[ ] "
+                            else:
+                                bullet = f"{start + index}. " if start is not None else "- "
+                            push(child)
+                            push(("marker", indent + bullet))
+                        push(("depth", depth + 1))
+                    elif node_type == "tableRow":
+                        brk = True
+                        push(("inline", inline))
+                        push(_BREAK)
+                        for index in range(len(children) - 1, -1, -1):
+                            push(children[index])
+                            if index:
+                                push(" | ")
+                        push(("inline", True))
+                    elif children and node_type not in INLINE_CONTAINERS:
+                        # Unknown containers are laid out as blocks
+                        brk = True
+                        push(_BREAK)
+                        extend(reversed(children))
+                    elif children:
+                        extend(reversed(children))
+                    else:
+                        text = attrs.get("text")
+        elif item is _BREAK:
+            brk = True
+        elif kind is str:
+            text = item
+        elif kind is list:
+            extend(reversed(item))
+            continue
+        else:
+            op, value = item
+            if op == "marker":
+                if not blank and not inline:
+                    parts.append("\n")
+                    length += 1
+                parts.append(value)
+                length += len(value)
+                blank = True
+                continue
+            elif op == "depth":
+                depth = value
+            else:
+                inline = value
+
+        if brk and not blank:
+            if inline:
+                pending = True
+            else:
+                parts.append("\n")
+                length += 1
+                blank = True
+        if text:
+            if pending:
+                pending = False
+                if not blank and not text[0].isspace() and not parts[-1][-1].isspace():
+                    text = " " + text
+            parts.append(text)
+            length += len(text)
+            blank = text[-1] == "\n"
+
+    text = "".join(parts)
+    if length > limit:
+        text = text[:limit]
+    if " \n" in text:
+        text = "\n".join(line.rstrip() for line in text.splitlines())
+    return text.strip()
@@ -3,53 +3,182 @@
 
 import os
 import json
-import requests
+import functools
 import re
+import sys
+import time
 import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 from rich.prompt import Prompt, Confirm
-import openai
 from dotenv import load_dotenv
-from cache import Cache, SemanticCache
+from adf import adf_to_text
+from cache import open_cache
+from lazy_import import LazyModule
+from metrics import (
+    LLM_COMPLETION_TOKENS, LLM_FIRST_TOKEN, LLM_IN_FLIGHT, LLM_LATENCY, LLM_PROMPT_TOKENS, LLM_REQUESTS,
+    LLM_TOKEN_RATE, cache_summary, get_registry, llm_summary, single_flight_summary,
+)
+from semantic_cache import ANCHOR_FIELDS, SemanticCache
+from single_flight import get_flight, request_key
+from streaming import LivePanel, TokenCallback, strip_think
+from structured_output import (
+    ANALYSIS_JSON_INSTRUCTIONS, ANALYSIS_SCHEMA, StructuredOutputError, extract_json, parse_structured, repair_prompt,
+)
+from prefetch import SuggestionPrefetcher
+from priority_engine import PriorityEngine
+from prompt_packer import PackedPrompt, PromptPacker
 from session_manager import SessionManager
+from sync_daemon import DaemonClient
+from ticket_store import QueryError, TicketStore
+from tracing import bind, get_tracer, profile_call, span, traced
+
+# Heavy dependencies are imported on first use so the first prompt shows quickly
+openai = LazyModule("openai")
+requests = LazyModule("requests")
+http_client = LazyModule("http_client")
 
 # Load environment variables
 load_dotenv()
 
 console = Console()
 
+# Cache lifetimes (seconds). LLM answers go stale after a day; a changelog is
+# keyed by the issue's updated time, so it only needs evicting eventually.
+LLM_CACHE_TTL = 24 * 3600
+ASSESSMENT_TTL = 7 * 24 * 3600
+CHANGELOG_TTL = 30 * 24 * 3600
+
+
+# Contexts passed to LLMClient.suggest_action; shared so prefetched answers hit the cache
+CONTEXT_DEFAULT = ""
+CONTEXT_HELP = "The user specifically asked for help with this ticket"
+CONTEXT_RESEARCH = "Research this issue deeply and provide technical insights"
+CONTEXT_PLAN = "Create a detailed step-by-step action plan to resolve this ticket"
+
 # ==============================================================================
 # DATA MODELS
 # ==============================================================================
 
-@dataclass
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _epoch(value: Any) -> int:
+    """Normalize a datetime, ISO string or number to epoch seconds"""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, str):
+        return int(datetime.fromisoformat(value).timestamp())
+    return int(value)
+
+
 class Ticket:
-    key: str
-    summary: str
-    description: str
-    priority: str
-    status: str
-    assignee: Optional[str]
-    created: datetime
-    updated: datetime
-    comments_count: int
-    labels: List[str]
-    issue_type: str
-    raw_data: Dict[str, Any]
-    
+    """A Jira issue in compact form.
+
+    Slotted, with repeated enum-like strings (status, priority, type,
+    labels, assignee) interned, and timestamps held as epoch seconds.
+    ``created``/``updated`` are still exposed as naive datetimes.
+    ``raw_data`` is optional and only kept when explicitly requested.
+    """
+
+    __slots__ = (
+        'key', 'summary', 'description', 'priority', 'status', 'assignee',
+        'created_ts', 'updated_ts', 'comments_count', 'labels', 'issue_type', 'raw_data',
+    )
+
+    def __init__(self, key: str, summary: str, description: str, priority: str, status: str,
+                 assignee: Optional[str], created: Any, updated: Any, comments_count: int,
+                 labels: List[str], issue_type: str, raw_data: Optional[Dict[str, Any]] = None):
+        self.key = key
+        self.summary = summary
+        self.description = description
+        self.priority = _intern(priority)
+        self.status = _intern(status)
+        self.assignee = _intern(assignee)
+        self.created_ts = _epoch(created)
+        self.updated_ts = _epoch(updated)
+        self.comments_count = comments_count
+        self.labels = [sys.intern(label) for label in labels]
+        self.issue_type = _intern(issue_type)
+        self.raw_data = raw_data
+
+    @property
+    def created(self) -> datetime:
+        return datetime.fromtimestamp(self.created_ts)
+
+    @created.setter
+    def created(self, value: Any) -> None:
+        self.created_ts = _epoch(value)
+
+    @property
+    def updated(self) -> datetime:
+        return datetime.fromtimestamp(self.updated_ts)
+
+    @updated.setter
+    def updated(self, value: Any) -> None:
+        self.updated_ts = _epoch(value)
+
     @property
     def age_days(self) -> int:
-        return (datetime.now() - self.created).days
+        return (int(time.time()) - self.created_ts) // 86400
     
     @property
     def stale_days(self) -> int:
-        return (datetime.now() - self.updated).days
+        return (int(time.time()) - self.updated_ts) // 86400
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form; timestamps stay as epoch integers"""
+        return {
+            'key': self.key,
+            'summary': self.summary,
+            'description': self.description,
+            'priority': self.priority,
+            'status': self.status,
+            'assignee': self.assignee,
+            'created': self.created_ts,
+            'updated': self.updated_ts,
+            'comments_count': self.comments_count,
+            'labels': list(self.labels),
+            'issue_type': self.issue_type,
+            'raw_data': self.raw_data,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Ticket':
+        """Build a Ticket from ``to_dict`` output (ISO date strings are also accepted)"""
+        return cls(
+            key=data['key'],
+            summary=data['summary'],
+            description=data['description'],
+            priority=data['priority'],
+            status=data['status'],
+            assignee=data.get('assignee'),
+            created=data['created'],
+            updated=data['updated'],
+            comments_count=data.get('comments_count', 0),
+            labels=data.get('labels', []),
+            issue_type=data.get('issue_type', ''),
+            raw_data=data.get('raw_data'),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Ticket):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None  # mutable, like the dataclass it replaced
+
+    def __repr__(self) -> str:
+        return f"Ticket(key={self.key!r}, priority={self.priority!r}, status={self.status!r}, updated={self.updated.isoformat()!r})"
 
 @dataclass
 class WorkloadAnalysis:
@@ -60,53 +189,245 @@ class WorkloadAnalysis:
     other_notable: List[Ticket]
     summary: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form; tickets are referenced by key"""
+        return {
+            'top_priority': self.top_priority.key,
+            'priority_reasoning': self.priority_reasoning,
+            'next_steps': list(self.next_steps),
+            'can_help_with': list(self.can_help_with),
+            'other_notable': [t.key for t in self.other_notable],
+            'summary': self.summary,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], tickets: List[Ticket]) -> Optional['WorkloadAnalysis']:
+        """Rebuild from ``to_dict`` output against ``tickets``; None if the top ticket is gone"""
+        by_key = {t.key: t for t in tickets}
+        top = by_key.get(data.get('top_priority'))
+        if top is None:
+            return None
+        return cls(
+            top_priority=top,
+            priority_reasoning=data.get('priority_reasoning', ''),
+            next_steps=data.get('next_steps', []),
+            can_help_with=data.get('can_help_with', []),
+            other_notable=[by_key[key] for key in data.get('other_notable', []) if key in by_key],
+            summary=data.get('summary', ''),
+        )
+
 # ==============================================================================
 # JIRA CLIENT
 # ==============================================================================
 
 class JiraClient:
-    def __init__(self):
-        self.base_url = os.getenv('JIRA_BASE_URL')
-        self.email = os.getenv('JIRA_EMAIL')
-        self.api_token = os.getenv('JIRA_API_TOKEN')
+    DEFAULT_JQL = 'assignee = currentUser() AND statusCategory != Done ORDER BY priority DESC, updated DESC'
+    # Only the fields the Ticket model reads; changelog is fetched per issue on demand
+    TICKET_FIELDS = 'summary,description,priority,status,assignee,created,updated,comment,labels,issuetype'
+
+    def __init__(self, base_url: Optional[str] = None, email: Optional[str] = None,
+                 api_token: Optional[str] = None):
+        """Connect to one Jira site; anything not given comes from the JIRA_* variables."""
+        self.base_url = (base_url or os.getenv('JIRA_BASE_URL') or '').rstrip('/') or None
+        self.email = email or os.getenv('JIRA_EMAIL')
+        self.api_token = api_token or os.getenv('JIRA_API_TOKEN')
         
         if not all([self.base_url, self.email, self.api_token]):
             raise ValueError("Missing Jira credentials in environment variables")
         
         self.auth = (self.email, self.api_token)
         self.headers = {"Accept": "application/json", "Content-Type": "application/json"}
+        self.http = http_client.get_http_client()
+        # Raw payloads are only needed for debugging; skipping them keeps tickets small
+        self.keep_raw = os.getenv('TICKET_KEEP_RAW', '0') == '1'
+        self.changelog_cache = open_cache('changelog', ttl=CHANGELOG_TTL)
+        # Jira caps search pages at 100 issues; later pages are fetched in parallel
+        self.page_size = int(os.getenv('JIRA_PAGE_SIZE', '100'))
+        self.max_workers = max(1, int(os.getenv('JIRA_MAX_WORKERS', '4')))
+        # Rendered ADF descriptions stop here; very long documents are cut off early
+        self.description_chars = int(os.getenv('DESCRIPTION_MAX_CHARS', '20000'))
+        # Parsed tickets by (key, updated): an unchanged issue is never parsed twice
+        self._parsed: "OrderedDict[Tuple[str, str], Ticket]" = OrderedDict()
+        self._parsed_lock = threading.Lock()
+        self.parse_cache_size = int(os.getenv('PARSE_CACHE_SIZE', '20000'))
+        self.parse_cache_hits = 0
     
-    def get_my_tickets(self, jql: Optional[str] = None) -> List[Ticket]:
+    def get_my_tickets(self, jql: Optional[str] = None,
+                       on_progress: Optional[Callable[[int, int], None]] = None) -> List[Ticket]:
         """Fetch tickets assigned to you or created by you"""
-        if not jql:
-            jql = f'assignee = currentUser() AND statusCategory != Done ORDER BY priority DESC, updated DESC'
-        
-        url = f"{self.base_url}/rest/api/3/search"
-        params = {
-            'jql': jql,
-            'maxResults': 50,
-            'fields': 'summary,description,priority,status,assignee,created,updated,comment,labels,issuetype',
-            'expand': 'changelog'
-        }
-        
         try:
-            response = requests.get(url, auth=self.auth, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            tickets = []
-            for issue in data['issues']:
-                tickets.append(self._parse_ticket(issue))
-            
+            tickets = self.search_tickets(jql, on_progress=on_progress)
             console.print(f"✅ Fetched {len(tickets)} tickets from Jira")
             return tickets
             
         except requests.RequestException as e:
             console.print(f"❌ Error fetching tickets: {e}", style="red")
             return []
+
+    def search_tickets(self, jql: Optional[str] = None,
+                       on_progress: Optional[Callable[[int, int], None]] = None) -> List[Ticket]:
+        """Fetch all tickets matching ``jql`` (default: your open tickets).
+
+        Unlike ``get_my_tickets`` this prints nothing and raises
+        ``requests.RequestException`` on failure.
+        """
+        issues = self._search(jql or self.DEFAULT_JQL, fields=self.TICKET_FIELDS, on_progress=on_progress)
+        with span("jira.parse", tickets=len(issues)):
+            return [self._parse_ticket(issue) for issue in issues]
+
+    def get_updated_tickets(self, since: datetime, jql: Optional[str] = None) -> List[Ticket]:
+        """Fetch only tickets updated at or after ``since`` (delta sync).
+
+        Raises ``requests.RequestException`` so callers can fall back to a full sync.
+        """
+        clause = f'updated >= "{since.strftime("%Y-%m-%d %H:%M")}"'
+        issues = self._search(self._and_jql(jql or self.DEFAULT_JQL, clause), fields=self.TICKET_FIELDS)
+        with span("jira.parse", tickets=len(issues)):
+            return [self._parse_ticket(issue) for issue in issues]
+
+    def get_ticket_keys(self, jql: Optional[str] = None) -> List[str]:
+        """Return the keys currently matching the JQL, in JQL order, without any fields"""
+        issues = self._search(jql or self.DEFAULT_JQL, fields='key')
+        return [issue['key'] for issue in issues]
+
+    def get_tickets_by_key(self, keys: List[str]) -> List[Ticket]:
+        """Fetch specific tickets by key"""
+        if not keys:
+            return []
+        jql = "key in ({})".format(", ".join(f'"{k}"' for k in keys))
+        issues = self._search(jql, fields=self.TICKET_FIELDS)
+        with span("jira.parse", tickets=len(issues)):
+            return [self._parse_ticket(issue) for issue in issues]
+
+    @staticmethod
+    def _and_jql(jql: str, clause: str) -> str:
+        """AND an extra clause into a JQL query, keeping any ORDER BY at the end"""
+        match = re.search(r'\border\s+by\b', jql, re.IGNORECASE)
+        where, order = (jql[:match.start()].strip(), ' ' + jql[match.start():]) if match else (jql.strip(), '')
+        return f"({where}) AND {clause}{order}" if where else f"{clause}{order}"
+
+    @traced("jira.search")
+    def _search(self, jql: str, fields: str, expand: Optional[str] = None,
+                on_progress: Optional[Callable[[int, int], None]] = None) -> List[Dict[str, Any]]:
+        """Run a JQL search across all result pages, preserving JQL order.
+
+        The first page tells us ``total``; the remaining ``startAt`` offsets
+        are then fetched concurrently on a bounded pool. Servers that page
+        with ``nextPageToken`` instead are followed sequentially.
+        """
+        url = f"{self.base_url}/rest/api/3/search"
+        params = {'jql': jql, 'maxResults': self.page_size, 'fields': fields}
+        if expand:
+            params['expand'] = expand
+
+        first = self._fetch_page(url, {**params, 'startAt': 0})
+        issues = list(first.get('issues', []))
+        total = first.get('total')
+        if on_progress:
+            on_progress(len(issues), total if total is not None else len(issues))
+
+        if total is None:
+            # Token-cursor pagination (/search/jql): pages must be walked in order
+            token = first.get('nextPageToken')
+            while token and not first.get('isLast', False):
+                first = self._fetch_page(url, {**params, 'nextPageToken': token})
+                issues.extend(first.get('issues', []))
+                token = first.get('nextPageToken')
+                if on_progress:
+                    on_progress(len(issues), len(issues))
+            return issues
+
+        # Servers may cap maxResults below what we asked for
+        page_size = first.get('maxResults') or self.page_size
+        if page_size <= 0 or total <= len(issues):
+            return issues
+        offsets = list(range(len(issues), total, page_size))
+
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        fetched = len(issues)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(offsets))) as pool:
+            futures = {
+                pool.submit(self._fetch_page, url, {**params, 'startAt': offset, 'maxResults': page_size}): offset
+                for offset in offsets
+            }
+            for future in as_completed(futures):
+                page_issues = future.result().get('issues', [])
+                pages[futures[future]] = page_issues
+                fetched += len(page_issues)
+                if on_progress:
+                    on_progress(fetched, total)
+
+        for offset in offsets:
+            issues.extend(pages[offset])
+        return issues
+
+    @traced("jira.changelog")
+    def get_changelog(self, ticket: Ticket) -> List[Dict[str, Any]]:
+        """Return the issue's change history, oldest first.
+
+        Loaded lazily from the per-issue changelog endpoint and cached by
+        ``(key, updated)``, so it is only refetched after the issue changes.
+        """
+        cache_key = f"{ticket.key}:{ticket.updated.isoformat()}"
+        cached = self.changelog_cache.get(cache_key)
+        if cached is not None:
+            return cached.get("histories", [])
+
+        url = f"{self.base_url}/rest/api/3/issue/{ticket.key}/changelog"
+        histories: List[Dict[str, Any]] = []
+        start = 0
+        while True:
+            page = self._fetch_page(url, {'startAt': start, 'maxResults': self.page_size})
+            values = page.get('values', [])
+            histories.extend(self._compact_history(h) for h in values)
+            start += len(values)
+            if page.get('isLast', True) or not values or start >= page.get('total', start):
+                break
+
+        self.changelog_cache.set(cache_key, {"histories": histories})
+        return histories
+
+    @staticmethod
+    def _compact_history(history: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only who/when/what from a changelog entry (drops avatars and ids)"""
+        return {
+            'created': history.get('created'),
+            'author': (history.get('author') or {}).get('displayName'),
+            'items': [
+                {'field': i.get('field'), 'from': i.get('fromString'), 'to': i.get('toString')}
+                for i in history.get('items', [])
+            ],
+        }
+
+    def _fetch_page(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET one JSON page; identical GETs in flight at once (same user, URL and params) share one response."""
+        page, _ = get_flight("jira").do(request_key(self.email, url, params), lambda: self._get_page(url, params))
+        return page
+
+    def _get_page(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.http.get(url, endpoint='jira', auth=self.auth, headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
     
     def _parse_ticket(self, issue_data: Dict) -> Ticket:
-        """Convert Jira API response to our Ticket model"""
+        """Convert Jira API response to our Ticket model (cached by key and updated time)"""
+        fields = issue_data['fields']
+        cache_key = (issue_data['key'], fields['updated'])
+        with self._parsed_lock:
+            ticket = self._parsed.get(cache_key)
+            if ticket is not None:
+                self._parsed.move_to_end(cache_key)
+                self.parse_cache_hits += 1
+                return ticket
+
+        ticket = self._build_ticket(issue_data)
+        with self._parsed_lock:
+            self._parsed[cache_key] = ticket
+            while len(self._parsed) > self.parse_cache_size:
+                self._parsed.popitem(last=False)
+        return ticket
+
+    def _build_ticket(self, issue_data: Dict) -> Ticket:
         fields = issue_data['fields']
         
         # Parse dates
@@ -139,8 +460,20 @@ class JiraClient:
             comments_count=comments_count,
             labels=labels,
             issue_type=fields['issuetype']['name'],
-            raw_data=issue_data
+            raw_data=self._slim_issue(issue_data) if self.keep_raw else None
         )
+
+    @staticmethod
+    def _slim_issue(issue_data: Dict) -> Dict:
+        """Drop bulky payload parts we only needed for counting (comment bodies, history)"""
+        fields = issue_data.get('fields', {})
+        comment = fields.get('comment')
+        if 'changelog' not in issue_data and not (isinstance(comment, dict) and 'comments' in comment):
+            return issue_data
+        slim = {k: v for k, v in issue_data.items() if k != 'changelog'}
+        if isinstance(comment, dict):
+            slim['fields'] = {**fields, 'comment': {k: v for k, v in comment.items() if k != 'comments'}}
+        return slim
     
     def _parse_description(self, description_data: Any) -> str:
         """Parse Jira description from various formats"""
@@ -160,35 +493,16 @@ class JiraClient:
         """Extract plain text from Atlassian Document Format"""
         if not isinstance(adf_doc, dict):
             return str(adf_doc)
-        
-        text_parts = []
-        
-        def extract_text(node):
-            if isinstance(node, dict):
-                if node.get('type') == 'text':
-                    text_parts.append(node.get('text', ''))
-                elif 'content' in node:
-                    for child in node['content']:
-                        extract_text(child)
-                elif node.get('type') == 'inlineCard':
-                    # Extract URL from inline cards
-                    url = node.get('attrs', {}).get('url', '')
-                    if url:
-                        text_parts.append(f"[Link: {url}]")
-            elif isinstance(node, list):
-                for item in node:
-                    extract_text(item)
-        
-        extract_text(adf_doc)
-        return ' '.join(text_parts).strip() or "No description available"
+        return adf_to_text(adf_doc, self.description_chars) or "No description available"
     
+    @traced("jira.comment")
     def add_comment(self, ticket_key: str, comment: str) -> bool:
         """Add a comment to a Jira ticket"""
         url = f"{self.base_url}/rest/api/3/issue/{ticket_key}/comment"
         payload = {"body": comment}
         
         try:
-            response = requests.post(url, auth=self.auth, headers=self.headers, json=payload)
+            response = self.http.post(url, endpoint='jira', auth=self.auth, headers=self.headers, json=payload)
             response.raise_for_status()
             return True
         except requests.RequestException as e:
@@ -202,9 +516,16 @@ class JiraClient:
 class LLMClient:
     def __init__(self):
         self.provider = os.getenv('LLM_PROVIDER', 'openai')
+        self.http = http_client.get_http_client()
         # Cache for per-ticket suggestions
-        self.cache = Cache()
-        self.semantic_cache = SemanticCache()
+        self.cache = open_cache('suggestions', ttl=LLM_CACHE_TTL)
+        # Near-duplicate caches: reuse answers when only volatile fields changed
+        self.semantic_cache = SemanticCache('semantic_analysis', ttl=LLM_CACHE_TTL)
+        # Different asks about the same ticket (research vs plan) never share an answer
+        self.semantic_suggestions = SemanticCache('semantic_suggestions', ttl=LLM_CACHE_TTL,
+                                                  anchor_fields=ANCHOR_FIELDS + ("context",))
+        self._last_analysis_hit = None
+        self._last_suggestion_hit: Dict[str, object] = {}
         
 
         if self.provider == 'openai':
@@ -215,7 +536,21 @@ class LLMClient:
             self.model = os.getenv('OLLAMA_MODEL', 'llama3.1')
 
         # Separate cache for workload analysis (file-backed)
-        self.analysis_cache = Cache("analysis_cache.json")
+        self.analysis_cache = open_cache('analysis', ttl=LLM_CACHE_TTL)
+        # Keeps whole-queue prompts inside the model's context window
+        self.packer = PromptPacker(getattr(self, 'model', ''))
+        self.last_pack: Optional[PackedPrompt] = None
+        # 'single' sends the whole queue in one prompt; 'mapreduce' (opt-in, one
+        # call per uncached ticket) assesses tickets one by one then ranks
+        self.analysis_mode = os.getenv('ANALYSIS_MODE', 'single')
+        self.assessment_cache = open_cache('assessments', ttl=ASSESSMENT_TTL)
+        self.analysis_workers = max(1, int(os.getenv('ANALYSIS_WORKERS', '4')))
+        # Local urgency ranking for the fallback analysis and the reduce step
+        self.priority_engine = PriorityEngine()
+        # 'json' asks single-prompt analysis for a schema-shaped reply; 'text' parses prose
+        self.analysis_format = os.getenv('ANALYSIS_FORMAT', 'json')
+        self.structured_retries = max(0, int(os.getenv('STRUCTURED_RETRIES', '1')))
+        self._response_format_supported = True
     
         # Cache for the last workload analysis
         self._analysis_cache: Optional[WorkloadAnalysis] = None
@@ -226,9 +561,14 @@ class LLMClient:
         self._analysis_cache = None
         self._cache_time = None
         self.analysis_cache.clear()
+        # A refresh right after a near-duplicate hit means the reused answer didn't fit
+        if self._last_analysis_hit is not None and not self._last_analysis_hit.exact:
+            self.semantic_cache.report_false_hit()
+        self._last_analysis_hit = None
+        self.semantic_cache.clear()
 
-    def analyze_workload(self, tickets: List[Ticket]) -> WorkloadAnalysis:
-        """Return cached workload analysis when valid."""
+    def analyze_workload(self, tickets: List[Ticket], on_token: Optional[TokenCallback] = None) -> WorkloadAnalysis:
+        """Return cached workload analysis when valid; ``on_token`` streams the narrative."""
 
         if (
             self._analysis_cache
@@ -237,13 +577,190 @@ class LLMClient:
         ):
             return self._analysis_cache
 
-        analysis = self._compute_analysis(tickets)
+        analysis = self._compute_analysis(tickets, on_token=on_token)
         self._analysis_cache = analysis
         self._cache_time = datetime.now()
         return analysis
 
-    def _compute_analysis(self, tickets: List[Ticket]) -> WorkloadAnalysis:
+    def _compute_analysis(self, tickets: List[Ticket], on_token: Optional[TokenCallback] = None) -> WorkloadAnalysis:
         """Get AI analysis of your ticket workload"""
+        if self.analysis_mode == 'mapreduce':
+            return self._compute_mapreduce_analysis(tickets, on_token)
+        return self._compute_single_analysis(tickets, on_token)
+
+    # Map-reduce analysis ---------------------------------------------------
+
+    REDUCE_COLUMNS = ("key", "priority", "status", "age_days", "stale_days", "urgency", "reason", "next_step")
+
+    @staticmethod
+    def _assessment_hash(ticket: Ticket) -> str:
+        """Hash of the fields an assessment depends on; ages are left out so it survives a day ticking over."""
+        source = json.dumps([
+            ticket.key, ticket.summary, ticket.priority, ticket.status, ticket.comments_count,
+            ticket.labels, ticket.issue_type, (ticket.description or "")[:300],
+        ], default=str)
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def _assess_ticket(self, ticket: Ticket) -> Dict:
+        """Map step: ask the LLM for a short urgency assessment of one ticket."""
+        prompt = f"""Assess this Jira ticket on its own.
+
+Ticket: {ticket.key} - {ticket.summary}
+Priority: {ticket.priority} | Status: {ticket.status} | Type: {ticket.issue_type}
+Comments: {ticket.comments_count} | Labels: {ticket.labels}
+Description: {(ticket.description or "No description")[:300]}
+
+P1/Critical, security issues, failures, blocked deployments and customer impact
+(VOC_Feedback) are urgent; routine chores are not.
+
+Reply with exactly three lines:
+URGENCY: <1-5, 5 means drop everything>
+REASON: <one sentence>
+NEXT STEP: <one concrete action>"""
+        text = self._ask("assess", prompt)
+        urgency = re.search(r'URGENCY:\s*([1-5])', text, re.IGNORECASE)
+        reason = re.search(r'REASON:\s*(.+)', text, re.IGNORECASE)
+        next_step = re.search(r'NEXT STEP:\s*(.+)', text, re.IGNORECASE)
+        if reason:
+            reason_text = reason.group(1).strip()
+        else:
+            reason_text = text.strip().splitlines()[0] if text.strip() else ""
+        return {
+            'urgency': int(urgency.group(1)) if urgency else 3,
+            'reason': reason_text,
+            'next_step': next_step.group(1).strip() if next_step else "",
+        }
+
+    def _map_assessments(self, tickets: List[Ticket]) -> Dict[str, Optional[Dict]]:
+        """Return assessments by ticket key, calling the LLM only for tickets not cached.
+
+        Failed assessments map to None.
+        """
+        assessments: Dict[str, Optional[Dict]] = {}
+        pending: Dict[str, Ticket] = {}
+        for ticket in tickets:
+            content_hash = self._assessment_hash(ticket)
+            cached = self.assessment_cache.get(content_hash)
+            if cached:
+                assessments[ticket.key] = cached
+            else:
+                pending[content_hash] = ticket
+        if not pending:
+            return assessments
+
+        with ThreadPoolExecutor(max_workers=min(self.analysis_workers, len(pending))) as pool:
+            futures = {pool.submit(bind(self._assess_ticket), t): h for h, t in pending.items()}
+            for future in as_completed(futures):
+                content_hash = futures[future]
+                key = pending[content_hash].key
+                try:
+                    assessment = future.result()
+                except Exception:
+                    assessments[key] = None
+                    continue
+                self.assessment_cache.set(content_hash, assessment)
+                assessments[key] = assessment
+        return assessments
+
+    def _rank_assessed(self, tickets: List[Ticket], assessments: Dict[str, Optional[Dict]]) -> List[Ticket]:
+        """Reduce step, part one: order tickets locally without another LLM call."""
+        return sorted(tickets, key=lambda t: self._rank_key(t, assessments.get(t.key)))
+
+    def _rank_key(self, ticket: Ticket, assessment: Optional[Dict]) -> tuple:
+        """Sort key, most urgent first: assessed urgency, then priority, staleness and age."""
+        assessment = assessment or {}
+        return (
+            -assessment.get('urgency', 0),
+            self.priority_engine.priority_rank(ticket.priority),
+            -ticket.stale_days,
+            -ticket.age_days,
+        )
+
+    def _compute_mapreduce_analysis(self, tickets: List[Ticket], on_token: Optional[TokenCallback] = None) -> WorkloadAnalysis:
+        if not tickets:
+            return self._fallback_analysis(tickets)
+
+        assessments = self._map_assessments(tickets)
+        if all(a is None for a in assessments.values()):
+            console.print("❌ Error getting AI analysis: no ticket could be assessed", style="red")
+            return self._fallback_analysis(tickets)
+
+        ranked = self._rank_assessed(tickets, assessments)
+        top = ranked[0]
+        top_assessment = assessments.get(top.key) or {}
+        rows = []
+        for ticket in ranked:
+            a = assessments.get(ticket.key) or {'urgency': '?', 'reason': 'not assessed', 'next_step': ''}
+            rows.append({
+                'key': ticket.key, 'priority': ticket.priority, 'status': ticket.status,
+                'age_days': ticket.age_days, 'stale_days': ticket.stale_days, **a,
+            })
+
+        # The narrative depends on the ranking and assessments, not on ages
+        narrative_key = "reduce:" + hashlib.sha256(json.dumps(
+            [[t.key, assessments.get(t.key)] for t in ranked], sort_keys=True, default=str
+        ).encode('utf-8')).hexdigest()
+        cached = self.analysis_cache.get(narrative_key)
+        if cached:
+            narrative = cached["analysis_text"]
+        else:
+            intro = (f"You are my intelligent work assistant. Each of my {len(tickets)} open tickets "
+                     f"has already been assessed; they are listed most urgent first:\n\n")
+            outro = (f"\n\nWrite a short, conversational briefing: why {top.key} should be my TOP PRIORITY, "
+                     "the next concrete steps for it, how you can help, and a brief mention of 2-3 other notable tickets.")
+            # Ranking is already done, so whatever doesn't fit is the least urgent
+            packed = self.packer.pack(rows, overhead=intro + outro, columns=self.REDUCE_COLUMNS, max_chunks=1)
+            self._report_pack(packed)
+            table = packed.chunks[0]
+            if packed.omitted:
+                table += f"\n(+{len(packed.omitted)} lower-ranked tickets not shown)"
+            prompt = intro + table + outro
+            try:
+                narrative = self._ask("reduce", prompt, on_token)
+                self.analysis_cache.set(narrative_key, {
+                    "analysis_text": narrative,
+                    "timestamp": datetime.now().isoformat(),
+                })
+            except Exception:
+                narrative = f"Focus on {top.key} first - {top_assessment.get('reason', '')}"
+
+        next_steps = [top_assessment['next_step']] if top_assessment.get('next_step') else []
+        return WorkloadAnalysis(
+            top_priority=top,
+            priority_reasoning=top_assessment.get('reason') or "AI analysis suggests this needs immediate attention",
+            next_steps=next_steps + ["Review ticket details", "Plan approach"],
+            can_help_with=["Research the issue", "Create action plan", "Draft status update"],
+            other_notable=ranked[1:4],
+            summary=narrative
+        )
+
+    def _shortlist_chunks(self, packed: PackedPrompt) -> str:
+        """Narrow each chunk of an oversized queue down to its most pressing tickets."""
+        def shortlist(index: int, table: str) -> str:
+            return self._ask("shortlist", f"""Here is batch {index + 1} of {len(packed.chunks)} of my open Jira tickets (one per line, column names in the first row):
+
+{table}
+
+Pick up to 5 tickets from this batch that most need attention: P1/Critical, security issues, failures,
+blocked or stuck work, customer impact. Reply with one line per ticket: KEY | priority | status | why it matters.""")
+
+        with ThreadPoolExecutor(max_workers=min(self.analysis_workers, len(packed.chunks))) as pool:
+            results = list(pool.map(bind(shortlist), range(len(packed.chunks)), packed.chunks))
+        reviewed = sum(len(keys) for keys in packed.chunk_keys)
+        header = f"Shortlisted from {reviewed} tickets reviewed in {len(packed.chunks)} batches"
+        if packed.omitted:
+            header += f" ({len(packed.omitted)} lower-priority tickets skipped)"
+        return header + ":\n" + "\n".join(strip_think(r) for r in results)
+
+    def _report_pack(self, packed: PackedPrompt):
+        self.last_pack = packed
+        if len(packed.chunks) > 1 or packed.omitted:
+            console.print(f"📦 {packed.report()}", style="dim")
+
+    # Single-prompt analysis -------------------------------------------------
+
+    def _compute_single_analysis(self, tickets: List[Ticket], on_token: Optional[TokenCallback] = None) -> WorkloadAnalysis:
+        """Analyze the whole queue in one prompt"""
         
         # Prepare ticket data for analysis
         ticket_summaries = []
@@ -265,26 +782,28 @@ class LLMClient:
         ticket_hash_source = json.dumps(sorted_tickets, sort_keys=True, default=str)
         ticket_hash = hashlib.sha256(ticket_hash_source.encode('utf-8')).hexdigest()
 
-        # Try both caches: file key and semantic (by content)
+        # Exact key first, then a near-duplicate lookup that ignores volatile fields
         cached = None
         if hasattr(self.analysis_cache, 'get'):
             try:
                 cached = self.analysis_cache.get(ticket_hash)
             except Exception:
                 cached = None
-        if not cached and hasattr(self.semantic_cache, 'get_by_content'):
-            cached = self.semantic_cache.get_by_content(ticket_hash)
+        if not cached:
+            hit = self.semantic_cache.lookup(sorted_tickets)
+            self._last_analysis_hit = hit
+            if hit:
+                cached = hit.value
         if cached:
             ts = datetime.fromisoformat(cached["timestamp"])
             if datetime.now() - ts < timedelta(hours=24):
-                analysis_text = cached["analysis_text"]
-                recommended_ticket = self._extract_recommended_ticket(analysis_text, tickets)
-                return self._parse_analysis(analysis_text, tickets, recommended_ticket)
+                return self._analysis_from_entry(cached, tickets)
 
-        prompt = f"""You are my intelligent work assistant. I have {len(tickets)} open tickets that need attention.
+        intro = f"""You are my intelligent work assistant. I have {len(tickets)} open tickets that need attention.
 
-My tickets:
-{json.dumps(ticket_summaries, indent=2, default=str)}
+My tickets (one per line, column names in the first row):
+"""
+        outro = """
 
 Please analyze my workload and help me prioritize. Be conversational and helpful, like a smart colleague.
 
@@ -309,60 +828,262 @@ Be specific about WHY something is urgent and WHAT we should do about it. Look f
 - Automation failures or blocked deployments
 
 Respond in a conversational tone as if talking directly to me. Focus on actionable insights."""
+        structured = self.analysis_format == 'json'
+        if structured:
+            outro += ANALYSIS_JSON_INSTRUCTIONS
+        # Most important first, so the packer drops low-signal tickets if it must
+        by_key = {row['key']: row for row in ticket_summaries}
+        ordered = [by_key[t.key] for t in self._rank_assessed(tickets, {})]
+        packed = self.packer.pack(ordered, overhead=intro + outro)
+        self._report_pack(packed)
 
         try:
-            if self.provider == 'openai':
-                response = openai.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.7
+            if len(packed.chunks) == 1:
+                tickets_block = packed.chunks[0]
+            else:
+                tickets_block = self._shortlist_chunks(packed)
+            prompt = intro + tickets_block + outro
+            if structured:
+                valid_keys = [key for keys in packed.chunk_keys for key in keys]
+                data, reply = self._complete_structured(
+                    prompt, ANALYSIS_SCHEMA, lambda d: self._check_analysis(d, tickets), valid_keys[:200]
                 )
-                analysis_text = response.choices[0].message.content
-            else:  # ollama
-                response = requests.post(f"{self.ollama_host}/api/generate", json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                })
-                analysis_text = response.json()["response"]
+                analysis_text = data["summary"] if data else self._reply_text(reply)
+            else:
+                data, analysis_text = None, self._ask("analysis", prompt, on_token)
             # cache minimal analysis in file-backed cache
+            entry = {
+                "analysis_text": analysis_text,
+                "timestamp": datetime.now().isoformat(),
+            }
+            if data:
+                entry["structured"] = data
             try:
-                self.analysis_cache.set(ticket_hash, {
-                    "analysis_text": analysis_text,
-                    "timestamp": datetime.now().isoformat(),
-                })
+                self.analysis_cache.set(ticket_hash, entry)
             except Exception:
                 pass
             try:
-                self.semantic_cache.set_by_content({"analysis_text": analysis_text}, ticket_hash)
+                self.semantic_cache.store(sorted_tickets, entry)
             except Exception:
                 pass
-            # Extract the recommended ticket key from AI response
-            recommended_ticket = self._extract_recommended_ticket(analysis_text, tickets)
-
-            return self._parse_analysis(analysis_text, tickets, recommended_ticket)
+            return self._analysis_from_entry(entry, tickets)
             
         except Exception as e:
             console.print(f"❌ Error getting AI analysis: {e}", style="red")
             return self._fallback_analysis(tickets)
     
+    def _ask(self, call: str, prompt: str, on_token: Optional[TokenCallback] = None, **kwargs: Any) -> str:
+        """``_complete`` with metrics, coalescing identical prompts that are in flight at the same time.
+
+        A caller that joins another's call gets the whole answer as a single
+        ``on_token`` chunk once it is ready.
+        """
+        key = request_key(self.provider, getattr(self, 'model', ''), hashlib.sha256(prompt.encode('utf-8')).hexdigest(),
+                          kwargs)
+        text, shared = get_flight("llm").do(key, lambda: self._ask_once(call, prompt, on_token, **kwargs))
+        if shared and on_token is not None and text:
+            on_token(text)
+        return text
+
+    def _ask_once(self, call: str, prompt: str, on_token: Optional[TokenCallback] = None, **kwargs: Any) -> str:
+        """``_complete`` with metrics: latency, time to first token and token counts by call type.
+
+        Token counts are estimated from the text (see ``TokenEstimator``), so
+        they stay comparable across providers and with streaming on or off.
+        """
+        labels = {"provider": self.provider, "model": getattr(self, 'model', ''), "call": call}
+        start = time.perf_counter()
+        first_token: List[float] = []
+        args: Tuple = ()
+        if on_token is not None:
+            def on_token_timed(chunk: str) -> None:
+                if not first_token:
+                    first_token.append(time.perf_counter() - start)
+                on_token(chunk)
+            args = (on_token_timed,)
+        LLM_IN_FLIGHT.inc(provider=self.provider)
+        try:
+            text = self._complete(prompt, *args, **kwargs)
+        except Exception:
+            LLM_REQUESTS.inc(outcome="error", **labels)
+            raise
+        finally:
+            LLM_IN_FLIGHT.dec(provider=self.provider)
+        elapsed = time.perf_counter() - start
+        completion_tokens = self.packer.estimator.count(text or "")
+        LLM_REQUESTS.inc(outcome="ok", **labels)
+        LLM_LATENCY.observe(elapsed, **labels)
+        if first_token:
+            LLM_FIRST_TOKEN.observe(first_token[0], **labels)
+        LLM_PROMPT_TOKENS.inc(self.packer.estimator.count(prompt), **labels)
+        LLM_COMPLETION_TOKENS.inc(completion_tokens, **labels)
+        if elapsed > 0 and completion_tokens:
+            LLM_TOKEN_RATE.observe(completion_tokens / elapsed, **labels)
+        return text
+
+    @traced("llm")
+    def _complete(
+        self, prompt: str, on_token: Optional[TokenCallback] = None, schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Send a single-turn prompt to the configured provider.
+
+        With ``on_token`` the response is streamed and each chunk is passed to
+        the callback as it arrives; the assembled text is returned either way.
+        With ``schema`` the provider is asked for JSON (OpenAI ``response_format``,
+        Ollama ``format: json``) and the reply is not streamed.
+        """
+        stream = bool(on_token) and schema is None
+        if self.provider == 'openai':
+            options: Dict[str, Any] = {"stream": True} if stream else {}
+            if schema is not None and self._response_format_supported:
+                options["response_format"] = {
+                    "type": "json_schema",
+                    "json_schema": {"name": "structured_reply", "schema": schema, "strict": True},
+                }
+            request = dict(model=self.model, messages=[{"role": "user", "content": prompt}], temperature=0.7)
+            try:
+                response = openai.chat.completions.create(**request, **options)
+            except openai.BadRequestError:
+                if "response_format" not in options:
+                    raise
+                # Older models reject response_format; the prompt itself still asks for JSON
+                self._response_format_supported = False
+                options.pop("response_format")
+                response = openai.chat.completions.create(**request, **options)
+            if not stream:
+                return response.choices[0].message.content
+            parts = []
+            for chunk in response:
+                token = chunk.choices[0].delta.content if chunk.choices else None
+                if token:
+                    parts.append(token)
+                    on_token(token)
+            return "".join(parts)
+        # ollama: generation has no side effects, so the transport may retry it
+        response = self.http.post(f"{self.ollama_host}/api/generate", endpoint='llm', idempotent=True, json={
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {"num_ctx": self.packer.context_tokens},
+            **({"format": "json"} if schema is not None else {}),
+        }, stream=stream)
+        response.raise_for_status()
+        if not stream:
+            return response.json()["response"]
+        parts = []
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                token = data.get("response", "")
+                if token:
+                    parts.append(token)
+                    on_token(token)
+                if data.get("done"):
+                    break
+        finally:
+            response.close()
+        return "".join(parts)
+
+    def _complete_structured(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        check: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
+        valid_keys: Optional[List[str]] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Ask for a schema-shaped reply; returns (validated data or None, last raw reply).
+
+        Malformed JSON is repaired locally first. A reply that still fails
+        validation gets a short fix-up prompt (up to ``structured_retries``);
+        a reply with no JSON at all is returned for free-text parsing.
+        """
+        reply = self._ask("analysis", prompt, schema=schema)
+        for attempt in range(self.structured_retries + 1):
+            try:
+                data = parse_structured(reply, schema)
+                errors = check(data) if check else []
+                if not errors:
+                    return data, reply
+            except StructuredOutputError as e:
+                if not e.found_json:
+                    return None, reply
+                errors = e.errors
+            if attempt == self.structured_retries:
+                break
+            console.print(f"🔧 Fixing malformed AI reply ({errors[0]})", style="dim")
+            reply = self._ask("repair", repair_prompt(reply, errors, valid_keys), schema=schema)
+        return None, reply
+
+    @staticmethod
+    def _reply_text(reply: str) -> str:
+        """Readable text from a reply that didn't validate: its summary if it has one."""
+        try:
+            data = extract_json(reply)
+        except StructuredOutputError:
+            return reply
+        summary = data.get("summary") if isinstance(data, dict) else None
+        return summary if isinstance(summary, str) and summary.strip() else reply
+
+    @staticmethod
+    def _check_analysis(data: Dict[str, Any], tickets: List[Ticket]) -> List[str]:
+        keys = {t.key.upper() for t in tickets}
+        if data["top_key"].strip().upper() not in keys:
+            return [f"top_key '{data['top_key']}' is not one of my ticket keys"]
+        return []
+
+    def _analysis_from_entry(self, entry: Dict[str, Any], tickets: List[Ticket]) -> WorkloadAnalysis:
+        """Build the analysis from a fresh or cached result, preferring its structured form."""
+        analysis_text = entry["analysis_text"]
+        data = entry.get("structured")
+        # A near-duplicate cache hit may name a ticket that has since gone
+        if data and not self._check_analysis(data, tickets):
+            return self._analysis_from_structured(data, tickets)
+        return self._parse_analysis(analysis_text, tickets, self._extract_recommended_ticket(analysis_text, tickets))
+
+    def _analysis_from_structured(self, data: Dict[str, Any], tickets: List[Ticket]) -> WorkloadAnalysis:
+        by_key = {t.key.upper(): t for t in tickets}
+        top = by_key[data["top_key"].strip().upper()]
+        notable: List[Ticket] = []
+        for key in data["notable_keys"]:
+            ticket = by_key.get(key.strip().upper())
+            if ticket is not None and ticket is not top and ticket not in notable:
+                notable.append(ticket)
+        return WorkloadAnalysis(
+            top_priority=top,
+            priority_reasoning=data["reasoning"].strip() or "AI analysis suggests this needs immediate attention",
+            next_steps=[s for s in data["next_steps"] if s.strip()] or ["Review ticket details", "Plan approach"],
+            can_help_with=[s for s in data["can_help_with"] if s.strip()]
+            or ["Research the issue", "Create action plan", "Draft status update"],
+            other_notable=notable[:3],
+            summary=data["summary"],
+        )
+
+    _TICKET_KEY = re.compile(r"\b[A-Z][A-Z0-9_]*-\d+\b", re.IGNORECASE)
+
+    def _mentioned_tickets(self, analysis_text: str, tickets: List[Ticket]) -> List[Ticket]:
+        """Tickets named in the text, in the order they first appear (one regex pass)"""
+        by_key = {ticket.key.upper(): ticket for ticket in tickets}
+        mentioned: Dict[str, Ticket] = {}
+        for match in self._TICKET_KEY.finditer(analysis_text or ""):
+            ticket = by_key.get(match.group(0).upper())
+            if ticket is not None and ticket.key not in mentioned:
+                mentioned[ticket.key] = ticket
+        return list(mentioned.values())
+
     def _extract_recommended_ticket(self, analysis_text: str, tickets: List[Ticket]) -> Optional[Ticket]:
         """Extract the ticket key that AI recommended as top priority"""
-        # Look for ticket patterns in the analysis
-        ticket_keys = [ticket.key for ticket in tickets]
-        
-        for key in ticket_keys:
-            if key.upper() in analysis_text.upper():
-                # Find the ticket object
-                for ticket in tickets:
-                    if ticket.key.upper() == key.upper():
-                        return ticket
+        # The recommendation is normally the first ticket the text names
+        mentioned = self._mentioned_tickets(analysis_text, tickets)
+        if mentioned:
+            return mentioned[0]
         
         # Fallback to first ticket if no clear recommendation
         return tickets[0] if tickets else None
     
     def _parse_analysis(self, analysis_text: str, tickets: List[Ticket], recommended_ticket: Optional[Ticket]) -> WorkloadAnalysis:
-        """Parse AI response into structured analysis"""
+        """Parse AI response into structured analysis (used when there's no structured reply)"""
         
         if not recommended_ticket:
             recommended_ticket = tickets[0] if tickets else None
@@ -371,12 +1092,14 @@ Respond in a conversational tone as if talking directly to me. Focus on actionab
         reasoning_match = re.search(r'why[^.]*[.!]', analysis_text, re.IGNORECASE)
         reasoning = reasoning_match.group(0) if reasoning_match else "AI analysis suggests this needs immediate attention"
         
+        # Other tickets the text calls out, else the next ones in the queue
+        notable = [t for t in self._mentioned_tickets(analysis_text, tickets) if t is not recommended_ticket]
         return WorkloadAnalysis(
             top_priority=recommended_ticket,
             priority_reasoning=reasoning,
             next_steps=["Review ticket details", "Plan approach", "Execute solution"],
             can_help_with=["Research the issue", "Create action plan", "Draft status update"],
-            other_notable=tickets[1:4] if len(tickets) > 1 else [],
+            other_notable=notable[:3] or (tickets[1:4] if len(tickets) > 1 else []),
             summary=analysis_text
         )
     
@@ -393,56 +1116,8 @@ Respond in a conversational tone as if talking directly to me. Focus on actionab
             )
         
         # Prioritize by: P1 > security/failure keywords > staleness > age
-        def ticket_urgency_score(ticket: Ticket) -> tuple:
-            priority = (ticket.priority or "").strip().lower()
-            priority_score = {
-                'p0': -1,
-                'p1': 0,
-                'p1 - critical': 0,
-                'critical': 0,
-                'highest': 0,
-                'high': 1,
-                'p2': 2,
-                'medium': 3,
-                'p3': 4,
-                'low': 5,
-            }.get(priority, 6)
-
-            # Security/failure keywords boost
-            keywords = ['security', 'failure', 'critical', 'blocked', 'urgent', 'voc_feedback']
-            keyword_boost = 0
-            for keyword in keywords:
-                if keyword in ticket.summary.lower() or keyword in ticket.description.lower():
-                    keyword_boost -= 2
-                    break
-
-            return (priority_score + keyword_boost, -ticket.stale_days, -ticket.age_days)
-        
-        p0_tickets = [t for t in tickets if t.priority.strip().upper().startswith("P0")]
-        p1_tickets = [t for t in tickets if t.priority.strip().upper().startswith("P1")]
-        if p0_tickets:
-            top = sorted(p0_tickets, key=lambda t: (-t.stale_days, -t.age_days))[0]
-            sorted_tickets = sorted(tickets, key=ticket_urgency_score)
-        elif p1_tickets:
-            top = sorted(p1_tickets, key=lambda t: (-t.stale_days, -t.age_days))[0]
-        sorted_tickets = sorted(tickets, key=ticket_urgency_score)
-        top = sorted_tickets[0]
-        p0_tickets = [t for t in tickets if (t.priority or "").strip().upper().startswith("P0")]
-        if p0_tickets:
-
-            sorted_tickets = sorted(tickets, key=ticket_urgency_score)
-            top = sorted(p0_tickets, key=lambda t: (-t.stale_days, -t.age_days))[0]
-        else:
-            p1_tickets = [t for t in tickets if (t.priority or "").strip().upper().startswith("P1")]
-            if p1_tickets:
-                sorted_tickets = sorted(tickets, key=ticket_urgency_score)
-                top = sorted(p1_tickets, key=lambda t: (-t.stale_days, -t.age_days))[0]
-            else:
-                sorted_tickets = sorted(tickets, key=ticket_urgency_score)
-                top = sorted_tickets[0]
-        sorted_tickets = sorted(tickets, key=ticket_urgency_score)
-        top = sorted_tickets[0]
-
+        ranked = self.priority_engine.rank(tickets, limit=4)
+        top = ranked[0]
 
         # Generate reasoning
         reasons = []
@@ -467,15 +1142,38 @@ Respond in a conversational tone as if talking directly to me. Focus on actionab
             priority_reasoning=reasoning,
             next_steps=["Review ticket details", "Identify blockers", "Plan next action"],
             can_help_with=["Analyze the issue", "Suggest approach", "Draft updates"],
-            other_notable=sorted_tickets[1:4],
+            other_notable=ranked[1:4],
             summary=f"You have {len(tickets)} tickets. Focus on {top.key} first - {reasoning}."
         )
     
-    def suggest_action(self, ticket: Ticket, context: str = "", force_refresh: bool = False) -> str:
+    def suggest_action(
+        self, ticket: Ticket, context: str = "", force_refresh: bool = False, on_token: Optional[TokenCallback] = None
+    ) -> str:
         """Get AI suggestion for specific ticket action"""
         cache_key = f"{ticket.key}:{context.strip()}"
-        if not force_refresh:
+        semantic_payload = {
+            'key': ticket.key,
+            'summary': ticket.summary,
+            'priority': ticket.priority,
+            'status': ticket.status,
+            'age_days': ticket.age_days,
+            'stale_days': ticket.stale_days,
+            'issue_type': ticket.issue_type,
+            'labels': ticket.labels,
+            'description': ticket.description,
+            'context': context.strip(),
+        }
+        if force_refresh:
+            if self._last_suggestion_hit.pop(ticket.key, None):
+                self.semantic_suggestions.report_false_hit()
+        else:
             cached = self.cache.get(cache_key)
+            if not cached:
+                hit = self.semantic_suggestions.lookup(semantic_payload)
+                if hit:
+                    cached = hit.value
+                    if not hit.exact:
+                        self._last_suggestion_hit[ticket.key] = hit
             if cached:
                 ts = datetime.fromisoformat(cached.get("timestamp"))
                 if datetime.now() - ts < timedelta(hours=24):
@@ -500,27 +1198,32 @@ Offer concrete help with execution.
 Keep response conversational and focused on getting this done."""
 
         try:
-            if self.provider == 'openai':
-                response = openai.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.7
-                )
-                suggestion = response.choices[0].message.content
-            else:  # ollama
-                response = requests.post(f"{self.ollama_host}/api/generate", json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                })
-                suggestion = response.json()["response"]
-
+            suggestion = self._ask("suggest", prompt, on_token)
         except Exception:
-            suggestion = self._generate_fallback_suggestion(ticket)
+            # Not cached: a short outage (e.g. during a background prefetch)
+            # must not pin canned advice in place of real answers for a day
+            return self._generate_fallback_suggestion(ticket)
 
-        self.cache.set(cache_key, {"timestamp": datetime.now().isoformat(), "suggestion": suggestion})
+        entry = {"timestamp": datetime.now().isoformat(), "suggestion": suggestion}
+        self.cache.set(cache_key, entry)
+        self.semantic_suggestions.store(semantic_payload, entry)
         return suggestion
     
+    def draft_comment(self, ticket: Ticket, context: str, on_token: Optional[TokenCallback] = None) -> str:
+        """Draft a Jira comment for the given context"""
+        prompt = f"""Help me draft a professional Jira comment for this ticket:
+
+Ticket: {ticket.key} - {ticket.summary}
+Context: {context}
+Current status: {ticket.status}
+
+Write a concise, professional comment that provides value to stakeholders. 
+Focus on progress, next steps, or findings based on the context provided."""
+        try:
+            return strip_think(self._ask("comment", prompt, on_token))
+        except Exception:
+            return f"Status update: Working on {ticket.summary}. {context}. Will provide updates as progress is made."
+
     def _generate_fallback_suggestion(self, ticket: Ticket) -> str:
         """Generate a helpful suggestion when AI is unavailable"""
         suggestions = []
@@ -551,19 +1254,83 @@ Keep response conversational and focused on getting this done."""
 
 class WorkAssistant:
     def __init__(self, jira_client: Optional[JiraClient] = None, llm_client: Optional[LLMClient] = None, session_manager: Optional[SessionManager] = None):
-        self.session = session_manager or SessionManager()
-        self.jira = jira_client or JiraClient()
-        self.llm = llm_client or LLMClient()
+        # Clients and the session snapshot are built on first use (see the properties below)
+        self._session = session_manager
+        self._jira = jira_client
+        self._llm = llm_client
+        self._semantic_cache: Optional[SemanticCache] = None
+        self.notes: List[str] = []
         self.current_tickets: List[Ticket] = []
         self.current_analysis: Optional[WorkloadAnalysis] = None
         self.current_focus: Optional[Ticket] = None
         self.last_user_input: str = ""
         self.analysis_cache: Dict[str, WorkloadAnalysis] = {}
         self.current_ticket_hash: Optional[str] = None
-        self.session_cache = Cache()
+        self.session_cache = open_cache('session')
         self.saved_focus_key: Optional[str] = None
-        # Provide a semantic cache here as well for assistant-level caching
-        self.semantic_cache = SemanticCache()
+        # Render LLM output token by token (LLM_STREAM=0 falls back to spinners)
+        self.stream = os.getenv('LLM_STREAM', '1') != '0'
+        # Background suggestion warm-up for the likely next picks (PREFETCH_WORKERS=0 disables)
+        self.prefetch_workers = int(os.getenv('PREFETCH_WORKERS', '2'))
+        self.prefetcher: Optional[SuggestionPrefetcher] = None
+        self._store: Optional[TicketStore] = None
+        self._store_source: Optional[List[Ticket]] = None
+        # Run every command under cProfile (--profile); 'profile <command>' does it once
+        self.profile_commands = os.getenv('PROFILE_COMMANDS', '0') == '1'
+        # Attach to a running sync daemon (python sync_daemon.py) instead of syncing; SYNC_DAEMON=0 never does
+        self.use_daemon = os.getenv('SYNC_DAEMON', '1') != '0'
+        # Prometheus text file written by 'health' and when the session ends
+        self.metrics_file = os.getenv('METRICS_FILE') or None
+        self.profile_top = int(os.getenv('PROFILE_TOP', '15'))
+
+    @property
+    def session(self) -> SessionManager:
+        if self._session is None:
+            self._session = SessionManager()
+        return self._session
+
+    @session.setter
+    def session(self, value: SessionManager):
+        self._session = value
+
+    # Older name kept for callers that still use it
+    session_manager = session
+
+    @property
+    def jira(self) -> JiraClient:
+        if self._jira is None:
+            self._jira = JiraClient()
+        return self._jira
+
+    @jira.setter
+    def jira(self, value: JiraClient):
+        self._jira = value
+
+    @property
+    def llm(self) -> LLMClient:
+        if self._llm is None:
+            self._llm = LLMClient()
+        return self._llm
+
+    @llm.setter
+    def llm(self, value: LLMClient):
+        self._llm = value
+
+    @property
+    def semantic_cache(self) -> SemanticCache:
+        # Assistant-level cache of analysis summaries by ticket-set hash
+        if self._semantic_cache is None:
+            self._semantic_cache = SemanticCache()
+        return self._semantic_cache
+
+    @property
+    def ticket_store(self) -> TicketStore:
+        # Indexes are rebuilt whenever current_tickets is replaced or resized
+        if self._store is None or self._store_source is not self.current_tickets \
+                or len(self._store) != len(self.current_tickets):
+            self._store = TicketStore(self.current_tickets)
+            self._store_source = self.current_tickets
+        return self._store
 
     def load_state(self):
         """Load persisted session state"""
@@ -573,32 +1340,80 @@ class WorkAssistant:
     def save_state(self):
         """Persist current focus ticket"""
         self.session_cache.set("session", {"current_focus": self.current_focus.key if self.current_focus else None})
-        self.session_manager = SessionManager()
-        self.notes: List[str] = []
 
+    @traced("hash")
     def _calculate_ticket_hash(self, tickets: List[Ticket]) -> str:
         """Create a hash representing the current ticket set"""
         hash_input = "|".join(sorted(f"{t.key}:{t.updated.isoformat()}" for t in tickets))
         return hashlib.sha256(hash_input.encode()).hexdigest()
 
+    @traced("sync")
+    def _sync_tickets(self) -> List[Ticket]:
+        """Refresh tickets from Jira, using a delta sync when a stored snapshot exists"""
+        since = self.session.sync_cursor
+        if os.getenv('SYNC_MODE', 'delta') != 'delta' or since is None:
+            tickets = self._fetch_tickets()
+            self.session.update_session(tickets)
+            return tickets
+
+        try:
+            with console.status("[bold green]Syncing changed tickets..."):
+                changed = self._merge_changes(since)
+        except requests.RequestException as e:
+            console.print(f"⚠️ Delta sync failed ({e}); fetching all tickets", style="yellow")
+            tickets = self._fetch_tickets()
+            self.session.update_session(tickets)
+            return tickets
+
+        tickets = self._snapshot_tickets(changed)
+        console.print(f"✅ Synced {len(tickets)} tickets ({len(changed)} changed)")
+        return tickets
+
+    def _snapshot_tickets(self, changed: List[Ticket]) -> List[Ticket]:
+        """Tickets in the session snapshot after a delta merge, reusing parsed tickets we already hold"""
+        fresh = {t.key: t for t in changed}
+        known = {t.key: t for t in self.current_tickets}
+        tickets = []
+        for data in self.session.get_tickets():
+            ticket = fresh.get(data['key']) or known.get(data['key'])
+            if ticket is None or (ticket.key not in fresh and ticket.updated_ts != _epoch(data['updated'])):
+                ticket = self._ticket_from_dict(data)
+            tickets.append(ticket)
+        return tickets
+
+    def _merge_changes(self, since: datetime) -> List[Ticket]:
+        """Merge tickets changed since ``since`` into the session snapshot; returns them.
+
+        Raises ``requests.RequestException`` when Jira can't be reached.
+        """
+        changed = self.jira.get_updated_tickets(since)
+        live_keys = self.jira.get_ticket_keys()
+        missing = self.session.merge_tickets(changed, live_keys)
+        if missing:
+            # Entered the query without a recent update (rare); fetch them directly
+            extra = self.jira.get_tickets_by_key(missing)
+            self.session.merge_tickets(extra, live_keys)
+            changed.extend(extra)
+        return changed
+
+    def _fetch_tickets(self) -> List[Ticket]:
+        """Fetch all tickets, updating the spinner as result pages arrive"""
+        with console.status("[bold green]Fetching your tickets...") as status:
+            def on_progress(fetched: int, total: int) -> None:
+                status.update(f"[bold green]Fetching your tickets... {fetched}/{total}")
+            return self.jira.get_my_tickets(on_progress=on_progress)
+
     def _ticket_from_dict(self, data: Dict[str, Any]) -> Ticket:
-        return Ticket(
-            key=data['key'],
-            summary=data['summary'],
-            description=data['description'],
-            priority=data['priority'],
-            status=data['status'],
-            assignee=data.get('assignee'),
-            created=datetime.fromisoformat(data['created']),
-            updated=datetime.fromisoformat(data['updated']),
-            comments_count=data.get('comments_count', 0),
-            labels=data.get('labels', []),
-            issue_type=data.get('issue_type', ''),
-            raw_data=data.get('raw_data', {}),
-        )
+        return Ticket.from_dict(self.session.resolve_raw(data))
+
+    def start_session(self, resume: bool = False, fresh: bool = False):
+        """Begin a work session; ``fresh`` also has a running sync daemon resync in the background"""
+        if self._prepare_session(resume, fresh=fresh):
+            self._interactive_session()
 
-    def start_session(self, resume: bool = False):
-        """Begin a work session"""
+    @traced("start_session")
+    def _prepare_session(self, resume: bool = False, fresh: bool = False) -> bool:
+        """Sync tickets and show the analysis; False when there is nothing to work on"""
         console.print("\n🎯 Personal AI Work Assistant", style="bold blue")
         console.print("Let me analyze your current workload...\n")
 
@@ -606,35 +1421,41 @@ class WorkAssistant:
         resume = False
         if self.session.within_24_hours() and self.session.get_current_focus():
             last = self.session.last_scan.strftime("%Y-%m-%d %H:%M") if self.session.last_scan else "recently"
-            resume = Confirm.ask(
-                f"Resume previous session from {last}?",
-                default=True,
-            )
+            with span("prompt"):
+                resume = Confirm.ask(
+                    f"Resume previous session from {last}?",
+                    default=True,
+                )
         if not resume:
-            # Start a clean session
-            self.session.reset()
+            # Start a clean session, keeping the ticket snapshot for delta sync
+            self.session.reset(keep_snapshot=True)
+
+        # A running sync daemon already holds fresh tickets and their analysis
+        attached = self._attach_daemon(resync=fresh)
 
         # Fetch tickets (single fetch path)
-        use_cache = False
-        if self.session.last_scan:
+        use_cache = attached
+        if self.session.last_scan and not attached:
             if self.session.needs_rescan():
-                if not Confirm.ask("Last scan was over 24h ago. Scan again?"):
+                with span("prompt"):
+                    rescan = Confirm.ask("Last scan was over 24h ago. Scan again?")
+                if not rescan:
                     self.current_tickets = [self._ticket_from_dict(t) for t in self.session.get_tickets()]
                     use_cache = True
             else:
                 summary = self.session.get_ticket_summary()
-                if Confirm.ask(f"{summary}\nResume last session?"):
+                with span("prompt"):
+                    reuse = Confirm.ask(f"{summary}\nResume last session?")
+                if reuse:
                     self.current_tickets = [self._ticket_from_dict(t) for t in self.session.get_tickets()]
                     use_cache = True
 
         if not use_cache:
-            with console.status("[bold green]Fetching your tickets..."):
-                self.current_tickets = self.jira.get_my_tickets()
-            self.session.update_session(self.current_tickets)
+            self.current_tickets = self._sync_tickets()
 
         if not self.current_tickets:
             console.print("No open tickets found. Time to take a break! ☕", style="green")
-            return
+            return False
 
         # Record last scan time
         self.session.set_last_scan()
@@ -642,7 +1463,21 @@ class WorkAssistant:
         # Determine ticket hash for caching
         self.current_ticket_hash = self._calculate_ticket_hash(self.current_tickets)
 
-        # Try to load cached analysis summary
+        if attached and self.current_analysis:
+            self._display_analysis()
+        else:
+            self._show_cached_or_fresh_analysis()
+
+        # If resuming, optionally focus on last ticket
+        if resume and self.session.get_current_focus():
+            self._focus_on_ticket(self.session.get_current_focus())
+
+        if resume and self.saved_focus_key:
+            self._focus_on_ticket(self.saved_focus_key)
+        return True
+
+    def _show_cached_or_fresh_analysis(self):
+        """Show the cached analysis summary for the current tickets, or run the analysis"""
         cached = None
         try:
             cached = self.analysis_cache.get(self.current_ticket_hash)
@@ -662,9 +1497,9 @@ class WorkAssistant:
                 other_notable=self.current_tickets[1:4] if len(self.current_tickets) > 1 else [],
                 summary=cached["summary"],
             )
+            self._display_analysis()
         else:
-            with console.status("[bold green]Analyzing priorities..."):
-                self.current_analysis = self.llm.analyze_workload(self.current_tickets)
+            self._run_analysis()
             # Store in both caches
             if hasattr(self.analysis_cache, 'set'):
                 try:
@@ -677,18 +1512,33 @@ class WorkAssistant:
                 except Exception:
                     pass
 
-        # Display the analysis once
-        self._display_analysis()
-
-        # If resuming, optionally focus on last ticket
-        if resume and self.session.get_current_focus():
-            self._focus_on_ticket(self.session.get_current_focus())
-
-        if resume and self.saved_focus_key:
-            self._focus_on_ticket(self.saved_focus_key)
+    def _attach_daemon(self, resync: bool = False) -> bool:
+        """Take tickets and analysis from a running sync daemon; False when none is running.
 
-        # Start interactive session
-        self._interactive_session()
+        With ``resync`` the daemon also starts syncing with Jira. The session
+        still opens on the current snapshot without waiting for it.
+        """
+        if not self.use_daemon:
+            return False
+        client = DaemonClient()
+        if resync:
+            client.request("resync")
+        snapshot = client.snapshot()
+        if not snapshot or not snapshot['tickets']:
+            return False
+        with span("daemon.attach"):
+            self.current_tickets = [Ticket.from_dict(t) for t in snapshot['tickets']]
+            analysis = snapshot.get('analysis')
+            self.current_analysis = WorkloadAnalysis.from_dict(analysis, self.current_tickets) if analysis else None
+            # Keep our own snapshot current so delta sync still works without the daemon
+            self.session.update_session(self.current_tickets)
+        synced = datetime.fromisoformat(snapshot['synced_at'])
+        minutes = int((datetime.now() - synced).total_seconds() // 60)
+        console.print(f"⚡ Attached to the sync daemon: {len(self.current_tickets)} tickets, "
+                      f"synced {'just now' if minutes < 1 else f'{minutes} min ago'}")
+        if resync:
+            console.print("🔄 The daemon is resyncing with Jira in the background; 'refresh' fetches right now")
+        return True
 
     def fresh_scan(self):
         """Force ticket retrieval and fresh analysis"""
@@ -697,26 +1547,50 @@ class WorkAssistant:
         self.current_focus = None
         self.saved_focus_key = None
         self.save_state()
-        self.start_session()
+        self.start_session(fresh=True)
 
-    def _display_analysis(self):
+    @traced("analysis")
+    def _run_analysis(self):
+        """Analyze the current tickets and display the result"""
+        if not self.stream:
+            with console.status("[bold green]Analyzing priorities..."):
+                self.current_analysis = self.llm.analyze_workload(self.current_tickets)
+            self._display_analysis()
+            return
+        with LivePanel(console, "🎯 Your Work Analysis", "blue", title_align="left",
+                       placeholder="Analyzing priorities...") as panel:
+            self.current_analysis = self.llm.analyze_workload(self.current_tickets, on_token=panel.on_token)
+            panel.finish(self.current_analysis.summary)
+        self._display_analysis(show_summary=False)
+
+    def _ask_llm(self, title: str, border_style: str, status: str, call: Callable[[Optional[TokenCallback]], str]) -> str:
+        """Run an LLM call and show its answer, streaming into a live panel when enabled"""
+        if not self.stream:
+            with console.status(f"[bold green]{status}"):
+                text = call(None)
+            console.print(Panel(text, title=title, border_style=border_style))
+            return text
+        with LivePanel(console, title, border_style, placeholder=status) as panel:
+            text = call(panel.on_token)
+            panel.finish(text)
+        return text
+
+    @traced("render")
+    def _display_analysis(self, show_summary: bool = True):
         """Display the AI workload analysis"""
         if not self.current_analysis:
             return
             
         analysis = self.current_analysis
         
-        # Clean up the analysis text (remove any debug tags)
-        clean_summary = re.sub(r'<think>.*?</think>', '', analysis.summary, flags=re.DOTALL)
-        clean_summary = clean_summary.strip()
-        
-        # Main analysis panel
-        console.print(Panel(
-            clean_summary,
-            title="🎯 Your Work Analysis",
-            title_align="left",
-            border_style="blue"
-        ))
+        # Main analysis panel (already rendered when it was streamed)
+        if show_summary:
+            console.print(Panel(
+                strip_think(analysis.summary),
+                title="🎯 Your Work Analysis",
+                title_align="left",
+                border_style="blue"
+            ))
         
         if analysis.top_priority:
             # Top priority ticket details
@@ -746,42 +1620,58 @@ Why it's urgent: {analysis.priority_reasoning}"""
                 border_style="green"
             ))
 
+    @traced("rescan")
     def _refresh_analysis(self):
         """Clear cached analysis and recompute"""
         # Clear caches
-        try:
-            if self.current_ticket_hash and hasattr(self.analysis_cache, 'get'):
-                self.analysis_cache.set(self.current_ticket_hash, {})
-        except Exception:
-            pass
-        try:
-            self.semantic_cache.clear()
-        except Exception:
-            pass
-
-        self.llm.clear_cache()
+        with span("cache.clear"):
+            try:
+                if self.current_ticket_hash and hasattr(self.analysis_cache, 'get'):
+                    self.analysis_cache.set(self.current_ticket_hash, {})
+            except Exception:
+                pass
+            try:
+                self.semantic_cache.clear()
+            except Exception:
+                pass
 
-        console.print("\n🔄 Refreshing workload analysis...")
-        self.llm.clear_cache()
+            console.print("\n🔄 Refreshing workload analysis...")
+            self.llm.clear_cache()
 
-        with console.status("[bold green]Fetching your tickets..."):
-            self.current_tickets = self.jira.get_my_tickets()
-        self.session.update_session(self.current_tickets)
+        self.current_tickets = self._sync_tickets()
 
-        with console.status("[bold green]Analyzing priorities..."):
-            self.current_analysis = self.llm.analyze_workload(self.current_tickets)
+        self._run_analysis()
 
         self.current_ticket_hash = self._calculate_ticket_hash(self.current_tickets)
-        try:
-            self.analysis_cache.set(self.current_ticket_hash, {"summary": self.current_analysis.summary})
-        except Exception:
-            pass
-        try:
-            self.semantic_cache.set_by_content({"summary": self.current_analysis.summary}, self.current_ticket_hash)
-        except Exception:
-            pass
+        with span("cache.store"):
+            try:
+                self.analysis_cache.set(self.current_ticket_hash, {"summary": self.current_analysis.summary})
+            except Exception:
+                pass
+            try:
+                self.semantic_cache.set_by_content({"summary": self.current_analysis.summary}, self.current_ticket_hash)
+            except Exception:
+                pass
 
-        self._display_analysis()
+    def _start_prefetch(self):
+        """Generate suggestions for the top tickets in the background while the user reads"""
+        self._cancel_prefetch()
+        analysis = self.current_analysis
+        if self.prefetch_workers <= 0 or not analysis or not analysis.top_priority:
+            return
+        top = analysis.top_priority
+        tickets = [top] + [t for t in analysis.other_notable if t.key != top.key]
+        # Most likely picks first: Enter/1 (focus), 3 (advise), then the rest
+        jobs = [(top, CONTEXT_DEFAULT), (top, CONTEXT_HELP)]
+        jobs += [(t, CONTEXT_DEFAULT) for t in tickets[1:]]
+        jobs += [(t, context) for t in tickets for context in (CONTEXT_RESEARCH, CONTEXT_PLAN)]
+        self.prefetcher = SuggestionPrefetcher(self.llm.suggest_action, max_workers=self.prefetch_workers)
+        self.prefetcher.start(jobs)
+
+    def _cancel_prefetch(self):
+        if self.prefetcher:
+            self.prefetcher.cancel()
+            self.prefetcher = None
 
     def _interactive_session(self):
         """Handle interactive conversation with the user"""
@@ -801,13 +1691,18 @@ Why it's urgent: {analysis.priority_reasoning}"""
             console.print("  4) Choose a ticket by key")
             console.print("  5) Quit")
         console.print("="*60 + "\n")
+        self._start_prefetch()
         
         while True:
             try:
                 user_input = Prompt.ask("\n[bold blue]What should we tackle?[/bold blue] (press Enter for default)").strip()
                 self.last_user_input = user_input.lower()
-                
-                if self._handle_user_input(user_input):
+
+                if self.profile_commands and user_input and not user_input.lower().startswith('profile '):
+                    done = self._profile_command(user_input)
+                else:
+                    done = self._handle_user_input(user_input)
+                if done:
                     break
                     
             except KeyboardInterrupt:
@@ -815,6 +1710,9 @@ Why it's urgent: {analysis.priority_reasoning}"""
                 break
             except Exception as e:
                 console.print(f"❌ Something went wrong: {e}", style="red")
+        self._cancel_prefetch()
+        if self.metrics_file:
+            self._export_metrics(self.metrics_file, quiet=True)
     
     def _handle_user_input(self, user_input: str) -> bool:
         """Handle various user inputs with improved parsing"""
@@ -849,10 +1747,15 @@ Why it's urgent: {analysis.priority_reasoning}"""
         if input_lower in ['list','tickets','2']:
             self._list_tickets()
             return False
+        if input_lower.startswith('list ') or input_lower.startswith('find '):
+            self._list_tickets(user_input.strip()[5:].strip())
+            return False
 
         # Refresh analysis
         if input_lower in ['refresh','rescan']:
+            self._cancel_prefetch()
             self._refresh_analysis()
+            self._start_prefetch()
             return False
 
         # Smart command parsing
@@ -887,10 +1790,10 @@ Why it's urgent: {analysis.priority_reasoning}"""
 
         if input_lower in ['re analyze', 'reanalyze', 're-analyze']:
             console.print("🔁 Re-analyzing your workload...")
+            self._cancel_prefetch()
             self.llm.clear_cache()
-            with console.status("[bold green]Analyzing priorities..."):
-                self.current_analysis = self.llm.analyze_workload(self.current_tickets)
-            self._display_analysis()
+            self._run_analysis()
+            self._start_prefetch()
             return False
         # Numeric shortcut: 4 = choose a ticket by key (prompt)
         if input_lower == '4':
@@ -909,6 +1812,28 @@ Why it's urgent: {analysis.priority_reasoning}"""
         if input_lower in ['health','check']:
             self._health_check()
             return False
+
+        # Timing breakdown of recent operations
+        if input_lower == 'stats' or input_lower.startswith('stats '):
+            arg = input_lower[5:].strip()
+            if arg and not arg.isdigit():
+                console.print("❌ Usage: stats [N] (N = how many recent operations)", style="red")
+                return False
+            self._show_stats(int(arg) if arg else 10)
+            return False
+
+        if input_lower.startswith('profile '):
+            return self._profile_command(user_input.strip()[8:].strip())
+
+        # Merged priority view over the queue profiles in QUEUES_FILE
+        if input_lower == 'queues' or input_lower.startswith('queues '):
+            self._show_queues(user_input.strip()[7:].split())
+            return False
+
+        # Prometheus export of LLM and cache metrics
+        if input_lower == 'metrics' or input_lower.startswith('metrics '):
+            self._export_metrics(user_input.strip()[7:].strip() or self.metrics_file or 'metrics.prom')
+            return False
         
         # Context-aware responses
         if self.current_focus:
@@ -983,14 +1908,151 @@ Why it's urgent: {analysis.priority_reasoning}"""
         try:
             url = f"{os.getenv('JIRA_BASE_URL').rstrip('/')}/rest/api/3/myself"
             auth = (os.getenv('JIRA_EMAIL'), os.getenv('JIRA_API_TOKEN'))
-            resp = requests.get(url, auth=auth, timeout=5)
+            resp = http_client.get_http_client().get(url, endpoint='jira', auth=auth, timeout=(5, 5))
             if resp.status_code == 200:
                 console.print("✅ Jira API reachable")
             else:
                 console.print(f"⚠️ Jira API responded with status {resp.status_code}", style="yellow")
         except Exception as e:
             console.print(f"⚠️ Jira connectivity check failed: {e}", style="yellow")
-    
+
+        # Transport stats for this session
+        for host, stats in http_client.get_http_client().stats().items():
+            console.print(
+                f"📡 {host}: {stats.requests} requests, {stats.retries} retries, "
+                f"{stats.errors} errors, {stats.throttled} throttled, avg {stats.avg_ms:.0f} ms"
+            )
+
+        # Near-duplicate cache effectiveness
+        for name, cache in (("analysis", self.llm.semantic_cache), ("suggestions", self.llm.semantic_suggestions)):
+            stats = cache.stats()
+            if stats["lookups"]:
+                console.print(
+                    f"🧠 Semantic {name} cache: {stats['hit_rate']:.0%} hit rate "
+                    f"({stats['near_hits']} near), {stats['false_hit_rate']:.0%} false hits"
+                )
+
+        self._show_metrics()
+        if self.metrics_file:
+            self._export_metrics(self.metrics_file)
+
+    def _show_metrics(self):
+        """Show LLM latency and token counts by call type, and hit ratios per cache"""
+        def ms(seconds: Optional[float]) -> str:
+            return f"{seconds * 1000:.0f}" if seconds is not None else "-"
+
+        llm_rows = llm_summary()
+        if llm_rows:
+            models = sorted({f"{row['provider']}/{row['model']}" for row in llm_rows})
+            table = Table(title=f"📊 LLM calls this session ({', '.join(models)})")
+            table.add_column("Call", style="cyan")
+            for column in ("Calls", "Errors", "p50 ms", "p95 ms", "First token ms", "Tokens in", "Tokens out", "Tok/s"):
+                table.add_column(column, justify="right")
+            for row in llm_rows:
+                rate = row["tokens_per_s_p50"]
+                table.add_row(
+                    row["call"] if len(models) == 1 else f"{row['call']} ({row['provider']}/{row['model']})",
+                    str(row["calls"]), str(row["errors"] or ""),
+                    ms(row["p50_s"]), ms(row["p95_s"]), ms(row["first_token_p50_s"]),
+                    f"{row['prompt_tokens']:,}", f"{row['completion_tokens']:,}", f"{rate:.0f}" if rate else "-",
+                )
+            console.print(table)
+            console.print("Token counts are estimated from the prompt and reply text.", style="dim")
+
+        cache_rows = cache_summary()
+        if cache_rows:
+            table = Table(title="📊 Caches this session")
+            table.add_column("Namespace", style="cyan")
+            for column in ("Hits", "Misses", "Hit ratio", "Near hits", "Expired", "Evicted"):
+                table.add_column(column, justify="right")
+            for row in cache_rows:
+                ratio = row["hit_ratio"]
+                table.add_row(
+                    row["namespace"], str(row["hits"]), str(row["misses"]), f"{ratio:.0%}" if ratio is not None else "-",
+                    str(row["near_hits"] or ""), str(row["expired"] or ""), str(row["evicted"] or ""),
+                )
+            console.print(table)
+
+        flight_rows = [row for row in single_flight_summary() if row["shared"]]
+        if flight_rows:
+            console.print("🔁 Identical calls in flight shared one request: " + ", ".join(
+                f"{row['group']} {row['shared']} of {row['calls']}" for row in flight_rows
+            ), style="dim")
+
+        if not llm_rows and not cache_rows:
+            console.print("📊 No LLM calls or cache lookups recorded yet.", style="dim")
+
+    def _export_metrics(self, path: str, quiet: bool = False):
+        """Write all metrics to ``path`` in the Prometheus text format"""
+        try:
+            get_registry().write_prometheus(path)
+        except OSError as e:
+            console.print(f"❌ Could not write metrics to {path}: {e}", style="red")
+            return
+        if not quiet:
+            console.print(f"📈 Metrics written to {path}", style="dim")
+
+    def _show_stats(self, last: int = 10):
+        """Show where the last ``last`` operations spent their time"""
+        operations = get_tracer().recent(last)
+        if not operations:
+            console.print("No timed operations yet; try 'rescan' or 'focus <ticket>' first.", style="yellow")
+            return
+
+        recent = Table(title=f"⏱️ Last {len(operations)} operations")
+        recent.add_column("When", style="dim")
+        recent.add_column("Operation", style="cyan")
+        recent.add_column("Total ms", justify="right")
+        recent.add_column("Slowest phases")
+        for operation in operations:
+            slowest = sorted(((sum(d), path) for path, d in operation.phases().items() if "/" not in path), reverse=True)
+            recent.add_row(
+                operation.started_at.strftime("%H:%M:%S"),
+                operation.name,
+                f"{operation.duration_ms:.0f}",
+                ", ".join(f"{path} {ms:.0f}" for ms, path in slowest[:3]),
+            )
+        console.print(recent)
+
+        by_name: Dict[str, List[Any]] = {}
+        for operation in operations:
+            by_name.setdefault(operation.name, []).append(operation)
+        phases = get_tracer().breakdown(last)
+        breakdown = Table(title="Phase breakdown")
+        breakdown.add_column("Phase", style="cyan")
+        breakdown.add_column("Calls", justify="right")
+        breakdown.add_column("Total ms", justify="right")
+        breakdown.add_column("Avg ms", justify="right")
+        breakdown.add_column("Max ms", justify="right")
+        for name, runs in by_name.items():
+            durations = [op.duration_ms for op in runs]
+            breakdown.add_row(f"[bold]{name}[/bold]", str(len(runs)), f"{sum(durations):.1f}",
+                              f"{sum(durations) / len(runs):.1f}", f"{max(durations):.1f}")
+            for path, calls, total, longest in phases:
+                if path.startswith(name + "/"):
+                    label = "  " * path.count("/") + path.rsplit("/", 1)[-1]
+                    breakdown.add_row(label, str(calls), f"{total:.1f}", f"{total / calls:.1f}", f"{longest:.1f}")
+            untraced = sum(op.untraced_ms() for op in runs)
+            breakdown.add_row("  (untraced)", "", f"{untraced:.1f}", f"{untraced / len(runs):.1f}", "", style="dim")
+        console.print(breakdown)
+        console.print("Phases on worker threads overlap, so they can add up to more than their parent.", style="dim")
+
+    def _profile_command(self, command: str) -> bool:
+        """Run one command under cProfile and show the functions it spent the most time in"""
+        if not command:
+            console.print("❌ Usage: profile <command> (e.g. 'profile rescan')", style="red")
+            return False
+        done, rows = profile_call(functools.partial(self._handle_user_input, command), top=self.profile_top)
+        table = Table(title=f"🔬 Profile of '{command}' (top {len(rows)} by cumulative time)")
+        table.add_column("Function", style="cyan", overflow="fold")
+        table.add_column("Calls", justify="right")
+        table.add_column("Own ms", justify="right")
+        table.add_column("Cumulative ms", justify="right")
+        for where, calls, own, cumulative in rows:
+            table.add_row(where, str(calls), f"{own * 1000:.1f}", f"{cumulative * 1000:.1f}")
+        console.print(table)
+        return done
+
     def _handle_contextual_input(self, input_lower: str) -> bool:
         """Handle input when we have a current focus ticket"""
         if not self.current_focus:
@@ -1004,14 +2066,14 @@ Why it's urgent: {analysis.priority_reasoning}"""
         
         if any(word in input_lower for word in ['research', 'investigate']):
             console.print(f"🔍 Let me research {ticket.key} for you...")
-            suggestion = self.llm.suggest_action(ticket, "Research this issue deeply and provide technical insights")
-            console.print(Panel(suggestion, title="🔬 Research Results", border_style="blue"))
+            self._ask_llm("🔬 Research Results", "blue", "Researching...",
+                          lambda on_token: self.llm.suggest_action(ticket, CONTEXT_RESEARCH, on_token=on_token))
             return False
         
         if any(word in input_lower for word in ['plan', 'steps', 'action']):
             console.print(f"📋 Creating action plan for {ticket.key}...")
-            plan = self.llm.suggest_action(ticket, "Create a detailed step-by-step action plan")
-            console.print(Panel(plan, title="📋 Action Plan", border_style="green"))
+            self._ask_llm("📋 Action Plan", "green", "Planning...",
+                          lambda on_token: self.llm.suggest_action(ticket, CONTEXT_PLAN, on_token=on_token))
             return False
         
         if any(word in input_lower for word in ['comment', 'update', 'status']):
@@ -1020,9 +2082,19 @@ Why it's urgent: {analysis.priority_reasoning}"""
         
         return False
     
+    @traced("focus")
     def _focus_on_ticket(self, ticket_key: str):
         """Focus on a specific ticket"""
         ticket = self._find_ticket(ticket_key)
+        if not ticket and any(op in ticket_key for op in ':<>='):
+            # A find query: focus on its first match
+            matches = self._query_tickets(ticket_key)
+            if matches is None:
+                return
+            if matches:
+                ticket = matches[0]
+                if len(matches) > 1:
+                    console.print(f"{len(matches)} tickets match; focusing on the first. 'find {ticket_key}' lists them all.", style="dim")
         if not ticket:
             console.print(f"❌ Couldn't find ticket '{ticket_key}'. Try 'list' to see available tickets.", style="red")
             return
@@ -1043,18 +2115,37 @@ Labels: {', '.join(ticket.labels) if ticket.labels else 'None'}
 Description:
 {ticket.description[:500] + '...' if len(ticket.description) > 500 else ticket.description}"""
         
-        console.print(Panel(details.strip(), title=f"📋 {ticket.key}", border_style="blue"))
+        with span("render"):
+            console.print(Panel(details.strip(), title=f"📋 {ticket.key}", border_style="blue"))
+        self._show_recent_activity(ticket)
         
         # Get AI suggestions
-        with console.status("[bold green]Getting AI suggestions..."):
-            suggestion = self.llm.suggest_action(ticket)
-        
-        console.print(Panel(suggestion, title="🤖 AI Suggestion", border_style="green"))
+        self._ask_llm("🤖 AI Suggestion", "green", "Getting AI suggestions...",
+                      lambda on_token: self.llm.suggest_action(ticket, CONTEXT_DEFAULT, on_token=on_token))
         
         # Ask for next action
         console.print(f"\n💡 I can help you with {ticket.key}. What would you like to do?")
         console.print("Say: 'research', 'plan', 'comment', or 'help me' for options")
     
+    def _show_recent_activity(self, ticket: Ticket, limit: int = 5):
+        """Show the latest changelog entries for a ticket (fetched on demand)"""
+        try:
+            histories = self.jira.get_changelog(ticket)
+        except Exception as e:
+            console.print(f"⚠️ Couldn't load history for {ticket.key}: {e}", style="yellow")
+            return
+        if not isinstance(histories, list) or not histories:
+            return
+
+        lines = []
+        for history in histories[-limit:]:
+            when = (history.get('created') or '')[:10]
+            who = history.get('author') or 'Someone'
+            for item in history.get('items', []):
+                lines.append(f"{when} {who}: {item.get('field')} {item.get('from') or '∅'} → {item.get('to') or '∅'}")
+        if lines:
+            console.print(Panel("\n".join(lines[-limit:]), title="🕑 Recent Activity", border_style="dim"))
+
     def _get_ticket_help(self, ticket_key: str):
         """Get specific help for a ticket"""
         ticket = self._find_ticket(ticket_key)
@@ -1066,15 +2157,15 @@ Description:
         self.save_state()
         console.print(f"\n🆘 Getting help for {ticket.key}...")
         
-        with console.status("[bold green]Analyzing ticket and generating help..."):
-            suggestion = self.llm.suggest_action(ticket, "The user specifically asked for help with this ticket")
-        
-        console.print(Panel(suggestion, title=f"🤖 How to tackle {ticket.key}", border_style="green"))
+        self._ask_llm(f"🤖 How to tackle {ticket.key}", "green", "Analyzing ticket and generating help...",
+                      lambda on_token: self.llm.suggest_action(ticket, CONTEXT_HELP, on_token=on_token))
+        self._show_recent_activity(ticket)
         
         # Ask if they want to take action
         if Confirm.ask("\nWould you like me to help you take action on this ticket?"):
             self._offer_actions(ticket)
     
+    @traced("comment")
     def _help_with_comment(self, ticket_key: str):
         """Help draft and post a comment"""
         ticket = self._find_ticket(ticket_key)
@@ -1085,38 +2176,20 @@ Description:
         console.print(f"\n💬 Let's add a comment to {ticket.key}")
 
         # Get comment context
-        context = Prompt.ask("What's the context for this comment? (e.g., 'status update', 'investigation results', 'next steps')")
+        # Time spent waiting on the user is kept out of the other phases
+        with span("prompt"):
+            context = Prompt.ask("What's the context for this comment? (e.g., 'status update', 'investigation results', 'next steps')")
 
         # Persist note about progress
         self.session.add_ticket_note(ticket.key, context)
         
         # Generate comment suggestion
-        comment_prompt = f"""Help me draft a professional Jira comment for this ticket:
-
-Ticket: {ticket.key} - {ticket.summary}
-Context: {context}
-Current status: {ticket.status}
-
-Write a concise, professional comment that provides value to stakeholders. 
-Focus on progress, next steps, or findings based on the context provided."""
-        
-        with console.status("[bold green]Drafting comment..."):
-            try:
-                if self.llm.provider == 'openai':
-                    response = openai.chat.completions.create(
-                        model=self.llm.model,
-                        messages=[{"role": "user", "content": comment_prompt}],
-                        temperature=0.7
-                    )
-                    suggested_comment = response.choices[0].message.content
-                else:
-                    suggested_comment = f"Status update: Working on {ticket.summary}. {context}. Will provide updates as progress is made."
-            except:
-                suggested_comment = f"Status update: Working on {ticket.summary}. {context}. Will provide updates as progress is made."
-        
-        console.print(Panel(suggested_comment, title="📝 Suggested Comment", border_style="yellow"))
+        suggested_comment = self._ask_llm("📝 Suggested Comment", "yellow", "Drafting comment...",
+                                          lambda on_token: self.llm.draft_comment(ticket, context, on_token=on_token))
         
-        if Confirm.ask("Should I post this comment to Jira?"):
+        with span("prompt"):
+            post = Confirm.ask("Should I post this comment to Jira?")
+        if post:
             if self.jira.add_comment(ticket.key, suggested_comment):
                 console.print("✅ Comment posted successfully!", style="green")
             else:
@@ -1136,18 +2209,26 @@ Focus on progress, next steps, or findings based on the context provided."""
             self._help_with_comment(ticket.key)
         elif choice == "2":
             console.print("🔍 Let me research this issue...")
-            research = self.llm.suggest_action(ticket, "Research this issue deeply and provide technical insights")
-            console.print(Panel(research, title="🔬 Research Results", border_style="blue"))
+            self._ask_llm("🔬 Research Results", "blue", "Researching...",
+                          lambda on_token: self.llm.suggest_action(ticket, CONTEXT_RESEARCH, on_token=on_token))
         elif choice == "3":
             console.print("📋 Creating action plan...")
-            plan = self.llm.suggest_action(ticket, "Create a detailed step-by-step action plan to resolve this ticket")
-            console.print(Panel(plan, title="📋 Action Plan", border_style="green"))
+            self._ask_llm("📋 Action Plan", "green", "Planning...",
+                          lambda on_token: self.llm.suggest_action(ticket, CONTEXT_PLAN, on_token=on_token))
         else:
             console.print("👍 No problem! Let me know if you need help with anything else.")
     
-    def _list_tickets(self):
-        """Display all tickets in a nice table"""
-        table = Table(title="📋 Your Current Tickets")
+    def _list_tickets(self, query: str = ""):
+        """Display tickets in a nice table, optionally filtered by a find query"""
+        tickets = self._query_tickets(query) if query else self.current_tickets
+        if tickets is None:
+            return
+        if not tickets:
+            console.print(f"No tickets match '{query}'." if query else "No tickets loaded.", style="yellow")
+            return
+
+        title = f"🔎 {len(tickets)} of {len(self.current_tickets)} tickets matching {query}" if query else "📋 Your Current Tickets"
+        table = Table(title=title)
         table.add_column("Key", style="cyan", width=12)
         table.add_column("Priority", style="red", width=8)
         table.add_column("Status", style="green", width=12)
@@ -1156,7 +2237,7 @@ Focus on progress, next steps, or findings based on the context provided."""
         table.add_column("Stale", style="yellow3", width=6)
         table.add_column("Summary", style="white")
         
-        for ticket in self.current_tickets:
+        for ticket in tickets:
             # Color code by staleness
             stale_style = "red" if ticket.stale_days > 60 else "yellow3" if ticket.stale_days > 30 else "white"
             
@@ -1173,15 +2254,71 @@ Focus on progress, next steps, or findings based on the context provided."""
         
         # Show quick action hints
         console.print(f"\n💡 Quick actions:")
-        console.print(f"• focus <key> - Get detailed analysis (e.g., 'focus {self.current_tickets[0].key}')")
-        console.print(f"• help <key> - Get AI assistance (e.g., 'help {self.current_tickets[0].key}')")
+        console.print(f"• focus <key> - Get detailed analysis (e.g., 'focus {tickets[0].key}')")
+        console.print(f"• help <key> - Get AI assistance (e.g., 'help {tickets[0].key}')")
+        if not query:
+            console.print("• find <query> - Filter, e.g. 'find status:\"In Progress\" stale>30 sort:-priority'")
     
+    def _show_queues(self, names: List[str], limit: int = 25):
+        """Rank every queue profile (or just ``names``) together in one table"""
+        from queues import MultiQueue, load_profiles
+
+        try:
+            profiles = load_profiles()
+        except ValueError as e:
+            console.print(f"❌ {e}", style="red")
+            return
+        if names:
+            unknown = set(names) - {p.name for p in profiles}
+            if unknown:
+                console.print(f"❌ Unknown queue profile(s): {', '.join(sorted(unknown))}. "
+                              f"Known: {', '.join(p.name for p in profiles)}", style="red")
+                return
+            profiles = [p for p in profiles if p.name in names]
+
+        with console.status("[bold green]Fetching queues...") as status:
+            result = MultiQueue(profiles, llm=self.llm).run(
+                analyze=False, on_status=lambda message: status.update(f"[bold green]{message}..."))
+        for name, error in result.errors.items():
+            console.print(f"❌ Queue {name} failed: {error}", style="red")
+        if not result.items:
+            console.print("No tickets in these queues.", style="yellow")
+            return
+
+        counts = ", ".join(f"{name} {count}" for name, count in result.counts.items())
+        multi_site = len({p.site.name for p in profiles}) > 1
+        table = Table(title=f"🗂️ {len(result.items)} tickets across {len(result.counts)} queues ({counts})")
+        table.add_column("#", justify="right", style="dim")
+        table.add_column("Key", style="cyan", width=12)
+        if multi_site:
+            table.add_column("Site", style="magenta")
+        table.add_column("Queues", style="blue")
+        table.add_column("Priority", style="red", width=8)
+        table.add_column("Urgency", justify="right", style="yellow")
+        table.add_column("Why", style="white")
+        for rank, item in enumerate(result.items[:limit], 1):
+            assessment = item.assessment or {}
+            reason = assessment.get('reason') or item.ticket.summary
+            row = [str(rank), item.ticket.key] + ([item.site] if multi_site else []) + [
+                ", ".join(item.queues), item.ticket.priority, str(assessment.get('urgency', '?')),
+                reason[:80] + "..." if len(reason) > 80 else reason,
+            ]
+            table.add_row(*row)
+        console.print(table)
+        if len(result.items) > limit:
+            console.print(f"(+{len(result.items) - limit} lower-ranked tickets not shown)", style="dim")
+
+    def _query_tickets(self, query: str) -> Optional[List[Ticket]]:
+        """Run a find query; prints the problem and returns None if it doesn't parse"""
+        try:
+            return self.ticket_store.find(query)
+        except QueryError as e:
+            console.print(f"❌ {e}", style="red")
+            return None
+
     def _find_ticket(self, ticket_key: str) -> Optional[Ticket]:
         """Find a ticket by key (case-insensitive)"""
-        for ticket in self.current_tickets:
-            if ticket.key.lower() == ticket_key.lower():
-                return ticket
-        return None
+        return self.ticket_store.get(ticket_key)
     
     def _show_help(self):
         """Show available commands"""
@@ -1190,12 +2327,17 @@ Focus on progress, next steps, or findings based on the context provided."""
 
 Basic Commands:
 • list - Show all your tickets in a table
+• find <query> - Filter tickets (also works as 'list <query>' and 'focus <query>')
 • focus <ticket-key> - Get detailed analysis of a specific ticket
 • help <ticket-key> - Get AI assistance and action suggestions
 • comment <ticket-key> - Draft and post a comment with AI help
 • refresh - Re-run workload analysis
 • open <ticket-key> - Print the Jira URL to open in browser
-• health - Run environment and connectivity checks
+• health - Run environment and connectivity checks, with LLM and cache metrics
+• queues [name...] - Rank all queue profiles from QUEUES_FILE together (or just the named ones)
+• metrics [file] - Export metrics in the Prometheus text format (default METRICS_FILE or metrics.prom)
+• stats [N] - Timing breakdown of the last N operations (default 10)
+• profile <command> - Run a command under cProfile and show the slowest functions
 • quit - End the session
 
 Smart Commands:
@@ -1210,8 +2352,14 @@ When focused on a ticket, you can say:
 • comment - Draft a status update
 • help me - See all available actions
 
+Find queries:
+• field:value for status, priority, label, type, assignee, key (-field:value excludes)
+• stale, age, comments with > >= < <= = (e.g. stale>30)
+• sort:-priority,stale and limit:10; other words search key and summary
+
 Examples:
 • focus CPE-3313
+• find status:"In Progress" label:VOC_Feedback stale>30 sort:-priority
 • help CPE-3117
 • comment CPE-2925
 • open CPE-3117
@@ -1231,6 +2379,28 @@ The assistant understands natural language, so you can also:
 
 def main():
     """Main application entry point"""
+
+    if '--import-profile' in sys.argv[1:]:
+        from startup_profile import run_import_profile
+        run_import_profile(console)
+        return
+
+    # A subcommand (sync, list, analyze, suggest, comment) runs non-interactively; see batch_cli.py
+    if len(sys.argv) > 1 and not sys.argv[1].startswith('-'):
+        from batch_cli import cli
+        cli(sys.argv[1:], prog_name="assistant.py")
+        return
+
+    # --trace [FILE] appends spans as trace events; --profile runs each command under cProfile
+    args = sys.argv[1:]
+    if '--trace' in args:
+        index = args.index('--trace') + 1
+        path = args[index] if index < len(args) and not args[index].startswith('--') else 'trace.jsonl'
+        get_tracer().trace_file = path
+        console.print(f"📈 Writing trace events to {path} (convert with: python tracing.py {path} trace.json)",
+                      style="dim")
+    if '--profile' in args:
+        os.environ['PROFILE_COMMANDS'] = '1'
     
     # Check for required environment variables
     required_vars = ['JIRA_BASE_URL', 'JIRA_EMAIL', 'JIRA_API_TOKEN']
@@ -0,0 +1,341 @@
+"""Non-interactive commands for cron jobs and pipelines.
+
+``python assistant.py <command>`` (or ``python batch_cli.py <command>``)
+runs one of ``sync``, ``list``, ``analyze``, ``queues``, ``suggest`` or
+``comment`` without prompts or rich output. Results are written to stdout as they are
+ready, in the format chosen with ``--format``: ``json`` (an array), ``csv``
+or ``ndjson`` (one object per line). Diagnostics go to stderr.
+
+``list`` and ``analyze`` accept ``--jql`` several times (e.g. one queue per
+engineer) and run the queries concurrently. Records are emitted in
+completion order and carry a ``queue`` field naming their JQL. ``queues``
+runs the named profiles from ``QUEUES_FILE`` (see ``queues.py``), possibly on
+several Jira sites, and emits one merged priority list.
+
+Exit codes: 0 success, 1 error, 2 usage error, 3 ticket not found,
+4 some queues failed while others succeeded.
+"""
+
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence
+
+import click
+
+import assistant
+from assistant import CONTEXT_DEFAULT, JiraClient, LLMClient, Ticket, WorkAssistant, WorkloadAnalysis
+from queues import MultiQueue, load_profiles
+from ticket_store import QueryError, TicketStore
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_NOT_FOUND = 3
+EXIT_PARTIAL = 4
+
+FORMATS = ("json", "csv", "ndjson")
+
+TICKET_COLUMNS = (
+    "key", "summary", "priority", "status", "assignee", "issue_type", "labels",
+    "age_days", "stale_days", "comments_count", "updated",
+)
+ANALYSIS_COLUMNS = (
+    "tickets", "top_priority", "priority_reasoning", "next_steps", "other_notable", "summary", "elapsed_ms",
+)
+QUEUE_ITEM_COLUMNS = (
+    "rank", "site", "key", "queues", "summary", "priority", "status", "urgency", "reason", "next_step",
+)
+
+
+class RecordWriter:
+    """Write records to ``out`` one at a time, flushing each so consumers see them immediately."""
+
+    def __init__(self, fmt: str, columns: Sequence[str], out: Optional[IO[str]] = None) -> None:
+        self.fmt = fmt
+        self.columns = list(columns)
+        self.out = out or sys.stdout
+        self.count = 0
+        self._csv: Optional[csv.DictWriter] = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self.fmt == "ndjson":
+            self.out.write(json.dumps(record, default=str) + "\n")
+        elif self.fmt == "json":
+            self.out.write(("[\n" if self.count == 0 else ",\n") + json.dumps(record, default=str))
+        else:
+            if self._csv is None:
+                self._csv = csv.DictWriter(self.out, fieldnames=self.columns, extrasaction="ignore")
+                self._csv.writeheader()
+            self._csv.writerow({name: self._cell(record.get(name)) for name in self.columns})
+        self.count += 1
+        self.out.flush()
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if isinstance(value, (list, tuple)):
+            return "; ".join(str(v) for v in value)
+        if isinstance(value, dict):
+            return json.dumps(value, default=str)
+        return value
+
+    def close(self) -> None:
+        if self.fmt == "json":
+            self.out.write("[]\n" if self.count == 0 else "\n]\n")
+        elif self.fmt == "csv" and self._csv is None:
+            csv.writer(self.out).writerow(self.columns)
+        self.out.flush()
+
+
+def ticket_record(ticket: Ticket) -> Dict[str, Any]:
+    return {
+        "key": ticket.key,
+        "summary": ticket.summary,
+        "priority": ticket.priority,
+        "status": ticket.status,
+        "assignee": ticket.assignee,
+        "issue_type": ticket.issue_type,
+        "labels": list(ticket.labels),
+        "age_days": ticket.age_days,
+        "stale_days": ticket.stale_days,
+        "comments_count": ticket.comments_count,
+        "updated": ticket.updated.isoformat(),
+    }
+
+
+def analysis_record(analysis: WorkloadAnalysis, tickets: int) -> Dict[str, Any]:
+    return {
+        "tickets": tickets,
+        "top_priority": analysis.top_priority.key if analysis.top_priority else None,
+        "priority_reasoning": analysis.priority_reasoning,
+        "next_steps": list(analysis.next_steps),
+        "other_notable": [t.key for t in analysis.other_notable],
+        "summary": analysis.summary,
+    }
+
+
+def _fail(message: str, code: int = EXIT_ERROR) -> None:
+    click.echo(f"error: {message}", err=True)
+    sys.exit(code)
+
+
+def _jira() -> JiraClient:
+    try:
+        return JiraClient()
+    except ValueError as e:
+        _fail(f"{e} (set JIRA_BASE_URL, JIRA_EMAIL and JIRA_API_TOKEN)")
+
+
+def _writer(fmt: str, as_json: bool, columns: Sequence[str]) -> RecordWriter:
+    return RecordWriter("json" if as_json else fmt, columns)
+
+
+def output_options(command: Callable) -> Callable:
+    command = click.option("--json", "as_json", is_flag=True, help="Shorthand for --format json.")(command)
+    command = click.option("--format", "fmt", type=click.Choice(FORMATS), default="ndjson", show_default=True,
+                           help="Output format.")(command)
+    return command
+
+
+def _run_queues(queues: Sequence[str], job: Callable[[str], List[Dict[str, Any]]], writer: RecordWriter,
+                workers: int) -> int:
+    """Run ``job`` for every queue concurrently and stream its records; returns the exit code."""
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(queues)))) as pool:
+        futures = {pool.submit(job, jql): jql for jql in queues}
+        for future in as_completed(futures):
+            jql = futures[future]
+            try:
+                records = future.result()
+            except Exception as e:
+                failed += 1
+                click.echo(f"error: {jql}: {e}", err=True)
+                continue
+            for record in records:
+                writer.write({"queue": jql, **record} if len(queues) > 1 else record)
+    writer.close()
+    if failed == 0:
+        return EXIT_OK
+    return EXIT_ERROR if failed == len(queues) else EXIT_PARTIAL
+
+
+def _columns(base: Sequence[str], queues: Sequence[str]) -> List[str]:
+    return (["queue"] if len(queues) > 1 else []) + list(base)
+
+
+@click.group()
+def cli() -> None:
+    """Scriptable Jira work assistant: no prompts, no rich output."""
+    # Library code reports progress on the shared rich console; keep stdout for records
+    assistant.console.quiet = True
+
+
+@cli.command()
+@click.option("--full", is_flag=True, help="Refetch every ticket instead of a delta sync.")
+@output_options
+def sync(full: bool, fmt: str, as_json: bool) -> None:
+    """Refresh the stored ticket snapshot used by interactive sessions."""
+    wa = WorkAssistant(jira_client=_jira())
+    since = wa.session.sync_cursor
+    try:
+        if full or since is None or os.getenv("SYNC_MODE", "delta") != "delta":
+            tickets = wa.jira.search_tickets()
+            wa.session.update_session(tickets)
+            mode, changed, total = "full", len(tickets), len(tickets)
+        else:
+            mode, changed, total = "delta", len(wa._merge_changes(since)), len(wa.session.get_tickets())
+    except assistant.requests.RequestException as e:
+        _fail(f"sync failed: {e}")
+    writer = _writer(fmt, as_json, ("mode", "tickets", "changed", "synced_at"))
+    writer.write({"mode": mode, "tickets": total, "changed": changed, "synced_at": datetime.now().isoformat()})
+    writer.close()
+
+
+@cli.command("list")
+@click.option("--jql", multiple=True, help="Query to list (repeatable); default: your open tickets.")
+@click.option("--find", "query", default="", help="Filter with the interactive 'find' syntax, e.g. 'stale>30'.")
+@click.option("--cached", is_flag=True, help="Read the stored snapshot instead of querying Jira.")
+@click.option("--workers", default=8, show_default=True, help="Queues fetched at once.")
+@output_options
+def list_tickets(jql: Sequence[str], query: str, cached: bool, workers: int, fmt: str, as_json: bool) -> None:
+    """List tickets, one record per ticket."""
+    if cached and jql:
+        _fail("--cached reads the stored snapshot and cannot be combined with --jql", EXIT_USAGE)
+    queues = list(jql) or [JiraClient.DEFAULT_JQL]
+    try:
+        TicketStore([]).find(query)
+    except QueryError as e:
+        _fail(f"invalid --find query: {e}", EXIT_USAGE)
+
+    def filtered(tickets: List[Ticket]) -> List[Dict[str, Any]]:
+        matches = TicketStore(tickets).find(query) if query else tickets
+        return [ticket_record(t) for t in matches]
+
+    writer = _writer(fmt, as_json, _columns(TICKET_COLUMNS, queues))
+    if cached:
+        wa = WorkAssistant()
+        sys.exit(_run_queues(queues, lambda _: filtered([wa._ticket_from_dict(t) for t in wa.session.get_tickets()]),
+                             writer, 1))
+    jira = _jira()
+    sys.exit(_run_queues(queues, lambda q: filtered(jira.search_tickets(q)), writer, workers))
+
+
+@cli.command()
+@click.option("--jql", multiple=True, help="Queue to analyze (repeatable); default: your open tickets.")
+@click.option("--workers", default=8, show_default=True, help="Queues analyzed at once.")
+@output_options
+def analyze(jql: Sequence[str], workers: int, fmt: str, as_json: bool) -> None:
+    """Prioritize each queue, one record per queue."""
+    queues = list(jql) or [JiraClient.DEFAULT_JQL]
+    jira, llm = _jira(), LLMClient()
+
+    def run(query: str) -> List[Dict[str, Any]]:
+        started = datetime.now()
+        tickets = jira.search_tickets(query)
+        if not tickets:
+            return [{"tickets": 0, "top_priority": None}]
+        # The per-client memo holds one analysis; each queue needs its own
+        record = analysis_record(llm._compute_analysis(tickets), len(tickets))
+        record["elapsed_ms"] = round((datetime.now() - started).total_seconds() * 1000)
+        return [record]
+
+    sys.exit(_run_queues(queues, run, _writer(fmt, as_json, _columns(ANALYSIS_COLUMNS, queues)), workers))
+
+
+@cli.command("queues")
+@click.option("--file", "path", default=None, help="Queue profiles (default: QUEUES_FILE or queues.json).")
+@click.option("--only", multiple=True, help="Run only this profile (repeatable).")
+@click.option("--by-queue", is_flag=True, help="One analysis record per queue instead of the merged list.")
+@click.option("--workers", default=None, type=int, help="Queues and sites worked on at once (QUEUE_WORKERS, 8).")
+@output_options
+def run_queues(path: Optional[str], only: Sequence[str], by_queue: bool, workers: Optional[int],
+               fmt: str, as_json: bool) -> None:
+    """Triage several queue profiles as one workload, one record per distinct ticket."""
+    try:
+        profiles = load_profiles(path)
+    except ValueError as e:
+        _fail(str(e), EXIT_USAGE)
+    if only:
+        unknown = set(only) - {p.name for p in profiles}
+        if unknown:
+            _fail(f"unknown queue profile(s): {', '.join(sorted(unknown))}", EXIT_USAGE)
+        profiles = [p for p in profiles if p.name in only]
+
+    result = MultiQueue(profiles, workers=workers).run(analyze=by_queue)
+    for name, error in result.errors.items():
+        click.echo(f"error: {name}: {error}", err=True)
+
+    if by_queue:
+        writer = _writer(fmt, as_json, ["queue", "site"] + list(ANALYSIS_COLUMNS[:-1]))
+        for profile in profiles:
+            if profile.name in result.analyses:
+                record = analysis_record(result.analyses[profile.name], result.counts[profile.name])
+                writer.write({"queue": profile.name, "site": profile.site.name, **record})
+    else:
+        writer = _writer(fmt, as_json, QUEUE_ITEM_COLUMNS)
+        for rank, item in enumerate(result.items, 1):
+            assessment = item.assessment or {}
+            writer.write({
+                "rank": rank, "site": item.site, "key": item.ticket.key, "queues": item.queues,
+                "summary": item.ticket.summary, "priority": item.ticket.priority, "status": item.ticket.status,
+                "urgency": assessment.get("urgency"), "reason": assessment.get("reason"),
+                "next_step": assessment.get("next_step"),
+            })
+    writer.close()
+    if result.errors:
+        sys.exit(EXIT_ERROR if len(result.errors) >= len(profiles) else EXIT_PARTIAL)
+
+
+def _get_ticket(jira: JiraClient, key: str) -> Ticket:
+    try:
+        tickets = jira.get_tickets_by_key([key.upper()])
+    except assistant.requests.RequestException as e:
+        _fail(f"could not fetch {key}: {e}")
+    if not tickets:
+        _fail(f"ticket {key} not found", EXIT_NOT_FOUND)
+    return tickets[0]
+
+
+@cli.command()
+@click.argument("key")
+@click.option("--context", default=CONTEXT_DEFAULT, show_default=True, help="What you want help with.")
+@click.option("--refresh", is_flag=True, help="Ignore cached suggestions.")
+@output_options
+def suggest(key: str, context: str, refresh: bool, fmt: str, as_json: bool) -> None:
+    """Suggest the next step for one ticket."""
+    ticket = _get_ticket(_jira(), key)
+    suggestion = LLMClient().suggest_action(ticket, context, force_refresh=refresh)
+    writer = _writer(fmt, as_json, ("key", "context", "suggestion"))
+    writer.write({"key": ticket.key, "context": context, "suggestion": suggestion})
+    writer.close()
+
+
+@cli.command()
+@click.argument("key")
+@click.option("--context", default="", help="What the comment should cover; the AI drafts it.")
+@click.option("--body", default=None, help="Post this text as-is instead of an AI draft.")
+@click.option("--yes", is_flag=True, help="Post the comment; without it the draft is only printed.")
+@output_options
+def comment(key: str, context: str, body: Optional[str], yes: bool, fmt: str, as_json: bool) -> None:
+    """Draft a comment for one ticket, and post it with --yes."""
+    if body is None and not context:
+        _fail("give --context for an AI draft or --body for the exact text", EXIT_USAGE)
+    jira = _jira()
+    ticket = _get_ticket(jira, key)
+    text = body if body is not None else LLMClient().draft_comment(ticket, context)
+    posted = jira.add_comment(ticket.key, text) if yes else False
+    writer = _writer(fmt, as_json, ("key", "comment", "posted"))
+    writer.write({"key": ticket.key, "comment": text, "posted": posted})
+    writer.close()
+    if yes and not posted:
+        _fail(f"posting the comment on {ticket.key} failed")
+
+
+COMMANDS = tuple(cli.commands)
+
+
+if __name__ == "__main__":
+    cli()
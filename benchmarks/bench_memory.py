@@ -0,0 +1,92 @@
+"""Bytes per ticket held in memory, legacy dataclass vs compact Ticket.
+
+Usage: python benchmarks/bench_memory.py [--scales 10000,100000]
+
+"before" is the original dataclass layout: datetimes, per-ticket string
+copies and the full issue payload in ``raw_data``. "after" is the slotted
+Ticket with interned strings and epoch timestamps, with and without raw
+payloads (TICKET_KEEP_RAW=1).
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for _var in ("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_API_TOKEN"):
+    os.environ.setdefault(_var, "bench")
+
+from assistant import JiraClient  # noqa: E402
+from benchmarks.synthetic import search_pages  # noqa: E402
+
+
+@dataclass
+class LegacyTicket:
+    key: str
+    summary: str
+    description: str
+    priority: str
+    status: str
+    assignee: Optional[str]
+    created: datetime
+    updated: datetime
+    comments_count: int
+    labels: List[str]
+    issue_type: str
+    raw_data: Dict[str, Any]
+
+
+def _legacy(client: JiraClient, issue: Dict[str, Any]) -> LegacyTicket:
+    t = client._parse_ticket(issue)
+    return LegacyTicket(t.key, t.summary, t.description, issue["fields"]["priority"]["name"],
+                        issue["fields"]["status"]["name"], issue["fields"]["assignee"]["displayName"],
+                        t.created, t.updated, t.comments_count, list(issue["fields"]["labels"]),
+                        issue["fields"]["issuetype"]["name"], issue)
+
+
+def measure(count: int, build: Callable[[Dict[str, Any]], Any]) -> float:
+    """Return traced bytes per ticket still alive once the responses are dropped."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tickets = []
+    for page in search_pages(count):
+        # Decode each page from JSON so strings are distinct objects, as on the wire
+        for issue in json.loads(json.dumps(page))["issues"]:
+            tickets.append(build(issue))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del tickets
+    return used / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="10000,100000")
+    args = parser.parse_args()
+
+    compact = JiraClient()
+    compact.keep_raw = False
+    with_raw = JiraClient()
+    with_raw.keep_raw = True
+
+    variants = [
+        ("before (dataclass + raw)", lambda issue: _legacy(compact, issue)),
+        ("after (compact, raw kept)", with_raw._parse_ticket),
+        ("after (compact)", compact._parse_ticket),
+    ]
+    print(f"{'tickets':>8}  {'variant':<28}{'bytes/ticket':>14}")
+    for count in (int(s) for s in args.scales.split(",")):
+        for name, build in variants:
+            print(f"{count:>8}  {name:<28}{measure(count, build):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Timing benchmarks for the hot paths, with a JSON baseline and regression check.
+
+Usage:
+  python benchmarks/bench_suite.py --scales 100,10000,100000 --output benchmarks/baseline.json
+  python benchmarks/bench_suite.py --compare benchmarks/baseline.json --threshold 0.25
+
+Each case runs against deterministic synthetic issues (ADF descriptions and
+changelogs included) and reports the best of ``--repeat`` runs as time per
+item. ``--compare`` re-runs the baseline's cases and exits non-zero when any
+is slower than the baseline by more than ``--threshold``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for _var in ("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_API_TOKEN"):
+    os.environ.setdefault(_var, "bench")
+
+from assistant import JiraClient, LLMClient, WorkAssistant  # noqa: E402
+from benchmarks.synthetic import generate_issues  # noqa: E402
+from cache import Cache, SQLiteCache  # noqa: E402
+from session_manager import SessionManager  # noqa: E402
+
+# A case builds its inputs once, then returns (items, run); run() is what gets timed
+Case = Callable[[int], Tuple[int, Callable[[], Any]]]
+
+# Cache benchmarks time a fixed number of operations against a cache holding
+# ``scale`` entries. A JSON cache set rewrites the whole file, so fewer sets
+# are timed as the cache grows.
+CACHE_OPS = 200
+
+# Scratch directory for caches and session files; set up by main()
+_WORKDIR = tempfile.gettempdir()
+
+
+def _issues(scale: int) -> List[Dict[str, Any]]:
+    return list(generate_issues(scale, adf=True, changelog=True))
+
+
+def _tickets(scale: int) -> list:
+    client = JiraClient()
+    return [client._parse_ticket(issue) for issue in generate_issues(scale, adf=True)]
+
+
+def case_parse_ticket(scale: int):
+    client = JiraClient()
+    issues = _issues(scale)
+
+    def run():
+        # Time real parsing, not the (key, updated) cache
+        client._parsed.clear()
+        return [client._parse_ticket(issue) for issue in issues]
+    return scale, run
+
+
+def case_parse_ticket_rescan(scale: int):
+    client = JiraClient()
+    issues = _issues(scale)
+    for issue in issues:
+        client._parse_ticket(issue)
+    return scale, lambda: [client._parse_ticket(issue) for issue in issues]
+
+
+def case_extract_text_from_adf(scale: int):
+    client = JiraClient()
+    docs = [issue["fields"]["description"] for issue in generate_issues(scale, adf=True)]
+    return scale, lambda: [client._extract_text_from_adf(doc) for doc in docs]
+
+
+def case_fallback_analysis(scale: int):
+    llm = LLMClient()
+    tickets = _tickets(scale)
+    return scale, lambda: llm._fallback_analysis(tickets)
+
+
+def case_calculate_ticket_hash(scale: int):
+    assistant = WorkAssistant()
+    tickets = _tickets(scale)
+    return scale, lambda: assistant._calculate_ticket_hash(tickets)
+
+
+def _session(scale: int) -> SessionManager:
+    path = os.path.join(_WORKDIR, f"session-{scale}.json")
+    for suffix in ("", ".journal", ".history"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    session = SessionManager(path)
+    session.update_session(_tickets(scale))
+    return session
+
+
+def case_session_save(scale: int):
+    session = _session(scale)
+    return scale, session.save
+
+
+def case_session_load(scale: int):
+    session = _session(scale)
+    return scale, lambda: SessionManager(session.path)
+
+
+def _cache_ops(scale: int, writes: bool = False) -> int:
+    if writes:
+        return max(5, min(CACHE_OPS, scale, 200_000 // scale))
+    return min(CACHE_OPS, scale)
+
+
+def _json_cache(scale: int) -> Cache:
+    path = os.path.join(_WORKDIR, f"cache-{scale}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({f"k{n}": {"analysis_text": "x" * 200} for n in range(scale)}, f)
+    return Cache(path)
+
+
+def _sqlite_cache(scale: int) -> SQLiteCache:
+    cache = SQLiteCache(f"bench-{scale}", filename=os.path.join(_WORKDIR, "sqlite-cache.db"))
+    cache.clear()
+    for n in range(scale):
+        cache.set(f"k{n}", {"analysis_text": "x" * 200})
+    return cache
+
+
+def _cache_get(make: Callable[[int], Any]) -> Case:
+    def case(scale: int):
+        cache = make(scale)
+        ops = _cache_ops(scale)
+        return ops, lambda: [cache.get(f"k{n}") for n in range(ops)]
+    return case
+
+
+def _cache_set(make: Callable[[int], Any]) -> Case:
+    def case(scale: int):
+        cache = make(scale)
+        ops = _cache_ops(scale, writes=True)
+        return ops, lambda: [cache.set(f"k{n}", {"analysis_text": "y" * 200}) for n in range(ops)]
+    return case
+
+
+CASES: Dict[str, Case] = {
+    "JiraClient._parse_ticket": case_parse_ticket,
+    "JiraClient._parse_ticket (rescan)": case_parse_ticket_rescan,
+    "JiraClient._extract_text_from_adf": case_extract_text_from_adf,
+    "LLMClient._fallback_analysis": case_fallback_analysis,
+    "WorkAssistant._calculate_ticket_hash": case_calculate_ticket_hash,
+    "SessionManager.save": case_session_save,
+    "SessionManager.load": case_session_load,
+    "Cache.get (json)": _cache_get(_json_cache),
+    "Cache.set (json)": _cache_set(_json_cache),
+    "Cache.get (sqlite)": _cache_get(_sqlite_cache),
+    "Cache.set (sqlite)": _cache_set(_sqlite_cache),
+}
+
+
+# Small cases are re-run until at least this much time was measured, to damp noise
+MIN_MEASURE_SECONDS = 0.2
+
+
+def run_case(name: str, scale: int, repeat: int) -> Dict[str, Any]:
+    items, run = CASES[name](scale)
+    run()  # warm-up: first-call costs (imports, regex compiles, page cache) aren't the hot path
+    best = float("inf")
+    runs, spent = 0, 0.0
+    while runs < repeat or spent < MIN_MEASURE_SECONDS:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+    return {"items": items, "total_ms": round(best * 1000, 3), "per_item_us": round(best * 1e6 / items, 3)}
+
+
+def run_suite(scales: List[int], repeat: int, names: Optional[List[str]] = None) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for scale in scales:
+        for name in names or CASES:
+            key = f"{name}@{scale}"
+            results[key] = run_case(name, scale, repeat)
+            print(f"{key:<48}{results[key]['per_item_us']:>12.2f} µs/item", flush=True)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Return the case keys that slowed down by more than ``threshold`` (0.25 = 25%)."""
+    regressions = []
+    print(f"\n{'case':<48}{'baseline':>12}{'current':>12}{'change':>10}")
+    for key, now in current["results"].items():
+        before = baseline["results"].get(key)
+        if not before:
+            continue
+        change = now["per_item_us"] / before["per_item_us"] - 1 if before["per_item_us"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{key:<48}{before['per_item_us']:>12.2f}{now['per_item_us']:>12.2f}{change:>+10.0%}{flag}")
+    return regressions
+
+
+def _split_case_key(key: str) -> Tuple[str, int]:
+    name, scale = key.rsplit("@", 1)
+    return name, int(scale)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", help="comma-separated ticket counts (default 100,10000,100000)")
+    parser.add_argument("--cases", help="comma-separated case names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    global _WORKDIR
+    # Keep benchmark caches and state out of the working tree
+    _WORKDIR = tempfile.mkdtemp(prefix="bench-")
+    os.environ["CACHE_DB"] = os.path.join(_WORKDIR, "cache.db")
+
+    names = args.cases.split(",") if args.cases else None
+    try:
+        if args.compare:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+            keys = [_split_case_key(k) for k in baseline["results"]]
+            scales = [int(s) for s in args.scales.split(",")] if args.scales else sorted({s for _, s in keys})
+            names = names or list(dict.fromkeys(n for n, _ in keys if n in CASES))
+            current = run_suite(scales, args.repeat, names)
+        else:
+            scales = [int(s) for s in (args.scales or "100,10000,100000").split(",")]
+            current = run_suite(scales, args.repeat, names)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+            print(f"\nWrote {args.output}")
+
+        if args.compare:
+            regressions = compare(baseline, current, args.threshold)
+            if regressions:
+                print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+                return 1
+            print(f"\nNo regressions beyond {args.threshold:.0%}")
+        return 0
+    finally:
+        shutil.rmtree(_WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
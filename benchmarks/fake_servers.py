@@ -0,0 +1,621 @@
+"""Local stand-ins for the Jira, Ollama and OpenAI APIs, for load and latency tests.
+
+Usage:
+  python benchmarks/fake_servers.py --issues 500 --latency 0.05 --jitter 0.02 --error-rate 0.01
+  python benchmarks/fake_servers.py --from-session session_state.json --tokens-per-second 30
+  python benchmarks/fake_servers.py --record fixtures.json \\
+      --jira-upstream https://yourcompany.atlassian.net --ollama-upstream http://localhost:11434
+  python benchmarks/fake_servers.py --replay fixtures.json
+
+Prints the environment variables that point the assistant at the stand-ins,
+then serves until interrupted. Every response can be delayed (``--latency``
+plus up to ``--jitter`` either way), a share of requests fails with
+``--error-status``, and LLM replies stream at ``--tokens-per-second``.
+
+``--record`` forwards requests to the real services and saves each
+request/response pair (never the headers, so no credentials) to a fixture
+file; ``--replay`` serves those pairs back, falling back to the built-in
+responses for anything not recorded.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_issues  # noqa: E402
+from session_manager import SessionManager  # noqa: E402
+
+# (prompt, json_mode) -> reply text
+Responder = Callable[[str, bool], str]
+
+STREAM_TYPES = ("application/x-ndjson", "text/event-stream")
+_TICKET_KEY = re.compile(r"\b[A-Z][A-Z0-9]+-\d+\b")
+_TOKEN = re.compile(r"\s*\S+")
+
+
+@dataclass
+class Faults:
+    """What every response from a stand-in is put through."""
+    latency: float = 0.0            # seconds added before each response
+    jitter: float = 0.0             # up to this many seconds more or less, uniformly
+    error_rate: float = 0.0         # share of requests answered with error_status instead
+    error_status: int = 503
+    tokens_per_second: float = 0.0  # LLM streaming speed; 0 sends tokens as fast as possible
+    seed: Optional[int] = None
+
+
+@dataclass
+class Reply:
+    status: int = 200
+    body: Any = None                         # JSON-serialisable, or str sent as is
+    content_type: str = "application/json"
+    chunks: Optional[Iterable[str]] = None   # streamed one by one, paced by tokens_per_second
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class Recorder:
+    """Request/response pairs in a JSON fixture file.
+
+    In ``record`` mode stand-ins forward to their upstream and store each
+    reply; in ``replay`` mode stored replies are served instead. Requests are
+    matched on server, method, path, query and body; headers are neither
+    matched nor stored.
+    """
+
+    def __init__(self, path: str, mode: str = "replay") -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown recorder mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def request_key(server: str, method: str, target: str, body: bytes) -> str:
+        parts = urlsplit(target)
+        query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+        try:
+            payload: Any = json.loads(body) if body else None
+        except ValueError:
+            payload = body.decode("utf-8", "replace")
+        source = json.dumps([server, method, parts.path, query, payload], sort_keys=True)
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.entries.get(key)
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.entries[key] = entry
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=1)
+            os.replace(tmp, self.path)
+
+
+class FakeServer:
+    """A threaded HTTP server on localhost with fault injection and record/replay.
+
+    Subclasses list ``(method, path pattern, handler)`` routes; a handler
+    gets the path match, query parameters and decoded JSON body and returns a
+    ``Reply``. Use as a context manager or call ``start()``/``stop()``.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        faults: Optional[Faults] = None,
+        recorder: Optional[Recorder] = None,
+        upstream: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        if recorder is not None and recorder.mode == "record" and not upstream:
+            raise ValueError(f"Recording the {self.name} stand-in needs an upstream URL")
+        self.faults = faults or Faults()
+        self.recorder = recorder
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.requests = 0
+        self.injected_errors = 0
+        self.replayed = 0
+        self._rng = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._routes: List[Tuple[str, Pattern, Callable[..., Reply]]] = [
+            (method, re.compile(pattern + r"$"), handler) for method, pattern, handler in self.routes()
+        ]
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    def routes(self) -> List[Tuple[str, str, Callable[..., Reply]]]:
+        return []
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f"{self.name}-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"requests": self.requests, "injected_errors": self.injected_errors, "replayed": self.replayed}
+
+    def handle(self, method: str, target: str, raw: bytes, headers: Dict[str, str]) -> Reply:
+        """Apply latency and errors, then answer from the fixtures, the upstream or a route."""
+        with self._lock:
+            self.requests += 1
+            delay = self.faults.latency + self._rng.uniform(-self.faults.jitter, self.faults.jitter)
+            failed = self._rng.random() < self.faults.error_rate
+            if failed:
+                self.injected_errors += 1
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            return Reply(self.faults.error_status, {"errorMessages": ["Injected failure"]})
+
+        if self.recorder is not None:
+            key = Recorder.request_key(self.name, method, target, raw)
+            if self.recorder.mode == "record":
+                return self._record(key, method, target, raw, headers)
+            entry = self.recorder.get(key)
+            if entry is not None:
+                with self._lock:
+                    self.replayed += 1
+                return _reply_from_entry(entry)
+
+        parts = urlsplit(target)
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(parts.path)
+            if match and route_method == method:
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    return Reply(400, {"error": "Request body is not JSON"})
+                return handler(match, dict(parse_qsl(parts.query)), body)
+        return Reply(404, {"error": f"No stand-in for {method} {parts.path}"})
+
+    def _record(self, key: str, method: str, target: str, raw: bytes, headers: Dict[str, str]) -> Reply:
+        import requests
+
+        forwarded = {k: v for k, v in headers.items() if k.lower() in ("authorization", "accept", "content-type")}
+        response = requests.request(method, self.upstream + target, data=raw or None, headers=forwarded, timeout=300)
+        entry = {
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", "application/json").split(";")[0],
+            "body": response.text,
+        }
+        self.recorder.put(key, entry)
+        return _reply_from_entry(entry)
+
+
+def _reply_from_entry(entry: Dict[str, Any]) -> Reply:
+    content_type = entry.get("content_type", "application/json")
+    if content_type in STREAM_TYPES:
+        return Reply(entry["status"], content_type=content_type, chunks=entry["body"].splitlines(keepends=True))
+    return Reply(entry["status"], entry["body"], content_type=content_type)
+
+
+def _handler_for(server: FakeServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            reply = server.handle(self.command, self.path, raw, dict(self.headers))
+            self.send_response(reply.status)
+            self.send_header("Content-Type", reply.content_type)
+            for name, value in reply.headers.items():
+                self.send_header(name, value)
+            if reply.chunks is None:
+                body = reply.body if isinstance(reply.body, str) else json.dumps(reply.body)
+                data = body.encode("utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            pause = 1 / server.faults.tokens_per_second if server.faults.tokens_per_second > 0 else 0
+            try:
+                for chunk in reply.chunks:
+                    data = chunk.encode("utf-8")
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+                    if pause:
+                        time.sleep(pause)
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stopped reading (cancelled stream); nothing left to send
+                self.close_connection = True
+
+        do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+# ------------------------------------------------------------------------------
+# Jira
+# ------------------------------------------------------------------------------
+
+def _stamp(when: datetime) -> str:
+    return when.strftime("%Y-%m-%dT%H:%M:%S.000%z")
+
+
+def _naive(stamp: str) -> datetime:
+    return datetime.fromisoformat(stamp.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def issues_from_session(path: str) -> List[Dict[str, Any]]:
+    """Search-result issues rebuilt from a session_state.json snapshot (and its journal).
+
+    Raw payloads are used when the snapshot kept them; otherwise the issue is
+    rebuilt from the stored ticket fields.
+    """
+    session = SessionManager(path)
+    issues = []
+    for n, stored in enumerate(session.get_tickets()):
+        ticket = session.resolve_raw(stored)
+        raw = ticket.get("raw_data")
+        if isinstance(raw, dict) and "fields" in raw:
+            issues.append(raw)
+            continue
+        created, updated = (
+            _stamp(datetime.fromtimestamp(v, timezone.utc)) if isinstance(v, (int, float)) else v
+            for v in (ticket["created"], ticket["updated"])
+        )
+        comments = ticket.get("comments_count", 0)
+        issues.append({
+            "id": str(200000 + n),
+            "key": ticket["key"],
+            "fields": {
+                "summary": ticket["summary"],
+                "description": ticket.get("description"),
+                "priority": {"name": ticket.get("priority") or "Unknown"},
+                "status": {"name": ticket.get("status") or "Open"},
+                "assignee": {"displayName": ticket["assignee"]} if ticket.get("assignee") else None,
+                "created": created,
+                "updated": updated,
+                "comment": {"comments": [], "maxResults": 0, "total": comments, "startAt": 0},
+                "labels": list(ticket.get("labels") or []),
+                "issuetype": {"name": ticket.get("issue_type") or "Task"},
+            },
+        })
+    return issues
+
+
+class FakeJira(FakeServer):
+    """Jira Cloud REST v3: search, myself, issue, changelog and comments.
+
+    Search understands the two JQL clauses the client adds itself,
+    ``key in (...)`` and ``updated >= "..."``; anything else matches every
+    issue, in fixture order.
+    """
+
+    name = "jira"
+    MAX_RESULTS = 100
+
+    def __init__(self, issues: Optional[List[Dict[str, Any]]] = None, **kwargs: Any) -> None:
+        self.issues = list(issues) if issues is not None else list(generate_issues(50, adf=True, changelog=True))
+        self._by_key = {issue["key"]: issue for issue in self.issues}
+        self.comments: Dict[str, List[str]] = {}
+        super().__init__(**kwargs)
+
+    def routes(self) -> List[Tuple[str, str, Callable[..., Reply]]]:
+        return [
+            ("GET", r"/rest/api/3/myself", self.myself),
+            ("GET", r"/rest/api/3/search(?:/jql)?", self.search),
+            ("GET", r"/rest/api/3/issue/(?P<key>[^/]+)", self.issue),
+            ("GET", r"/rest/api/3/issue/(?P<key>[^/]+)/changelog", self.changelog),
+            ("POST", r"/rest/api/3/issue/(?P<key>[^/]+)/comment", self.add_comment),
+        ]
+
+    def myself(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        return Reply(body={"accountId": "712020:stand-in", "displayName": "Stand-in User",
+                           "emailAddress": "stand-in@example.com", "active": True})
+
+    def _matching(self, jql: str) -> List[Dict[str, Any]]:
+        issues = self.issues
+        keys = re.search(r"\bkey\s+in\s*\(([^)]*)\)", jql, re.IGNORECASE)
+        if keys:
+            wanted = {k.strip().strip("\"'") for k in keys.group(1).split(",")}
+            issues = [issue for issue in issues if issue["key"] in wanted]
+        since = re.search(r'\bupdated\s*>=\s*"([^"]+)"', jql, re.IGNORECASE)
+        if since:
+            cutoff = datetime.strptime(since.group(1), "%Y-%m-%d %H:%M")
+            issues = [issue for issue in issues if _naive(issue["fields"]["updated"]) >= cutoff]
+        return issues
+
+    def search(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        issues = self._matching(query.get("jql", ""))
+        start = int(query.get("startAt", 0))
+        size = min(int(query.get("maxResults", 50)), self.MAX_RESULTS)
+        fields = query.get("fields", "")
+        expand = query.get("expand", "")
+        page = []
+        for issue in issues[start:start + size]:
+            if fields == "key":
+                page.append({"id": issue.get("id"), "key": issue["key"]})
+            elif "changelog" in issue and "changelog" not in expand:
+                page.append({k: v for k, v in issue.items() if k != "changelog"})
+            else:
+                page.append(issue)
+        return Reply(body={"startAt": start, "maxResults": size, "total": len(issues), "issues": page})
+
+    def issue(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        issue = self._by_key.get(match.group("key"))
+        if issue is None:
+            return Reply(404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]})
+        return Reply(body=issue)
+
+    def changelog(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        issue = self._by_key.get(match.group("key"))
+        if issue is None:
+            return Reply(404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]})
+        histories = (issue.get("changelog") or {}).get("histories", [])
+        start = int(query.get("startAt", 0))
+        size = min(int(query.get("maxResults", 100)), self.MAX_RESULTS)
+        values = histories[start:start + size]
+        return Reply(body={"startAt": start, "maxResults": size, "total": len(histories),
+                           "isLast": start + len(values) >= len(histories), "values": values})
+
+    def add_comment(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        key = match.group("key")
+        issue = self._by_key.get(key)
+        if issue is None:
+            return Reply(404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]})
+        with self._lock:
+            self.comments.setdefault(key, []).append(body.get("body"))
+            fields = issue["fields"]
+            comment = fields.setdefault("comment", {"comments": [], "total": 0})
+            comment["total"] = comment.get("total", 0) + 1
+            fields["updated"] = _stamp(datetime.now(timezone.utc))
+            count = len(self.comments[key])
+        return Reply(201, {"id": f"{issue.get('id', key)}{count:03d}", "body": body.get("body"),
+                           "created": fields["updated"]})
+
+
+# ------------------------------------------------------------------------------
+# LLMs
+# ------------------------------------------------------------------------------
+
+def scripted_reply(prompt: str, json_mode: bool) -> str:
+    """A plausible, deterministic answer in whichever shape the prompt asks for."""
+    keys = list(dict.fromkeys(_TICKET_KEY.findall(prompt)))
+    top = keys[0] if keys else "TICKET-1"
+    if json_mode or '"top_key"' in prompt:
+        return json.dumps({
+            "top_key": top,
+            "reasoning": f"{top} is the most urgent item in the queue.",
+            "next_steps": [f"Read the latest updates on {top}", "Reply to the reporter"],
+            "can_help_with": ["Draft a status update", "Summarise the history"],
+            "notable_keys": keys[1:4],
+            "summary": f"Start with {top}; it is the most pressing ticket right now.",
+        })
+    if "URGENCY:" in prompt:
+        urgency = zlib.crc32(top.encode()) % 5 + 1
+        return f"URGENCY: {urgency}\nREASON: {top} needs a decision this week.\nNEXT STEP: Ask the owner of {top} for an update."
+    if "KEY | priority" in prompt:
+        return "\n".join(f"{key} | High | Open | stalled and customer facing" for key in keys[:5])
+    return (f"Start with {top} - it has the highest urgency and has been waiting longest. "
+            f"Next, check the latest comments on {top}, confirm the owner, and post a short status update. "
+            + (f"Also keep an eye on {', '.join(keys[1:4])}. " if len(keys) > 1 else "")
+            + "I can draft the update or break the work into steps if that helps.")
+
+
+class _FakeLLM(FakeServer):
+    def __init__(self, responder: Responder = scripted_reply, model: str = "stand-in", **kwargs: Any) -> None:
+        self.responder = responder
+        self.model = model
+        self.prompts: List[str] = []
+        super().__init__(**kwargs)
+
+    def _answer(self, prompt: str, json_mode: bool) -> Tuple[str, List[str]]:
+        with self._lock:
+            self.prompts.append(prompt)
+        text = self.responder(prompt, json_mode)
+        return text, _TOKEN.findall(text)
+
+
+class FakeOllama(_FakeLLM):
+    """Ollama's /api/generate and /api/chat, streamed as NDJSON when asked."""
+
+    name = "ollama"
+
+    def routes(self) -> List[Tuple[str, str, Callable[..., Reply]]]:
+        return [
+            ("GET", r"/api/tags", self.tags),
+            ("POST", r"/api/generate", self.generate),
+            ("POST", r"/api/chat", self.chat),
+        ]
+
+    def tags(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        return Reply(body={"models": [{"name": self.model, "model": self.model}]})
+
+    def generate(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        return self._reply(body, body.get("prompt", ""), lambda token: {"response": token})
+
+    def chat(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        messages = body.get("messages") or [{}]
+        prompt = messages[-1].get("content", "")
+        return self._reply(body, prompt, lambda token: {"message": {"role": "assistant", "content": token}})
+
+    def _reply(self, body: Dict[str, Any], prompt: str, payload: Callable[[str], Dict[str, Any]]) -> Reply:
+        text, tokens = self._answer(prompt, body.get("format") is not None)
+        base = {"model": body.get("model", self.model), "created_at": datetime.now(timezone.utc).isoformat()}
+        done = {**base, **payload(""), "done": True, "done_reason": "stop", "eval_count": len(tokens)}
+        if not body.get("stream", True):
+            return Reply(body={**done, **payload(text)})
+        chunks = [json.dumps({**base, **payload(token), "done": False}) + "\n" for token in tokens]
+        chunks.append(json.dumps(done) + "\n")
+        return Reply(content_type="application/x-ndjson", chunks=chunks)
+
+
+class FakeOpenAI(_FakeLLM):
+    """OpenAI-compatible /v1/chat/completions, streamed as server-sent events when asked."""
+
+    name = "openai"
+
+    def routes(self) -> List[Tuple[str, str, Callable[..., Reply]]]:
+        return [
+            ("GET", r"/v1/models", self.models),
+            ("POST", r"/v1/chat/completions", self.completions),
+        ]
+
+    def models(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        return Reply(body={"object": "list", "data": [{"id": self.model, "object": "model", "owned_by": "stand-in"}]})
+
+    def completions(self, match: Any, query: Dict[str, str], body: Any) -> Reply:
+        messages = body.get("messages") or [{}]
+        text, tokens = self._answer(messages[-1].get("content", ""), body.get("response_format") is not None)
+        base = {"id": f"chatcmpl-{len(self.prompts)}", "created": int(time.time()), "model": body.get("model", self.model)}
+        if not body.get("stream"):
+            return Reply(body={
+                **base, "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(_TOKEN.findall(messages[-1].get("content", ""))),
+                          "completion_tokens": len(tokens), "total_tokens": 0},
+            })
+
+        def event(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+            chunk = {**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        chunks = [event({"role": "assistant", "content": ""})]
+        chunks.extend(event({"content": token}) for token in tokens)
+        chunks.append(event({}, "stop"))
+        chunks.append("data: [DONE]\n\n")
+        return Reply(content_type="text/event-stream", chunks=chunks)
+
+
+class StandIns:
+    """The three stand-ins started together, plus the environment that points the assistant at them."""
+
+    def __init__(
+        self,
+        issues: Optional[List[Dict[str, Any]]] = None,
+        faults: Optional[Faults] = None,
+        recorder: Optional[Recorder] = None,
+        upstreams: Optional[Dict[str, str]] = None,
+    ) -> None:
+        upstreams = upstreams or {}
+        # In record mode only the services with an upstream are recorded
+        def recorder_for(name: str) -> Optional[Recorder]:
+            if recorder is not None and recorder.mode == "record" and name not in upstreams:
+                return None
+            return recorder
+
+        self.jira = FakeJira(issues, faults=faults, recorder=recorder_for("jira"), upstream=upstreams.get("jira"))
+        self.ollama = FakeOllama(faults=faults, recorder=recorder_for("ollama"), upstream=upstreams.get("ollama"))
+        self.openai = FakeOpenAI(faults=faults, recorder=recorder_for("openai"), upstream=upstreams.get("openai"))
+        self.servers = [self.jira, self.ollama, self.openai]
+
+    def env(self) -> Dict[str, str]:
+        return {
+            "JIRA_BASE_URL": self.jira.url,
+            "OLLAMA_HOST": self.ollama.url,
+            "OPENAI_BASE_URL": f"{self.openai.url}/v1",
+        }
+
+    def start(self) -> "StandIns":
+        for server in self.servers:
+            server.start()
+        return self
+
+    def stop(self) -> None:
+        for server in self.servers:
+            server.stop()
+
+    def __enter__(self) -> "StandIns":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=200, help="synthetic issues to serve (default 200)")
+    parser.add_argument("--from-session", metavar="PATH", help="serve the tickets in a session_state.json instead")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra/less latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests that fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="LLM streaming speed (0 = unthrottled)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--record", metavar="PATH", help="forward to the upstreams and save replies here")
+    parser.add_argument("--replay", metavar="PATH", help="serve replies saved by --record")
+    parser.add_argument("--jira-upstream")
+    parser.add_argument("--ollama-upstream")
+    parser.add_argument("--openai-upstream")
+    args = parser.parse_args()
+
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    recorder = None
+    if args.record:
+        recorder = Recorder(args.record, "record")
+    elif args.replay:
+        recorder = Recorder(args.replay, "replay")
+    upstreams = {name: url for name, url in (("jira", args.jira_upstream), ("ollama", args.ollama_upstream),
+                                             ("openai", args.openai_upstream)) if url}
+    if args.record and not upstreams:
+        parser.error("--record needs at least one --*-upstream")
+
+    issues = (issues_from_session(args.from_session) if args.from_session
+              else list(generate_issues(args.issues, adf=True, changelog=True)))
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.error_status, args.tokens_per_second, args.seed)
+    with StandIns(issues, faults, recorder, upstreams) as stand_ins:
+        print(f"Serving {len(issues)} issues. Point the assistant here with:")
+        for name, value in stand_ins.env().items():
+            print(f"  export {name}={value}")
+        print("Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
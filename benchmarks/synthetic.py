@@ -0,0 +1,150 @@
+"""Deterministic synthetic Jira issues shaped like /rest/api/3/search results."""
+
+import random
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+PRIORITIES = ["P1 - Critical", "P2", "P3", "High", "Medium", "Low"]
+STATUSES = ["Open", "In Progress", "Blocked", "In Review", "Waiting for Customer"]
+ISSUE_TYPES = ["Bug", "Task", "Story", "Incident"]
+LABELS = ["VOC_Feedback", "security", "automation", "customer", "infra", "tech-debt"]
+PEOPLE = ["Alex Kim", "Dana Lee", "Sam Ortiz", "Priya Natarajan", "Jordan Blake"]
+WORDS = (
+    "deploy failure login sso token certificate rotate outage customer report "
+    "netskope agent update config pipeline blocked security scan timeout retry "
+    "database migration alert dashboard latency upgrade vendor patch policy"
+).split()
+
+BASE_TIME = datetime(2025, 1, 1, 9, 0, 0)
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def _user(rng: random.Random) -> Dict[str, Any]:
+    name = rng.choice(PEOPLE)
+    account = f"712020:{zlib.crc32(name.encode()) % 10**8:08d}"
+    return {
+        "accountId": account,
+        "displayName": name,
+        "active": True,
+        "timeZone": "America/Los_Angeles",
+        "avatarUrls": {size: f"https://avatar.example/{account}/{size}.png" for size in ("16x16", "24x24", "32x32", "48x48")},
+    }
+
+
+def _stamp(when: datetime) -> str:
+    return when.strftime("%Y-%m-%dT%H:%M:%S.000-0700")
+
+
+def _text(text: str, marks: Optional[List[str]] = None) -> Dict[str, Any]:
+    node: Dict[str, Any] = {"type": "text", "text": text}
+    if marks:
+        node["marks"] = [{"type": m} for m in marks]
+    return node
+
+
+def adf_document(rng: random.Random) -> Dict[str, Any]:
+    """An Atlassian Document Format description: paragraphs, links, lists and code."""
+    content: List[Dict[str, Any]] = []
+    for _ in range(rng.randint(1, 4)):
+        paragraph = [_text(_sentence(rng, rng.randint(6, 20)))]
+        if rng.random() < 0.4:
+            paragraph.append({"type": "inlineCard", "attrs": {"url": f"https://drive.example/file/{rng.randint(1, 10**6)}"}})
+        if rng.random() < 0.3:
+            paragraph.append(_text(rng.choice(WORDS), ["strong"]))
+        content.append({"type": "paragraph", "content": paragraph})
+    if rng.random() < 0.5:
+        content.append({"type": "bulletList", "content": [
+            {"type": "listItem", "content": [{"type": "paragraph", "content": [_text(_sentence(rng, 5))]}]}
+            for _ in range(rng.randint(2, 5))
+        ]})
+    if rng.random() < 0.2:
+        content.append({"type": "codeBlock", "attrs": {"language": "bash"},
+                        "content": [_text(f"sudo {rng.choice(WORDS)} --{rng.choice(WORDS)}")]})
+    return {"type": "doc", "version": 1, "content": content}
+
+
+def make_changelog(rng: random.Random, n: int, created: datetime, updated: datetime) -> Dict[str, Any]:
+    """A changelog block as returned with ``expand=changelog``."""
+    histories = []
+    span = max(1, int((updated - created).total_seconds() // 60))
+    for h in range(rng.randint(0, 8)):
+        when = created + timedelta(minutes=rng.randint(0, span))
+        field = rng.choice(["status", "assignee", "priority", "labels", "description"])
+        before, after = rng.sample(STATUSES if field == "status" else PRIORITIES, 2)
+        histories.append({
+            "id": str(n * 100 + h),
+            "author": _user(rng),
+            "created": _stamp(when),
+            "items": [{
+                "field": field, "fieldtype": "jira", "fieldId": field,
+                "from": None, "fromString": before, "to": None, "toString": after,
+            }],
+        })
+    histories.sort(key=lambda h: h["created"], reverse=True)
+    return {"startAt": 0, "maxResults": len(histories), "total": len(histories), "histories": histories}
+
+
+def make_issue(
+    rng: random.Random, n: int, project: str = "CPE", adf: bool = False, changelog: bool = False
+) -> Dict[str, Any]:
+    """One search result. ``adf`` and ``changelog`` add the richer shapes seen in
+    session_state.json; they draw from a separate RNG so the base fields stay
+    identical either way."""
+    created = BASE_TIME - timedelta(days=rng.randint(0, 700), minutes=rng.randint(0, 1440))
+    updated = created + timedelta(days=rng.randint(0, 60), minutes=rng.randint(0, 1440))
+    comments = [
+        {"id": str(n * 10 + c), "author": _user(rng), "body": _sentence(rng, 25), "created": _stamp(updated)}
+        for c in range(rng.randint(0, 2))
+    ]
+    summary = _sentence(rng, rng.randint(4, 10))
+    description: Any = _sentence(rng, rng.randint(10, 60))
+    extra = random.Random(n)
+    if adf:
+        description = adf_document(extra)
+    issue = {
+        "id": str(100000 + n),
+        "key": f"{project}-{n}",
+        "self": f"https://jira.example/rest/api/3/issue/{100000 + n}",
+        "fields": {
+            "summary": summary,
+            "description": description,
+            "priority": {"name": rng.choice(PRIORITIES), "id": str(rng.randint(1, 6))},
+            "status": {"name": rng.choice(STATUSES), "id": str(rng.randint(1, 9))},
+            "assignee": _user(rng),
+            "created": _stamp(created),
+            "updated": _stamp(updated),
+            "comment": {"comments": comments, "maxResults": len(comments), "total": len(comments), "startAt": 0},
+            "labels": rng.sample(LABELS, rng.randint(0, 2)),
+            "issuetype": {"name": rng.choice(ISSUE_TYPES), "id": str(rng.randint(1, 4))},
+        },
+    }
+    if changelog:
+        issue["changelog"] = make_changelog(extra, n, created, updated)
+    return issue
+
+
+def generate_issues(count: int, seed: int = 0, adf: bool = False, changelog: bool = False) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` issues; the same seed always yields the same issues."""
+    rng = random.Random(seed)
+    for n in range(1, count + 1):
+        yield make_issue(rng, n, adf=adf, changelog=changelog)
+
+
+def search_pages(
+    count: int, page_size: int = 100, seed: int = 0, adf: bool = False, changelog: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """Yield search-response pages covering ``count`` issues."""
+    page: List[Dict[str, Any]] = []
+    start = 0
+    for issue in generate_issues(count, seed, adf=adf, changelog=changelog):
+        page.append(issue)
+        if len(page) == page_size:
+            yield {"startAt": start, "maxResults": page_size, "total": count, "issues": page}
+            start += page_size
+            page = []
+    if page:
+        yield {"startAt": start, "maxResults": page_size, "total": count, "issues": page}
@@ -1,61 +1,273 @@
+import atexit
 import os
 import json
-from typing import Any, Dict, Optional
-import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
 
-class SemanticCache:
-    """Lightweight semantic-ish cache layered on top of file cache.
+from metrics import CACHE_BYTES, CACHE_EVICTIONS, CACHE_REQUESTS
 
-    This provides a stable key derivation by hashing arbitrary inputs so callers
-    can store/retrieve by content rather than manual keys. It falls back to the
-    same on-disk JSON file used by Cache, but exposes helper methods.
-    """
-    def __init__(self, filename: Optional[str] = None) -> None:
-        self._file = Cache(filename)
-
-    def _hash_key(self, *parts: Any) -> str:
-        h = hashlib.sha256()
-        for p in parts:
-            h.update(repr(p).encode("utf-8"))
-            h.update(b"\x00")
-        return h.hexdigest()
+class Cache:
+    """Simple JSON file-based cache."""
 
-    def get_by_content(self, *parts: Any) -> Optional[Dict[str, Any]]:
-        return self._file.get(self._hash_key(*parts))
+    # Set to False by wrappers (e.g. SemanticCache) that record their own hits and misses
+    record_metrics = True
 
-    def set_by_content(self, value: Dict[str, Any], *parts: Any) -> None:
-        self._file.set(self._hash_key(*parts), value)
+    def __init__(self, filename: Optional[str] = None, namespace: str = "default") -> None:
+        self.filename = filename or os.getenv("CACHE_FILE", ".cache.json")
+        self.namespace = namespace
+        # Parsed on first access rather than at construction
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
 
-    def clear(self) -> None:
-        self._file.clear()
+    @property
+    def _cache(self) -> Dict[str, Dict[str, Any]]:
+        if self._data is None:
+            self._data = self._load()
+        return self._data
 
-class Cache:
-    """Simple JSON file-based cache."""
-    def __init__(self, filename: Optional[str] = None) -> None:
-        self.filename = filename or os.getenv("CACHE_FILE", ".cache.json")
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._load()
+    @_cache.setter
+    def _cache(self, value: Dict[str, Dict[str, Any]]) -> None:
+        self._data = value
 
-    def _load(self) -> None:
+    def _load(self) -> Dict[str, Dict[str, Any]]:
         if os.path.exists(self.filename):
             try:
                 with open(self.filename, "r", encoding="utf-8") as f:
-                    self._cache = json.load(f)
+                    return json.load(f)
             except Exception:
-                self._cache = {}
+                pass
+        return {}
 
     def _save(self) -> None:
         with open(self.filename, "w", encoding="utf-8") as f:
             json.dump(self._cache, f)
 
     def get(self, key: str) -> Optional[Dict[str, Any]]:
-        return self._cache.get(key)
+        value = self._cache.get(key)
+        if self.record_metrics:
+            CACHE_REQUESTS.inc(namespace=self.namespace, result="miss" if value is None else "hit")
+        return value
 
     def set(self, key: str, value: Dict[str, Any]) -> None:
-        self._cache[key] = value
-        self._save()
+        with self._lock:
+            self._cache[key] = value
+            self._save()
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        return iter(list(self._cache.items()))
 
     def clear(self) -> None:
         """Remove all items from the cache."""
-        self._cache = {}
-        self._save()
+        with self._lock:
+            self._cache = {}
+            self._save()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_expiry ON entries (expires_at) WHERE expires_at IS NOT NULL;
+CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), total_bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO usage VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_ins AFTER INSERT ON entries
+    BEGIN UPDATE usage SET total_bytes = total_bytes + NEW.size WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS entries_del AFTER DELETE ON entries
+    BEGIN UPDATE usage SET total_bytes = total_bytes - OLD.size WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS entries_upd AFTER UPDATE OF size ON entries
+    BEGIN UPDATE usage SET total_bytes = total_bytes + NEW.size - OLD.size WHERE id = 0; END;
+"""
+
+# One connection per (database, thread), shared by every namespace using that file
+_connections = threading.local()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conns: Dict[str, Tuple[sqlite3.Connection, int]] = getattr(_connections, "by_path", None) or {}
+    _connections.by_path = conns
+    try:
+        inode = os.stat(path).st_ino
+    except FileNotFoundError:
+        inode = None
+    cached = conns.get(path)
+    if cached and cached[1] == inode:
+        return cached[0]
+    if cached:
+        # The file was deleted or replaced underneath us; drop the stale handle first
+        cached[0].close()
+    if inode is None:
+        # A WAL left behind by a deleted database would be replayed into the new one
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    conns[path] = (conn, os.stat(path).st_ino)
+    return conn
+
+
+@atexit.register
+def _close_connections() -> None:
+    # Closing checkpoints the WAL back into the database and removes it
+    for conn, _ in (getattr(_connections, "by_path", None) or {}).values():
+        conn.close()
+
+
+class SQLiteCache:
+    """SQLite-backed cache with per-namespace TTLs and LRU size eviction.
+
+    Drop-in for ``Cache``: ``get``/``set``/``clear`` operate on one namespace
+    of a shared database file. WAL mode lets several terminal sessions read
+    and write concurrently; writes are single-row upserts, so their cost
+    does not grow with the cache. Total size is tracked by triggers, so the
+    ``max_bytes`` check never scans the table.
+    """
+
+    # Reads refresh the LRU timestamp at most this often, so hot reads stay read-only
+    TOUCH_INTERVAL = 60.0
+    record_metrics = True
+
+    def __init__(
+        self,
+        namespace: str = "default",
+        filename: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.namespace = namespace
+        # CACHE_FILE is the legacy JSON cache's file and must never be opened as a database
+        self.filename = filename or os.getenv("CACHE_DB") or ".cache.db"
+        self.ttl = ttl
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.evictions = 0
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return _connect(self.filename)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT value, expires_at, accessed_at FROM entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key),
+        ).fetchone()
+        if row is None:
+            self._record("miss")
+            return None
+        value, expires_at, accessed_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            self.delete(key)
+            CACHE_EVICTIONS.inc(namespace=self.namespace, reason="expired")
+            self._record("miss")
+            return None
+        if now - accessed_at > self.TOUCH_INTERVAL:
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+        self._record("hit")
+        return json.loads(value)
+
+    def _record(self, result: str) -> None:
+        if self.record_metrics:
+            CACHE_REQUESTS.inc(namespace=self.namespace, result=result)
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        encoded = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        ttl = ttl if ttl is not None else self.ttl
+        conn = self._conn
+        conn.execute(
+            "INSERT INTO entries (namespace, key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+            "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+            (self.namespace, key, encoded, len(encoded) + len(key), now + ttl if ttl else None, now),
+        )
+        if self.max_bytes:
+            total = self.total_bytes()
+            if total > self.max_bytes:
+                self._evict(now)
+                total = self.total_bytes()
+            CACHE_BYTES.set(total, file=self.filename)
+
+    def delete(self, key: str) -> None:
+        self._conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def clear(self) -> None:
+        """Remove all items in this namespace."""
+        self._conn.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over live (key, value) pairs in this namespace."""
+        rows = self._conn.execute(
+            "SELECT key, value FROM entries WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (self.namespace, time.time()),
+        ).fetchall()
+        for key, value in rows:
+            yield key, json.loads(value)
+
+    def total_bytes(self) -> int:
+        return self._conn.execute("SELECT total_bytes FROM usage WHERE id = 0").fetchone()[0]
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least-recently-used ones until under the cap.
+
+        Frees down to 90% of ``max_bytes`` so back-to-back inserts don't each evict.
+        """
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            expired = conn.execute(
+                "SELECT namespace, COUNT(*) FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ? "
+                "GROUP BY namespace", (now,),
+            ).fetchall()
+            conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            excess = self.total_bytes() - int(self.max_bytes * 0.9)
+            victims = []
+            if excess > 0:
+                for namespace, key, size in conn.execute(
+                    "SELECT namespace, key, size FROM entries ORDER BY accessed_at"
+                ):
+                    victims.append((namespace, key))
+                    excess -= size
+                    if excess <= 0:
+                        break
+            conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        # Counted against the namespace that lost the entries, not the one whose write evicted them
+        for namespace, count in expired:
+            CACHE_EVICTIONS.inc(count, namespace=namespace, reason="expired")
+        lru: Dict[str, int] = {}
+        for namespace, _ in victims:
+            lru[namespace] = lru.get(namespace, 0) + 1
+        for namespace, count in lru.items():
+            CACHE_EVICTIONS.inc(count, namespace=namespace, reason="lru")
+        self.evictions += sum(count for _, count in expired) + len(victims)
+
+
+def open_cache(
+    namespace: str = "default", ttl: Optional[float] = None, filename: Optional[str] = None
+) -> Union[Cache, SQLiteCache]:
+    """Return the configured cache backend for ``namespace``.
+
+    ``CACHE_BACKEND=sqlite`` (default) shares one database across namespaces;
+    ``CACHE_BACKEND=json`` keeps the legacy JSON files, where TTLs are left
+    to callers.
+    """
+    if os.getenv("CACHE_BACKEND", "sqlite") == "json":
+        return Cache(filename or ("analysis_cache.json" if namespace == "analysis" else None), namespace=namespace)
+    return SQLiteCache(namespace, filename=filename, ttl=ttl)
@@ -0,0 +1,227 @@
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# (connect, read) timeouts in seconds per logical endpoint. LLM generations
+# can legitimately take minutes; Jira calls should fail fast.
+DEFAULT_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    "default": (5.0, 30.0),
+    "jira": (5.0, 30.0),
+    "llm": (5.0, 300.0),
+}
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# A throttled request was never processed, so even a POST is safe to resend
+THROTTLE_STATUSES = {429}
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    throttled: int = 0
+    total_seconds: float = 0.0
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def avg_ms(self) -> float:
+        return (self.total_seconds / self.requests * 1000) if self.requests else 0.0
+
+
+class HttpClient:
+    """Shared HTTP transport: pooled keep-alive sessions, timeouts and retries.
+
+    Idempotent calls are retried on connection errors and 429/5xx responses
+    with jittered exponential backoff; ``Retry-After`` is honoured when the
+    server sends one. Per-host counters are available from ``stats()``, and
+    ``limit_host`` caps how many requests one host sees at once.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+        session: Optional[requests.Session] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.pool_size = pool_size or int(os.getenv("HTTP_POOL_SIZE", "10"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HTTP_MAX_RETRIES", "3"))
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.timeouts.update(_timeouts_from_env())
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self._sleep = sleep
+        self._session = session or self._build_session()
+        self._stats: Dict[str, HostStats] = {}
+        self._limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        # Retries are handled in request() so Retry-After and stats stay in one place
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def limit_host(self, url: str, max_connections: int) -> None:
+        """Allow at most ``max_connections`` requests in flight to ``url``'s host.
+
+        A slot is acquired once per attempt, so a request sleeping off a
+        backoff does not hold one. Only idempotent requests come back for
+        retries on 5xx responses; a non-idempotent POST is retried only
+        after a 429 throttle, never after a 5xx.
+        """
+        host = urlsplit(url).netloc or url
+        with self._lock:
+            self._limits[host] = threading.BoundedSemaphore(max(1, max_connections))
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str = "default",
+        timeout: Optional[Tuple[float, float]] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request, retrying when it is safe to do so.
+
+        ``idempotent`` overrides the method-based default, e.g. for LLM
+        generation POSTs that can be resent without side effects.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        timeout = timeout or self.timeouts.get(endpoint, self.timeouts["default"])
+        stats = self._host_stats(url)
+        with self._lock:
+            limit = self._limits.get(urlsplit(url).netloc or url)
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                if limit is None:
+                    response = self._session.request(method, url, timeout=timeout, **kwargs)
+                else:
+                    with limit:
+                        response = self._session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(stats, start, error=True)
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                self._record(stats, start, status=response.status_code)
+                status = response.status_code
+                retryable = status in RETRY_STATUSES if idempotent else status in THROTTLE_STATUSES
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                delay = _retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                else:
+                    delay = min(delay, self.backoff_cap)
+                response.close()
+
+            attempt += 1
+            with self._lock:
+                stats.retries += 1
+            self._sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps concurrent page fetches from retrying in lockstep
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _host_stats(self, url: str) -> HostStats:
+        host = urlsplit(url).netloc or url
+        with self._lock:
+            return self._stats.setdefault(host, HostStats())
+
+    def _record(self, stats: HostStats, start: float, status: Optional[int] = None, error: bool = False) -> None:
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            stats.requests += 1
+            stats.total_seconds += elapsed
+            if error:
+                stats.errors += 1
+            if status is not None:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+                if status in THROTTLE_STATUSES:
+                    stats.throttled += 1
+
+    def stats(self) -> Dict[str, HostStats]:
+        """Return a snapshot of per-host request counters."""
+        with self._lock:
+            return {
+                host: HostStats(s.requests, s.retries, s.errors, s.throttled, s.total_seconds, dict(s.statuses))
+                for host, s in self._stats.items()
+            }
+
+    def close(self) -> None:
+        self._session.close()
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    value = response.headers.get("Retry-After") if response.headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _timeouts_from_env() -> Dict[str, Tuple[float, float]]:
+    connect = float(os.getenv("HTTP_CONNECT_TIMEOUT", DEFAULT_TIMEOUTS["default"][0]))
+    return {
+        "default": (connect, float(os.getenv("HTTP_READ_TIMEOUT", DEFAULT_TIMEOUTS["default"][1]))),
+        "jira": (connect, float(os.getenv("JIRA_READ_TIMEOUT", DEFAULT_TIMEOUTS["jira"][1]))),
+        "llm": (connect, float(os.getenv("LLM_READ_TIMEOUT", DEFAULT_TIMEOUTS["llm"][1]))),
+    }
+
+
+_shared: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide transport so every caller shares one pool."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = HttpClient()
+    return _shared
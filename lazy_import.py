@@ -0,0 +1,41 @@
+import importlib
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    Used for heavy dependencies (provider SDKs, ``requests``) that most
+    startups never touch. Attribute reads and writes go to the real module,
+    so ``openai.api_key = ...`` and ``patch("assistant.openai.chat...")``
+    behave exactly as with a plain import.
+    """
+
+    def __init__(self, name: str) -> None:
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_module", None)
+
+    def _lazy_load(self) -> ModuleType:
+        module: Optional[ModuleType] = object.__getattribute__(self, "_lazy_module")
+        if module is None:
+            module = importlib.import_module(object.__getattribute__(self, "_lazy_name"))
+            object.__setattr__(self, "_lazy_module", module)
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return object.__getattribute__(self, "_lazy_module") is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._lazy_load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._lazy_load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._lazy_load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module {object.__getattribute__(self, '_lazy_name')!r} ({state})>"
@@ -0,0 +1,293 @@
+"""In-process metrics: counters, gauges and histograms with labels.
+
+Everything registers on one shared ``MetricsRegistry`` (``get_registry()``).
+``health`` shows a summary; ``to_prometheus()`` renders the Prometheus text
+exposition format, and ``write_prometheus()`` writes it atomically, e.g. for
+node_exporter's textfile collector.
+"""
+
+import bisect
+import math
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; LLM calls run from well under a second (cached, local) to minutes
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+RATE_BUCKETS = (1, 5, 10, 20, 40, 80, 160, 320)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> List[str]:
+        return []
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(key)} {_number(v)}" for key, v in sorted(self.values().items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative buckets for export, plus the most recent observations for quantiles."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, window: int = 1024) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.window = window
+        self._series: Dict[LabelValues, Tuple[List[int], List[float], Deque[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0, 0.0], deque(maxlen=self.window))
+            counts, totals, recent = series
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            totals[0] += value
+            totals[1] += 1
+            recent.append(value)
+
+    def series(self) -> List[LabelValues]:
+        with self._lock:
+            return sorted(self._series)
+
+    def count(self, key: LabelValues) -> int:
+        with self._lock:
+            series = self._series.get(key)
+            return int(series[1][1]) if series else 0
+
+    def sum(self, key: LabelValues) -> float:
+        with self._lock:
+            series = self._series.get(key)
+            return series[1][0] if series else 0.0
+
+    def quantile(self, q: float, key: LabelValues) -> Optional[float]:
+        """Quantile over the last ``window`` observations (nearest rank)."""
+        with self._lock:
+            series = self._series.get(key)
+            recent = sorted(series[2]) if series else []
+        if not recent:
+            return None
+        return recent[min(len(recent) - 1, max(0, math.ceil(q * len(recent)) - 1))]
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            snapshot = {key: (list(c), list(t)) for key, (c, t, _) in self._series.items()}
+        for key, (counts, (total, count)) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{self._labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {int(count)}")
+        return lines
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls: type, name: str, help: str, labelnames: Sequence[str], **kwargs: object) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a different {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_prometheus(self, path: str) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+
+_shared: Optional[MetricsRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    """Return the process-wide registry."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = MetricsRegistry()
+    return _shared
+
+
+# Metrics shared across modules, defined once so names and labels stay consistent
+_LLM_LABELS = ("provider", "model", "call")
+LLM_REQUESTS = get_registry().counter("llm_requests_total", "LLM calls by outcome (ok or error)",
+                                      _LLM_LABELS + ("outcome",))
+LLM_LATENCY = get_registry().histogram("llm_request_seconds", "LLM call latency", _LLM_LABELS)
+LLM_FIRST_TOKEN = get_registry().histogram("llm_first_token_seconds", "Time to the first streamed token", _LLM_LABELS)
+LLM_PROMPT_TOKENS = get_registry().counter("llm_prompt_tokens_total", "Prompt tokens sent (estimated)", _LLM_LABELS)
+LLM_COMPLETION_TOKENS = get_registry().counter("llm_completion_tokens_total", "Completion tokens received (estimated)",
+                                               _LLM_LABELS)
+LLM_TOKEN_RATE = get_registry().histogram("llm_completion_tokens_per_second", "Completion tokens per second of call time",
+                                          _LLM_LABELS, buckets=RATE_BUCKETS)
+LLM_IN_FLIGHT = get_registry().gauge("llm_in_flight_requests", "LLM calls currently running", ("provider",))
+
+CACHE_REQUESTS = get_registry().counter("cache_requests_total", "Cache lookups by result (hit or miss)",
+                                        ("namespace", "result"))
+CACHE_NEAR_HITS = get_registry().counter("cache_near_hits_total", "Semantic cache hits on a near-duplicate prompt",
+                                         ("namespace",))
+CACHE_EVICTIONS = get_registry().counter("cache_evictions_total", "Cache entries dropped, by reason (expired or lru)",
+                                         ("namespace", "reason"))
+CACHE_BYTES = get_registry().gauge("cache_bytes", "Bytes stored in the cache database", ("file",))
+
+SINGLE_FLIGHT = get_registry().counter("singleflight_calls_total",
+                                       "Calls that ran (leader) or reused an identical call in flight (shared)",
+                                       ("group", "result"))
+
+
+def llm_summary() -> List[Dict[str, Any]]:
+    """One row per (provider, model, call): calls, errors, latency quantiles and token totals."""
+    keys = set(LLM_LATENCY.series()) | {key[:3] for key in LLM_REQUESTS.values()}
+    rows = []
+    for key in sorted(keys):
+        labels = dict(zip(_LLM_LABELS, key))
+        rows.append({
+            **labels,
+            "calls": LLM_LATENCY.count(key),
+            "errors": int(LLM_REQUESTS.value(outcome="error", **labels)),
+            "p50_s": LLM_LATENCY.quantile(0.5, key),
+            "p95_s": LLM_LATENCY.quantile(0.95, key),
+            "first_token_p50_s": LLM_FIRST_TOKEN.quantile(0.5, key),
+            "prompt_tokens": int(LLM_PROMPT_TOKENS.value(**labels)),
+            "completion_tokens": int(LLM_COMPLETION_TOKENS.value(**labels)),
+            "tokens_per_s_p50": LLM_TOKEN_RATE.quantile(0.5, key),
+        })
+    return rows
+
+
+def cache_summary() -> List[Dict[str, Any]]:
+    """One row per cache namespace: hits, misses, hit ratio, near hits and evictions."""
+    requests, evictions = CACHE_REQUESTS.values(), CACHE_EVICTIONS.values()
+    rows = []
+    for namespace in sorted({ns for ns, _ in requests} | {ns for ns, _ in evictions}):
+        hits = int(requests.get((namespace, "hit"), 0))
+        misses = int(requests.get((namespace, "miss"), 0))
+        rows.append({
+            "namespace": namespace,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else None,
+            "near_hits": int(CACHE_NEAR_HITS.value(namespace=namespace)),
+            "expired": int(evictions.get((namespace, "expired"), 0)),
+            "evicted": int(evictions.get((namespace, "lru"), 0)),
+        })
+    return rows
+
+
+def single_flight_summary() -> List[Dict[str, Any]]:
+    """One row per single-flight group: calls made and how many shared another caller's result."""
+    values = SINGLE_FLIGHT.values()
+    rows = []
+    for group in sorted({group for group, _ in values}):
+        shared = int(values.get((group, "shared"), 0))
+        calls = shared + int(values.get((group, "leader"), 0))
+        rows.append({"group": group, "calls": calls, "shared": shared, "shared_ratio": shared / calls if calls else None})
+    return rows
@@ -0,0 +1,63 @@
+import queue
+import threading
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+class SuggestionPrefetcher:
+    """Warm the suggestion cache in the background while the user reads.
+
+    Jobs are ``(ticket, context)`` pairs run in order by at most
+    ``max_workers`` daemon threads, so a quit never waits on an in-flight
+    LLM call. Nothing ever blocks on the prefetcher: callers just hit the
+    cache when a job has finished, and make the call themselves otherwise.
+    """
+
+    def __init__(self, fetch: Callable[[Any, str], Any], max_workers: int = 2) -> None:
+        self.fetch = fetch
+        self.max_workers = max(1, max_workers)
+        self._jobs: "queue.Queue[Tuple[Any, str]]" = queue.Queue()
+        self._cancelled = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+
+    def start(self, jobs: Iterable[Tuple[Any, str]]) -> None:
+        for job in jobs:
+            self._jobs.put(job)
+        for _ in range(min(self.max_workers, self._jobs.qsize())):
+            thread = threading.Thread(target=self._worker, name="suggestion-prefetch", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self) -> None:
+        while not self._cancelled.is_set():
+            try:
+                ticket, context = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                self.fetch(ticket, context)
+            except Exception:
+                with self._lock:
+                    self.failed += 1
+            else:
+                with self._lock:
+                    self.completed += 1
+
+    def cancel(self) -> None:
+        """Drop queued jobs; calls already in flight finish and are cached."""
+        self._cancelled.set()
+        while True:
+            try:
+                self._jobs.get_nowait()
+            except queue.Empty:
+                break
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for thread in self._threads:
+            thread.join(timeout)
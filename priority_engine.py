@@ -0,0 +1,76 @@
+import heapq
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Lower is more urgent; anything unrecognized ranks after "low"
+PRIORITY_RANK: Dict[str, int] = {
+    'p0': -1, 'p1': 0, 'p1 - critical': 0, 'critical': 0, 'highest': 0,
+    'high': 1, 'p2': 2, 'medium': 3, 'p3': 4, 'low': 5,
+}
+UNKNOWN_PRIORITY = 6
+
+# A summary or description mentioning any of these moves a ticket up two ranks
+URGENT_KEYWORDS = ('security', 'failure', 'critical', 'blocked', 'urgent', 'voc_feedback')
+KEYWORD_BOOST = -2
+
+_DAY = 86400
+
+
+def priority_rank(priority: Optional[str]) -> int:
+    return PRIORITY_RANK.get((priority or "").strip().lower(), UNKNOWN_PRIORITY)
+
+
+class PriorityEngine:
+    """Urgency ranking for the offline fallback analysis.
+
+    A ticket's score is ``(priority rank + keyword boost, -stale days,
+    -age days)``; lower sorts first and ties keep their input order. Each
+    ticket is scored once per call against a single reference time, all
+    keywords are matched with one compiled pattern, and asking for the top
+    ``limit`` tickets selects them with a heap instead of sorting the queue.
+    """
+
+    def __init__(self, keywords: Sequence[str] = URGENT_KEYWORDS) -> None:
+        self.keywords = tuple(keywords)
+        # Longest first so overlapping keywords can't shadow each other
+        alternatives = sorted((re.escape(k.lower()) for k in self.keywords), key=len, reverse=True)
+        self._keyword_re = re.compile("|".join(alternatives)) if alternatives else None
+        # Priorities are interned enum-like strings, so this stays tiny
+        self._ranks: Dict[Optional[str], int] = {}
+
+    def priority_rank(self, priority: Optional[str]) -> int:
+        rank = self._ranks.get(priority)
+        if rank is None:
+            rank = self._ranks[priority] = priority_rank(priority)
+        return rank
+
+    def has_keyword(self, ticket: Any) -> bool:
+        if self._keyword_re is None:
+            return False
+        search = self._keyword_re.search
+        return bool(search((ticket.summary or "").lower()) or search((ticket.description or "").lower()))
+
+    def scorer(self, now: Optional[int] = None) -> Callable[[Any], Tuple[int, int, int]]:
+        """Sort key for tickets, with ages measured from ``now`` (epoch seconds)."""
+        now = int(time.time()) if now is None else now
+        ranks = self._ranks
+        search = self._keyword_re.search if self._keyword_re is not None else None
+
+        def score(ticket: Any) -> Tuple[int, int, int]:
+            rank = ranks.get(ticket.priority)
+            if rank is None:
+                rank = self.priority_rank(ticket.priority)
+            if search and (search((ticket.summary or "").lower()) or search((ticket.description or "").lower())):
+                rank += KEYWORD_BOOST
+            return (rank, -((now - ticket.updated_ts) // _DAY), -((now - ticket.created_ts) // _DAY))
+
+        return score
+
+    def rank(self, tickets: Iterable[Any], limit: Optional[int] = None, now: Optional[int] = None) -> List[Any]:
+        """Most urgent first; with ``limit``, only that many (same order as a full sort)."""
+        score = self.scorer(now)
+        if limit is None:
+            return sorted(tickets, key=score)
+        # nsmallest breaks ties by input position, so it matches sorted()[:limit]
+        return heapq.nsmallest(limit, tickets, key=score)
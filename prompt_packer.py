@@ -0,0 +1,184 @@
+import importlib.util
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from lazy_import import LazyModule
+
+# Optional: without tiktoken, token counts fall back to a character-based
+# estimate. Only imported when the first count is made.
+tiktoken = LazyModule("tiktoken") if importlib.util.find_spec("tiktoken") else None
+
+# Context windows by model name prefix; LLM_CONTEXT_TOKENS overrides
+MODEL_CONTEXT = {
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4.1": 1000000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "llama3": 8192,
+    "mistral": 8192,
+    "qwen": 32768,
+}
+DEFAULT_CONTEXT = 8192
+
+TICKET_COLUMNS = (
+    "key", "priority", "status", "age_days", "stale_days", "comments_count",
+    "issue_type", "labels", "summary", "description",
+)
+
+_SPACE = re.compile(r"\s+")
+
+
+def context_window(model: str) -> int:
+    override = os.getenv("LLM_CONTEXT_TOKENS")
+    if override:
+        return int(override)
+    name = (model or "").lower()
+    for prefix in sorted(MODEL_CONTEXT, key=len, reverse=True):
+        if name.startswith(prefix):
+            return MODEL_CONTEXT[prefix]
+    return DEFAULT_CONTEXT
+
+
+class TokenEstimator:
+    """Count tokens with tiktoken when installed, otherwise estimate from length.
+
+    The fallback assumes ~3.5 characters per token, which errs on the high
+    side for the short cells of a ticket table.
+    """
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+        self._encoding: Any = None
+        self._resolved = False
+
+    def _get_encoding(self) -> Any:
+        if not self._resolved:
+            self._resolved = True
+            if tiktoken is not None:
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text))
+        return math.ceil(len(text) / 3.5)
+
+
+def _cell(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        value = ",".join(str(v) for v in value)
+    return _SPACE.sub(" ", str(value if value is not None else "")).replace("|", "/").strip()
+
+
+def encode_rows(rows: Sequence[Dict[str, Any]], columns: Sequence[str]) -> List[str]:
+    """One pipe-separated line per row; the header is ``table_header(columns)``."""
+    return ["|".join(_cell(row.get(col)) for col in columns) for row in rows]
+
+
+def table_header(columns: Sequence[str]) -> str:
+    return "|".join(columns)
+
+
+@dataclass
+class PackedPrompt:
+    chunks: List[str]
+    chunk_keys: List[List[str]]
+    tokens: int
+    budget: int
+    omitted: List[str] = field(default_factory=list)
+
+    def report(self) -> str:
+        included = sum(len(keys) for keys in self.chunk_keys)
+        text = f"Prompt: {self.tokens:,} tokens for {included} tickets"
+        if len(self.chunks) > 1:
+            text += f" in {len(self.chunks)} chunks"
+        if self.omitted:
+            text += f"; {len(self.omitted)} lower-priority tickets omitted"
+        return text
+
+
+class PromptPacker:
+    """Pack a ticket table into the model's context window.
+
+    Rows are expected most important first. They are encoded as a compact
+    pipe table and split into chunks of at most ``budget`` tokens; once
+    ``max_chunks`` are full, the remaining (lowest-signal) rows are omitted.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        context_tokens: Optional[int] = None,
+        reserve_tokens: int = 1500,
+        max_chunks: Optional[int] = None,
+        description_chars: int = 160,
+    ) -> None:
+        self.estimator = TokenEstimator(model)
+        self.context_tokens = context_tokens or context_window(model)
+        self.reserve_tokens = reserve_tokens
+        self.max_chunks = max_chunks or int(os.getenv("PROMPT_MAX_CHUNKS", "4"))
+        self.description_chars = description_chars
+
+    def count(self, text: str) -> int:
+        return self.estimator.count(text)
+
+    def pack(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        overhead: str = "",
+        columns: Sequence[str] = TICKET_COLUMNS,
+        max_chunks: Optional[int] = None,
+    ) -> PackedPrompt:
+        """Split ``rows`` into tables that each fit beside ``overhead`` (the prompt text)."""
+        max_chunks = max_chunks or self.max_chunks
+        header = table_header(columns)
+        budget = self.context_tokens - self.reserve_tokens - self.count(overhead) - self.count(header) - 1
+        budget = max(budget, 64)
+
+        trimmed = [
+            {**row, "description": (row.get("description") or "")[:self.description_chars]}
+            if "description" in columns else row
+            for row in rows
+        ]
+        chunks: List[List[str]] = [[]]
+        chunk_keys: List[List[str]] = [[]]
+        used = [0]
+        omitted: List[str] = []
+        for row, line in zip(trimmed, encode_rows(trimmed, columns)):
+            cost = self.count(line) + 1
+            while cost > budget:
+                # A single oversized row: keep as much of it as the budget allows
+                line = line[:len(line) * budget // cost - 1]
+                cost = self.count(line) + 1
+            full = used[-1] + cost > budget and bool(chunks[-1])
+            if omitted or (full and len(chunks) >= max_chunks):
+                # Rows arrive most important first, so everything from here on is dropped
+                omitted.append(str(row.get("key")))
+                continue
+            if full:
+                chunks.append([])
+                chunk_keys.append([])
+                used.append(0)
+            chunks[-1].append(line)
+            chunk_keys[-1].append(str(row.get("key")))
+            used[-1] += cost
+
+        tables = [header + "\n" + "\n".join(lines) for lines in chunks]
+        return PackedPrompt(
+            chunks=tables,
+            chunk_keys=chunk_keys,
+            tokens=sum(self.count(t) for t in tables),
+            budget=budget,
+            omitted=omitted,
+        )
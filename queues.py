@@ -0,0 +1,278 @@
+"""Named queue profiles across one or more Jira sites, triaged together.
+
+A profile pairs a Jira site with a JQL query ("my queue", "team backlog",
+"on-call"). ``MultiQueue`` runs every profile concurrently and merges the
+results into one priority view:
+
+1. each queue's JQL is resolved to issue keys (cheap ``fields=key`` searches);
+2. the union of keys is fetched once per site, so an issue on several boards
+   is downloaded and parsed once;
+3. every distinct issue is assessed once (the per-ticket assessment cache is
+   shared with the interactive analysis);
+4. each queue gets its own analysis, in parallel, and the union is ranked
+   with the same urgency ordering the map-reduce analysis uses.
+
+Profiles live in ``QUEUES_FILE`` (default ``queues.json``)::
+
+    {
+      "sites": {
+        "platform": {"url": "https://platform.atlassian.net",
+                     "email_env": "PLATFORM_JIRA_EMAIL", "token_env": "PLATFORM_JIRA_TOKEN",
+                     "max_connections": 4}
+      },
+      "queues": {
+        "mine": "assignee = currentUser() AND statusCategory != Done",
+        "oncall": {"site": "platform", "jql": "labels = oncall AND statusCategory != Done"}
+      }
+    }
+
+Credentials are never written in the file, only the names of the environment
+variables holding them. The ``default`` site is the one configured with
+``JIRA_BASE_URL``/``JIRA_EMAIL``/``JIRA_API_TOKEN``.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from assistant import JiraClient, LLMClient, Ticket, WorkloadAnalysis
+from tracing import bind, span, traced
+
+DEFAULT_FILE = "queues.json"
+DEFAULT_SITE = "default"
+# Keys per "key in (...)" search; keeps the query string well under URL limits
+KEY_CHUNK = 100
+
+SITE_FIELDS = {"url", "email_env", "token_env", "max_connections"}
+QUEUE_FIELDS = {"site", "jql"}
+
+
+def queues_file() -> str:
+    return os.getenv("QUEUES_FILE") or DEFAULT_FILE
+
+
+@dataclass(frozen=True)
+class Site:
+    name: str
+    url: Optional[str] = None
+    email_env: str = "JIRA_EMAIL"
+    token_env: str = "JIRA_API_TOKEN"
+    max_connections: int = 4
+
+    def client(self) -> JiraClient:
+        """A client for this site; raises ValueError when its credentials are not set."""
+        email, token = os.getenv(self.email_env), os.getenv(self.token_env)
+        if not (self.url or self.name == DEFAULT_SITE) or not email or not token:
+            # Never fall back to the default site's credentials for another host
+            raise ValueError(f"Site '{self.name}' needs a url and {self.email_env}/{self.token_env} set")
+        return JiraClient(self.url, email, token)
+
+
+@dataclass(frozen=True)
+class QueueProfile:
+    name: str
+    site: Site
+    jql: str
+
+
+def default_profiles() -> List[QueueProfile]:
+    return [QueueProfile("mine", Site(DEFAULT_SITE), JiraClient.DEFAULT_JQL)]
+
+
+def load_profiles(path: Optional[str] = None) -> List[QueueProfile]:
+    """Read queue profiles from ``path``; without the file, your own queue on the default site.
+
+    Raises ValueError for malformed files, unknown sites or unknown fields.
+    """
+    path = path or queues_file()
+    if not os.path.exists(path):
+        return default_profiles()
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Could not read {path}: {e}")
+    if not isinstance(config, dict) or not isinstance(config.get("queues"), dict) or not config["queues"]:
+        raise ValueError(f"{path} needs a non-empty \"queues\" object")
+
+    sites: Dict[str, Site] = {DEFAULT_SITE: Site(DEFAULT_SITE, max_connections=int(os.getenv("JIRA_MAX_WORKERS", "4")))}
+    for name, spec in (config.get("sites") or {}).items():
+        if not isinstance(spec, dict) or not spec.get("url"):
+            raise ValueError(f"Site '{name}' needs a \"url\"")
+        unknown = set(spec) - SITE_FIELDS
+        if unknown:
+            raise ValueError(f"Site '{name}' has unknown fields {sorted(unknown)} (credentials go in environment variables)")
+        sites[name] = Site(
+            name, spec["url"].rstrip('/'), spec.get("email_env", "JIRA_EMAIL"),
+            spec.get("token_env", "JIRA_API_TOKEN"), int(spec.get("max_connections", 4)),
+        )
+
+    profiles = []
+    for name, spec in config["queues"].items():
+        if isinstance(spec, str):
+            spec = {"jql": spec}
+        if not isinstance(spec, dict) or not spec.get("jql"):
+            raise ValueError(f"Queue '{name}' needs a \"jql\"")
+        unknown = set(spec) - QUEUE_FIELDS
+        if unknown:
+            raise ValueError(f"Queue '{name}' has unknown fields {sorted(unknown)}")
+        site = spec.get("site", DEFAULT_SITE)
+        if site not in sites:
+            raise ValueError(f"Queue '{name}' uses unknown site '{site}'")
+        profiles.append(QueueProfile(name, sites[site], spec["jql"]))
+    return profiles
+
+
+@dataclass
+class QueueItem:
+    """One distinct issue in the merged view, with every queue it appears in."""
+    site: str
+    ticket: Ticket
+    queues: List[str]
+    assessment: Optional[Dict] = None
+
+
+@dataclass
+class MultiQueueResult:
+    items: List[QueueItem]
+    analyses: Dict[str, WorkloadAnalysis]
+    counts: Dict[str, int]
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+class MultiQueue:
+    """Fetch, assess and rank several queue profiles as one workload."""
+
+    def __init__(self, profiles: Sequence[QueueProfile], llm: Optional[LLMClient] = None,
+                 workers: Optional[int] = None) -> None:
+        if not profiles:
+            raise ValueError("No queue profiles to run")
+        self.profiles = list(profiles)
+        self.llm = llm or LLMClient()
+        self.workers = max(1, workers or int(os.getenv("QUEUE_WORKERS", "8")))
+        self._clients: Dict[str, JiraClient] = {}
+        self._lock = threading.Lock()
+
+    def client(self, site: Site) -> JiraClient:
+        """One client per site; its host gets ``site.max_connections`` concurrent requests at most."""
+        with self._lock:
+            client = self._clients.get(site.name)
+            if client is None:
+                client = site.client()
+                client.http.limit_host(client.base_url, site.max_connections)
+                self._clients[site.name] = client
+            return client
+
+    @traced("queues.run")
+    def run(self, analyze: bool = True,
+            on_status: Optional[Callable[[str], None]] = None) -> MultiQueueResult:
+        """Run every profile; a failing queue is reported in ``errors`` and the rest still merge.
+
+        All sites are fetched and assessed at the same time on one shared
+        pool. A failure only fails the queues it touches: a key search fails
+        its own queue, a failed ``key in (...)`` chunk fails the queues with
+        keys in that chunk, and a failed assessment fails that site's queues.
+        With ``analyze`` False only the merged ranking is built (no per-queue
+        narrative calls).
+        """
+        status = on_status or (lambda message: None)
+        errors: Dict[str, str] = {}
+        sites = {p.site.name: p.site for p in self.profiles}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            status(f"Resolving {len(self.profiles)} queues")
+            keys = self._run_all(
+                pool, {p.name: (lambda p=p: self.client(p.site).get_ticket_keys(p.jql)) for p in self.profiles},
+                errors)
+
+            wanted: Dict[str, List[str]] = {}
+            for profile in self.profiles:
+                wanted.setdefault(profile.site.name, []).extend(keys.get(profile.name, []))
+            wanted = {site: list(dict.fromkeys(site_keys)) for site, site_keys in wanted.items() if site_keys}
+            chunks = {
+                (site, n): site_keys[n:n + KEY_CHUNK]
+                for site, site_keys in wanted.items()
+                for n in range(0, len(site_keys), KEY_CHUNK)
+            }
+            status(f"Fetching {sum(len(k) for k in wanted.values())} distinct tickets from {len(wanted)} sites")
+            fetch_errors: Dict[Tuple[str, int], str] = {}
+            fetched = self._run_all(
+                pool, {ident: (lambda site=ident[0], chunk=chunk: self.client(sites[site]).get_tickets_by_key(chunk))
+                       for ident, chunk in chunks.items()},
+                fetch_errors)
+            tickets: Dict[Tuple[str, str], Ticket] = {}
+            for (site, _), site_tickets in fetched.items():
+                tickets.update(((site, t.key), t) for t in site_tickets)
+            for (site, n), error in fetch_errors.items():
+                lost = set(chunks[(site, n)])
+                for profile in self.profiles:
+                    if profile.site.name == site and lost.intersection(keys.get(profile.name, [])):
+                        errors.setdefault(profile.name, error)
+
+            # Keys are only unique within a site, so assessments are mapped per site, sites in parallel
+            status(f"Assessing {len(tickets)} tickets")
+            by_site: Dict[str, List[Ticket]] = {}
+            for (site, _), ticket in tickets.items():
+                by_site.setdefault(site, []).append(ticket)
+            assess_errors: Dict[str, str] = {}
+            site_assessments = self._run_all(
+                pool, {site: (lambda site=site, batch=batch: self._assess_site(site, batch))
+                       for site, batch in by_site.items()},
+                assess_errors)
+            assessments: Dict[Tuple[str, str], Optional[Dict]] = {}
+            for site, mapped in site_assessments.items():
+                assessments.update(((site, key), assessment) for key, assessment in mapped.items())
+            for site, error in assess_errors.items():
+                for profile in self.profiles:
+                    if profile.site.name == site:
+                        errors.setdefault(profile.name, error)
+
+            queue_tickets: Dict[str, List[Ticket]] = {}
+            for profile in self.profiles:
+                if profile.name in errors:
+                    continue
+                queue_tickets[profile.name] = [
+                    tickets[(profile.site.name, key)] for key in keys[profile.name]
+                    if (profile.site.name, key) in tickets
+                ]
+
+            analyses: Dict[str, WorkloadAnalysis] = {}
+            if analyze:
+                status(f"Analyzing {len(queue_tickets)} queues")
+                # Assessments are cached by now, so each queue only adds its own reduce call
+                analyses = self._run_all(
+                    pool, {name: (lambda q=q: self.llm._compute_analysis(q)) for name, q in queue_tickets.items() if q},
+                    errors)
+
+        items: Dict[Tuple[str, str], QueueItem] = {}
+        for profile in self.profiles:
+            for ticket in queue_tickets.get(profile.name, []):
+                ident = (profile.site.name, ticket.key)
+                item = items.get(ident)
+                if item is None:
+                    items[ident] = QueueItem(profile.site.name, ticket, [profile.name], assessments.get(ident))
+                elif profile.name not in item.queues:
+                    item.queues.append(profile.name)
+        ranked = sorted(items.values(), key=lambda item: self.llm._rank_key(item.ticket, item.assessment))
+        counts = {name: len(q) for name, q in queue_tickets.items()}
+        return MultiQueueResult(ranked, analyses, counts, errors)
+
+    def _assess_site(self, site: str, tickets: List[Ticket]) -> Dict[str, Optional[Dict]]:
+        with span("queues.assess", site=site, tickets=len(tickets)):
+            return self.llm._map_assessments(tickets)
+
+    @staticmethod
+    def _run_all(pool: ThreadPoolExecutor, jobs: Dict, errors: Dict) -> Dict:
+        """Run ``jobs`` (name -> callable) on ``pool`` and wait for them; failures land in ``errors``."""
+        results: Dict = {}
+        futures = {pool.submit(bind(job)): name for name, job in jobs.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+        return results
@@ -1,37 +1,241 @@
-import os
+import hashlib
 import json
+import os
+import random
+import re
+import threading
+import zlib
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from cache import open_cache
+from metrics import CACHE_NEAR_HITS, CACHE_REQUESTS
+
+# Fields that drift without the ticket materially changing (a day ticking over)
+VOLATILE_FIELDS = ("age_days", "stale_days")
+# Fields that must match exactly for a near-duplicate to count
+ANCHOR_FIELDS = ("key", "priority", "status")
+
+_MERSENNE = (1 << 61) - 1
+_WORD = re.compile(r"[a-z0-9_]+")
+
+
+@dataclass
+class SemanticHit:
+    value: Dict[str, Any]
+    similarity: float
+    exact: bool
+    ignored_fields: List[str] = field(default_factory=list)
 
 
 class SemanticCache:
-    """Lightweight cache storing LLM analysis."""
-
-    def __init__(self, cache_file: str = "semantic_cache.json"):
-        self.cache_file = os.path.join(os.path.dirname(__file__), cache_file)
-        self._load()
-
-    def _load(self) -> None:
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, "r", encoding="utf-8") as f:
-                    self.cache: Dict[str, Dict[str, Any]] = json.load(f)
-            except json.JSONDecodeError:
-                self.cache = {}
-        else:
-            self.cache = {}
+    """Near-duplicate cache for LLM responses.
+
+    Prompt payloads are normalized (volatile fields dropped, text lowercased
+    and tokenized) and summarized with a MinHash signature; LSH banding finds
+    candidates without scanning every entry. A cached answer is returned when
+    the anchor fields (ticket keys, priority, status) match exactly and the
+    estimated Jaccard similarity of the rest reaches ``threshold``.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "semantic",
+        threshold: Optional[float] = None,
+        num_perm: int = 64,
+        bands: int = 16,
+        ignore_fields: Iterable[str] = VOLATILE_FIELDS,
+        anchor_fields: Iterable[str] = ANCHOR_FIELDS,
+        ttl: float = 24 * 3600,
+        filename: Optional[str] = None,
+    ) -> None:
+        self._store = open_cache(namespace, ttl=ttl, filename=filename)
+        # Candidate reads during a lookup are not lookups themselves; hits and misses are recorded here
+        self._store.record_metrics = False
+        self.namespace = namespace
+        self.threshold = threshold if threshold is not None else float(os.getenv("SEMANTIC_THRESHOLD", "0.9"))
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ignore_fields = set(ignore_fields)
+        self.anchor_fields = set(anchor_fields)
+        # Fixed seed: signatures must stay comparable across runs
+        rng = random.Random(1)
+        self._perms = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)]
+        self._index: Optional[Dict[Tuple[int, int], Set[str]]] = None
+        # key -> its band keys, so an entry that is gone from the store can be dropped from the index
+        self._bands: Dict[str, List[Tuple[int, int]]] = {}
+        # Entries expire or get evicted without telling us; past this size the index is rebuilt from live ones
+        self._rebuild_above = 0
+        self._lock = threading.Lock()
+        self.counters = {"lookups": 0, "exact_hits": 0, "near_hits": 0, "misses": 0, "false_hits": 0}
+
+    # Normalization
+    def _normalize(self, payload: Any) -> Tuple[Set[str], Set[str], List[str]]:
+        """Return (shingles, anchor tokens, ignored field names) for a payload."""
+        shingles: Set[str] = set()
+        anchors: Set[str] = set()
+        ignored: Set[str] = set()
+
+        stack: List[Tuple[str, Any]] = [("", payload)]
+        while stack:
+            path, node = stack.pop()
+            if isinstance(node, dict):
+                # One token per object so e.g. swapped priorities between tickets still differ
+                anchor = "|".join(
+                    f"{key}={str(node[key]).strip().lower()}" for key in sorted(self.anchor_fields) if key in node
+                )
+                if anchor:
+                    anchors.add(anchor)
+                for key, value in node.items():
+                    if key in self.ignore_fields:
+                        ignored.add(key)
+                        continue
+                    stack.append((key, value))
+            elif isinstance(node, (list, tuple)):
+                stack.extend((path, item) for item in node)
+            elif node is not None:
+                words = _WORD.findall(str(node).lower())
+                shingles.update(f"{path}:{w}" for w in words)
+                shingles.update(f"{path}:{a} {b}" for a, b in zip(words, words[1:]))
+        return shingles, anchors, sorted(ignored)
+
+    def _signature(self, shingles: Set[str]) -> List[int]:
+        if not shingles:
+            return [0] * self.num_perm
+        hashed = [zlib.crc32(s.encode("utf-8")) for s in shingles]
+        return [min((a * h + b) % _MERSENNE for h in hashed) for a, b in self._perms]
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, int]]:
+        return [
+            (band, hash(tuple(signature[band * self.rows:(band + 1) * self.rows])))
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def _digest(obj: Any) -> str:
+        return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode("utf-8")).hexdigest()
 
-    def _save(self) -> None:
-        with open(self.cache_file, "w", encoding="utf-8") as f:
-            json.dump(self.cache, f)
+    def _exact_key(self, shingles: Set[str], anchors: Set[str]) -> str:
+        return self._digest([sorted(shingles), sorted(anchors)])
 
-    def get(self, ticket_hash: str) -> Optional[Dict[str, Any]]:
-        return self.cache.get(ticket_hash)
+    def _ensure_index(self) -> Dict[Tuple[int, int], Set[str]]:
+        with self._lock:
+            if self._index is None:
+                self._index, self._bands = {}, {}
+                for key, entry in self._store.items():
+                    if isinstance(entry, dict) and "signature" in entry:
+                        self._add(key, self._band_keys(entry["signature"]))
+                self._rebuild_above = max(256, 2 * len(self._bands))
+            return self._index
 
-    def set(self, ticket_hash: str, analysis_text: str) -> None:
-        self.cache[ticket_hash] = {
-            "analysis_text": analysis_text,
-            "ticket_hash": ticket_hash,
+    def _add(self, key: str, bands: List[Tuple[int, int]]) -> None:
+        """Index ``key`` under ``bands``; the caller holds ``_lock``."""
+        self._bands[key] = bands
+        for band in bands:
+            self._index.setdefault(band, set()).add(key)
+
+    def _forget(self, key: str) -> None:
+        """Drop an expired or evicted key from the band index."""
+        with self._lock:
+            if self._index is None:
+                return
+            for band in self._bands.pop(key, ()):
+                keys = self._index.get(band)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._index[band]
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    # Public API
+    def lookup(self, payload: Any) -> Optional[SemanticHit]:
+        """Return a cached value for a materially identical payload, if any."""
+        shingles, anchors, ignored = self._normalize(payload)
+        key = self._exact_key(shingles, anchors)
+        self._count("lookups")
+
+        entry = self._store.get(key)
+        if entry and "value" in entry:
+            self._count("exact_hits")
+            CACHE_REQUESTS.inc(namespace=self.namespace, result="hit")
+            return SemanticHit(entry["value"], 1.0, True, ignored)
+
+        signature = self._signature(shingles)
+        anchor_digest = self._digest(sorted(anchors))
+        index = self._ensure_index()
+        candidates: Set[str] = set()
+        for band in self._band_keys(signature):
+            candidates.update(index.get(band, ()))
+
+        best: Optional[SemanticHit] = None
+        for candidate in candidates:
+            entry = self._store.get(candidate)
+            if not entry:
+                self._forget(candidate)
+                continue
+            if entry.get("anchor") != anchor_digest:
+                continue
+            similarity = sum(a == b for a, b in zip(signature, entry["signature"])) / self.num_perm
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = SemanticHit(entry["value"], similarity, False, sorted(set(ignored) | set(entry.get("ignored", []))))
+
+        if best:
+            self._count("near_hits")
+            CACHE_NEAR_HITS.inc(namespace=self.namespace)
+        else:
+            self._count("misses")
+        CACHE_REQUESTS.inc(namespace=self.namespace, result="hit" if best else "miss")
+        return best
+
+    def store(self, payload: Any, value: Dict[str, Any]) -> None:
+        shingles, anchors, ignored = self._normalize(payload)
+        key = self._exact_key(shingles, anchors)
+        signature = self._signature(shingles)
+        self._store.set(key, {
+            "value": value,
+            "signature": signature,
+            "anchor": self._digest(sorted(anchors)),
+            "ignored": ignored,
             "timestamp": datetime.now().isoformat(),
+        })
+        self._ensure_index()
+        with self._lock:
+            if self._index is None:
+                return  # cleared meanwhile; the next lookup rebuilds from the store
+            self._add(key, self._band_keys(signature))
+            if len(self._bands) > self._rebuild_above:
+                self._index = None
+
+    def report_false_hit(self) -> None:
+        """Record that a near-duplicate answer turned out not to fit (e.g. user forced a refresh)."""
+        self._count("false_hits")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            c = dict(self.counters)
+        hits = c["exact_hits"] + c["near_hits"]
+        return {
+            **c,
+            "hit_rate": hits / c["lookups"] if c["lookups"] else 0.0,
+            "false_hit_rate": c["false_hits"] / c["near_hits"] if c["near_hits"] else 0.0,
         }
-        self._save()
+
+    # Exact content addressing, for callers that key on an explicit hash
+    def get_by_content(self, *parts: Any) -> Optional[Dict[str, Any]]:
+        value = self._store.get(self._digest([repr(p) for p in parts]))
+        CACHE_REQUESTS.inc(namespace=self.namespace, result="miss" if value is None else "hit")
+        return value
+
+    def set_by_content(self, value: Dict[str, Any], *parts: Any) -> None:
+        self._store.set(self._digest([repr(p) for p in parts]), value)
+
+    def clear(self) -> None:
+        self._store.clear()
+        with self._lock:
+            self._index = None
+            self._bands = {}
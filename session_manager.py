@@ -1,18 +1,36 @@
+import hashlib
 import json
 import os
 from dataclasses import asdict, is_dataclass
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from tracing import traced
+
 
 class SessionManager:
     """Manage persisted session data: last scan, current focus, notes, history.
 
-    Stores a single JSON file next to the project root by default.
+    State lives in a compact JSON snapshot plus an append-only JSONL journal
+    next to it (``<path>.journal``). Small mutations append one journal line;
+    the snapshot is only rewritten on compaction, every ``compact_every``
+    entries or on ``save()``. ``load()`` replays journal entries newer than
+    the snapshot and truncates a torn final line left by a crash.
     """
 
-    def __init__(self, path: str = "session_state.json") -> None:
+    def __init__(
+        self,
+        path: str = "session_state.json",
+        compact_every: Optional[int] = None,
+        max_history: Optional[int] = None,
+    ) -> None:
         self.path = path
+        self.journal_path = f"{path}.journal"
+        self.history_path = f"{path}.history"
+        self.compact_every = compact_every or int(os.getenv("SESSION_COMPACT_EVERY", "200"))
+        self.max_history = max_history or int(os.getenv("SESSION_MAX_HISTORY", "500"))
+        # Archived history beyond this size is rotated to <path>.history.1
+        self.history_archive_bytes = 1024 * 1024
         self.data: Dict[str, Any] = {
             "last_scan": None,
             "current_focus": None,
@@ -20,6 +38,8 @@ class SessionManager:
             "ticket_progress": {},
             "conversation_history": [],
         }
+        self._seq = 0
+        self._journal_entries = 0
         self.load()
 
     # Basic file IO
@@ -33,11 +53,93 @@ class SessionManager:
             except Exception:
                 # Corrupt or unreadable; keep defaults
                 pass
+        self._seq = self.data.get("journal_seq", 0)
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        if not os.path.exists(self.journal_path):
+            return
+        good = 0
+        torn = False
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated line")
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash; everything after it is suspect
+                    torn = True
+                    break
+                good += len(line)
+                if entry.get("seq", 0) <= self._seq:
+                    continue  # already folded into the snapshot
+                self._apply(entry)
+                self._seq = entry["seq"]
+                self._journal_entries += 1
+        if torn:
+            # Cut the journal back to its last good entry so new ones aren't appended after the tear
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good)
 
+    @traced("session.save")
     def save(self) -> None:
+        """Write a full snapshot and truncate the journal (compaction)."""
+        self._rotate_history()
+        self.data["journal_seq"] = self._seq
         os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=2)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        # Entries up to journal_seq are now in the snapshot; replay skips any left behind
+        if os.path.exists(self.journal_path):
+            open(self.journal_path, "w").close()
+        self._journal_entries = 0
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        """Apply a mutation and append it to the journal."""
+        self._apply(entry)
+        self._seq += 1
+        entry["seq"] = self._seq
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._journal_entries += 1
+        if self._journal_entries >= self.compact_every:
+            self.save()
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        op = entry.get("op")
+        if op == "set":
+            self.data[entry["field"]] = entry["value"]
+        elif op == "note":
+            self.data.setdefault("ticket_progress", {})[entry["ticket"]] = entry["note"]
+        elif op == "message":
+            self.data.setdefault("conversation_history", []).append(entry["text"])
+        elif op == "merge":
+            self.data.setdefault("raw_store", {}).update(entry.get("raw", {}))
+            by_key = {t["key"]: t for t in self.data.get("tickets", [])}
+            for data in entry["upsert"]:
+                by_key[data["key"]] = data
+            self.data["tickets"] = [by_key[k] for k in entry["keys"] if k in by_key]
+            self._prune_raw_store()
+            self.data["last_scan"] = entry["last_scan"]
+
+    def _rotate_history(self) -> None:
+        """Keep the newest ``max_history`` messages; archive the rest as JSONL."""
+        history: List[str] = self.data.get("conversation_history", [])
+        overflow = len(history) - self.max_history
+        if overflow <= 0:
+            return
+        if os.path.exists(self.history_path) and os.path.getsize(self.history_path) > self.history_archive_bytes:
+            os.replace(self.history_path, f"{self.history_path}.1")
+        with open(self.history_path, "a", encoding="utf-8") as f:
+            for message in history[:overflow]:
+                f.write(json.dumps(message) + "\n")
+        self.data["conversation_history"] = history[overflow:]
 
     # Convenience helpers
     @property
@@ -50,57 +152,138 @@ class SessionManager:
         except ValueError:
             return None
 
+    @last_scan.setter
+    def last_scan(self, value: Optional[datetime]) -> None:
+        self._record({"op": "set", "field": "last_scan", "value": value.isoformat() if value else None})
+
+    @property
+    def current_focus(self) -> Optional[str]:
+        return self.data.get("current_focus")
+
+    @current_focus.setter
+    def current_focus(self, ticket_key: Optional[str]) -> None:
+        self.set_current_focus(ticket_key)
+
     def within_24_hours(self) -> bool:
         last = self.last_scan
         return bool(last and datetime.now() - last < timedelta(hours=24))
 
     def set_last_scan(self) -> None:
-        self.data["last_scan"] = datetime.now().isoformat()
-        self.save()
+        self.last_scan = datetime.now()
 
     def set_current_focus(self, ticket_key: Optional[str]) -> None:
-        self.data["current_focus"] = ticket_key
-        self.save()
+        self._record({"op": "set", "field": "current_focus", "value": ticket_key})
 
     def get_current_focus(self) -> Optional[str]:
         return self.data.get("current_focus")
 
     def add_ticket_note(self, ticket_key: str, note: str) -> None:
-        notes: Dict[str, str] = self.data.setdefault("ticket_progress", {})
-        notes[ticket_key] = note
-        self.save()
+        self._record({"op": "note", "ticket": ticket_key, "note": note})
 
     def add_message(self, message: str) -> None:
-        history: List[str] = self.data.setdefault("conversation_history", [])
-        history.append(message)
-        self.save()
+        self._record({"op": "message", "text": message})
 
-    def reset(self) -> None:
+    def reset(self, keep_snapshot: bool = False) -> None:
+        """Clear session state; ``keep_snapshot`` retains stored tickets for delta sync."""
         self.data.update(
             {
                 "last_scan": None,
                 "current_focus": None,
-                "tickets": [],
                 "ticket_progress": {},
                 "conversation_history": [],
             }
         )
+        if not keep_snapshot:
+            self.data["tickets"] = []
+            self.data["raw_store"] = {}
         self.save()
 
     # Ticket snapshot storage
     def _serialize_ticket(self, ticket: Any) -> Dict[str, Any]:
-        data = asdict(ticket) if is_dataclass(ticket) else dict(ticket)
-        if isinstance(data.get("created"), datetime):
-            data["created"] = data["created"].isoformat()
-        if isinstance(data.get("updated"), datetime):
-            data["updated"] = data["updated"].isoformat()
+        if hasattr(ticket, "to_dict"):
+            data = ticket.to_dict()
+        elif is_dataclass(ticket):
+            data = asdict(ticket)
+        else:
+            data = dict(ticket)
+        for field in ("created", "updated"):
+            if isinstance(data.get(field), datetime):
+                data[field] = int(data[field].timestamp())
+        raw = data.pop("raw_data", None)
+        if raw:
+            if "changelog" in raw:
+                # Snapshots from older versions carried the full history; it is loaded on demand now
+                raw = {k: v for k, v in raw.items() if k != "changelog"}
+            data["raw_ref"] = self._store_raw(raw)
         return data
 
+    def _store_raw(self, raw: Dict[str, Any]) -> str:
+        """Store a raw payload once under its content hash and return the reference"""
+        encoded = json.dumps(raw, sort_keys=True, separators=(",", ":"))
+        ref = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+        self.data.setdefault("raw_store", {}).setdefault(ref, raw)
+        return ref
+
+    def _prune_raw_store(self) -> None:
+        store = self.data.get("raw_store")
+        if not store:
+            return
+        live = {t.get("raw_ref") for t in self.data.get("tickets", [])}
+        self.data["raw_store"] = {ref: raw for ref, raw in store.items() if ref in live}
+
+    def resolve_raw(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the stored ticket dict with ``raw_data`` filled in from its reference"""
+        ref = ticket_data.get("raw_ref")
+        if not ref:
+            return ticket_data
+        return {**ticket_data, "raw_data": self.data.get("raw_store", {}).get(ref)}
+
     def update_session(self, tickets: List[Any]) -> None:
+        """Replace the whole ticket snapshot (full sync); written as one compaction."""
         self.data["tickets"] = [self._serialize_ticket(t) for t in tickets]
-        self.set_last_scan()
+        self._prune_raw_store()
+        self.data["last_scan"] = datetime.now().isoformat()
         self.save()
 
+    def merge_tickets(self, changed: List[Any], live_keys: List[str]) -> List[str]:
+        """Merge changed tickets into the snapshot by key.
+
+        ``live_keys`` is the full key list currently matching the query, in
+        query order; stored tickets not in it (e.g. moved to Done) are dropped.
+        Returns live keys we hold no data for, so the caller can fetch them.
+        """
+        known = {t["key"] for t in self.data.get("tickets", [])}
+        store = self.data.setdefault("raw_store", {})
+        before = set(store)
+        upsert = [self._serialize_ticket(t) for t in changed]
+        # Journal only the changed tickets and any raw payloads they introduced
+        self._record({
+            "op": "merge",
+            "upsert": upsert,
+            "keys": list(live_keys),
+            "raw": {ref: store[ref] for ref in set(store) - before},
+            "last_scan": datetime.now().isoformat(),
+        })
+        known.update(t["key"] for t in upsert)
+        return [k for k in live_keys if k not in known]
+
+    @property
+    def sync_cursor(self) -> Optional[datetime]:
+        """Latest ``updated`` time in the snapshot; changes after it need syncing.
+
+        Taken from Jira's own timestamps so it matches the timezone JQL uses.
+        """
+        stamps = [t.get("updated") for t in self.data.get("tickets", []) if t.get("updated")]
+        if not stamps:
+            return None
+        try:
+            return max(
+                datetime.fromtimestamp(s) if isinstance(s, (int, float)) else datetime.fromisoformat(s)
+                for s in stamps
+            )
+        except (TypeError, ValueError):
+            return None
+
     def needs_rescan(self) -> bool:
         last = self.last_scan
         if not last:
@@ -122,6 +305,6 @@ class SessionManager:
     def save_progress(self, current_focus: Optional[Any], notes: Optional[Any] = None) -> None:
         self.set_current_focus(getattr(current_focus, "key", current_focus))
         if notes:
-            self.data["notes"] = notes
+            self._record({"op": "set", "field": "notes", "value": notes})
         self.save()
 
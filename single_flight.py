@@ -0,0 +1,85 @@
+"""Single-flight coalescing: identical calls in flight at the same time run once.
+
+A prefetch thread and the foreground can ask for the same suggestion, and
+concurrent queue fetches can request the same Jira page. ``SingleFlight.do``
+runs the first caller's function and hands its result (or exception) to every
+caller that arrives with the same key before it finishes. It is not a cache:
+once the call returns, the next one with that key runs again.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from metrics import SINGLE_FLIGHT
+
+
+def request_key(*parts: Any) -> str:
+    """Stable identity for a request, e.g. ``request_key(provider, model, prompt, options)``."""
+    source = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Share one in-flight result between concurrent callers with the same key."""
+
+    def __init__(self, group: str) -> None:
+        self.group = group
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True when another caller's call was reused.
+
+        Callers that share a result get the same object, so treat it as read-only.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        SINGLE_FLIGHT.inc(group=self.group, result="leader" if leader else "shared")
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_flight(group: str) -> SingleFlight:
+    """Return the process-wide group, so every client coalesces with every other."""
+    flight = _groups.get(group)
+    if flight is None:
+        with _groups_lock:
+            flight = _groups.setdefault(group, SingleFlight(group))
+    return flight
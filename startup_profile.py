@@ -0,0 +1,118 @@
+"""Cold-start profiling: ``python assistant.py --import-profile``.
+
+Runs the startup path (import, construct ``WorkAssistant``, load state) in a
+fresh interpreter with ``-X importtime``, prints where the time went and
+appends the result to a JSONL file so regressions show up over time.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+PROFILE_FILE = os.getenv("STARTUP_PROFILE_FILE", ".startup_profile.jsonl")
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "150"))
+
+_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+import assistant
+t1 = time.perf_counter()
+wa = assistant.WorkAssistant()
+wa.load_state()
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "construct_ms": (t2 - t1) * 1000}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, str, int]]:
+    """Return (depth, module, cumulative microseconds) for each ``-X importtime`` line."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative)))
+    return entries
+
+
+def direct_imports(entries: List[Tuple[int, str, int]], module: str) -> List[Tuple[str, float]]:
+    """Modules imported directly by ``module``, slowest first, in milliseconds."""
+    # Children are logged before their parent, one level deeper
+    for index, (depth, name, _) in enumerate(entries):
+        if depth == 0 and name == module:
+            break
+    else:
+        return []
+    children = []
+    for depth, name, cumulative in reversed(entries[:index]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((name, cumulative / 1000))
+    return sorted(children, key=lambda c: -c[1])
+
+
+def measure(cwd: Optional[str] = None) -> Dict[str, Any]:
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _SNIPPET],
+        capture_output=True, text=True, cwd=cwd, check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(timings["import_ms"], 1),
+        "construct_ms": round(timings["construct_ms"], 1),
+        "slowest": [[name, round(ms, 1)] for name, ms in direct_imports(parse_importtime(proc.stderr), "assistant")[:8]],
+    }
+
+
+def _previous(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                last = line
+    return json.loads(last) if last else None
+
+
+def run_import_profile(console: Console, path: str = PROFILE_FILE) -> Dict[str, Any]:
+    previous = _previous(path)
+    report = measure()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(report) + "\n")
+
+    table = Table(title="🚀 Startup profile")
+    table.add_column("Stage")
+    table.add_column("ms", justify="right")
+    table.add_column("Δ vs last", justify="right")
+    for label, field in (("Import assistant", "import_ms"), ("Construct + load state", "construct_ms"),
+                         ("Process total (incl. interpreter)", "wall_ms")):
+        delta = f"{report[field] - previous[field]:+.1f}" if previous and field in previous else "—"
+        table.add_row(label, f"{report[field]:.1f}", delta)
+    console.print(table)
+
+    if report["slowest"]:
+        console.print("Slowest direct imports: " + ", ".join(f"{name} {ms:.1f} ms" for name, ms in report["slowest"]))
+    startup_ms = report["import_ms"] + report["construct_ms"]
+    if startup_ms <= BUDGET_MS:
+        console.print(f"✅ Ready for the first prompt in {startup_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)", style="green")
+    else:
+        console.print(f"⚠️ Startup took {startup_ms:.0f} ms, over the {BUDGET_MS:.0f} ms budget", style="yellow")
+    console.print(f"Recorded in {path}", style="dim")
+    return report
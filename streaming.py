@@ -0,0 +1,115 @@
+from typing import Callable, Optional
+
+from rich.console import Console
+from rich.live import Live
+from rich.panel import Panel
+from rich.text import Text
+
+TokenCallback = Callable[[str], None]
+
+
+class ThinkFilter:
+    """Drop ``<think>...</think>`` reasoning from a token stream as it arrives.
+
+    Tags may be split across chunks, so a possible partial tag at the end of
+    a chunk is held back until the next one decides it.
+    """
+
+    OPEN = "<think>"
+    CLOSE = "</think>"
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self.in_think = False
+
+    def feed(self, chunk: str) -> str:
+        """Return the visible part of ``chunk``."""
+        self._buffer += chunk
+        visible = []
+        while True:
+            tag = self.CLOSE if self.in_think else self.OPEN
+            idx = self._buffer.find(tag)
+            if idx < 0:
+                break
+            if not self.in_think:
+                visible.append(self._buffer[:idx])
+            self._buffer = self._buffer[idx + len(tag):]
+            self.in_think = not self.in_think
+
+        keep = self._partial_tag(self._buffer, self.CLOSE if self.in_think else self.OPEN)
+        if not self.in_think:
+            visible.append(self._buffer[:len(self._buffer) - keep])
+        self._buffer = self._buffer[len(self._buffer) - keep:]
+        return "".join(visible)
+
+    def flush(self) -> str:
+        """Return any held-back text once the stream has ended."""
+        rest = "" if self.in_think else self._buffer
+        self._buffer = ""
+        return rest
+
+    @staticmethod
+    def _partial_tag(text: str, tag: str) -> int:
+        for n in range(min(len(tag) - 1, len(text)), 0, -1):
+            if text.endswith(tag[:n]):
+                return n
+        return 0
+
+
+def strip_think(text: str) -> str:
+    """Remove reasoning blocks from a complete response."""
+    think = ThinkFilter()
+    return (think.feed(text) + think.flush()).strip()
+
+
+class LivePanel:
+    """A rich panel that fills in as tokens stream in.
+
+    Use ``on_token`` as the LLM client's callback, then ``finish`` with the
+    complete text so cached (non-streamed) answers render the same way.
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        title: str,
+        border_style: str = "green",
+        title_align: str = "center",
+        placeholder: str = "Thinking...",
+    ) -> None:
+        self.console = console
+        self.title = title
+        self.border_style = border_style
+        self.title_align = title_align
+        self.placeholder = placeholder
+        self.text = ""
+        self._think = ThinkFilter()
+        self._live: Optional[Live] = None
+
+    def __enter__(self) -> "LivePanel":
+        self._live = Live(self._render(), console=self.console, refresh_per_second=12)
+        self._live.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._live:
+            self._live.stop()
+
+    def on_token(self, token: str) -> None:
+        visible = self._think.feed(token)
+        if visible:
+            self.text += visible
+        # Let the auto-refresh thread redraw instead of re-rendering per token
+        self._live.update(self._render(), refresh=False)
+
+    def finish(self, text: str) -> None:
+        self.text = strip_think(text)
+        self._live.update(self._render(), refresh=True)
+
+    def _render(self) -> Panel:
+        body = self.text.lstrip()
+        if body:
+            content = Text(body)
+        else:
+            content = Text("💭 thinking..." if self._think.in_think else self.placeholder, style="dim")
+        return Panel(content, title=self.title, title_align=self.title_align, border_style=self.border_style)
@@ -0,0 +1,133 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from streaming import strip_think
+
+# What the single-prompt analysis asks the model for. Every property is
+# required and nothing else is allowed, which is what OpenAI's strict
+# json_schema mode expects.
+ANALYSIS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "top_key": {"type": "string"},
+        "reasoning": {"type": "string"},
+        "next_steps": {"type": "array", "items": {"type": "string"}},
+        "can_help_with": {"type": "array", "items": {"type": "string"}},
+        "notable_keys": {"type": "array", "items": {"type": "string"}},
+        "summary": {"type": "string"},
+    },
+    "required": ["top_key", "reasoning", "next_steps", "can_help_with", "notable_keys", "summary"],
+    "additionalProperties": False,
+}
+
+ANALYSIS_JSON_INSTRUCTIONS = """
+
+Reply with a single JSON object and nothing else, in exactly this shape:
+{"top_key": "<exact key of the ticket to do first>",
+ "reasoning": "<one or two sentences on why it is urgent>",
+ "next_steps": ["<concrete next step>", "..."],
+ "can_help_with": ["<specific way you can help>", "..."],
+ "notable_keys": ["<keys of 2-3 other notable tickets>"],
+ "summary": "<your conversational briefing for me, as plain text>"}"""
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_TYPES = {"object": dict, "array": list, "string": str, "integer": int, "number": (int, float), "boolean": bool}
+
+
+class StructuredOutputError(ValueError):
+    """A structured reply that couldn't be used; ``errors`` lists what was wrong."""
+
+    def __init__(self, errors: List[str], found_json: bool = True) -> None:
+        super().__init__("; ".join(errors))
+        self.errors = errors
+        # False when the reply had no JSON object at all (the model answered in prose)
+        self.found_json = found_json
+
+
+def _close_truncated(text: str) -> str:
+    """Close strings, arrays and objects left open by a cut-off reply."""
+    stack: List[str] = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    return text + ('"' if in_string else "") + "".join(reversed(stack))
+
+
+def extract_json(text: str) -> Any:
+    """Parse the JSON object in a model reply, repairing the usual slips.
+
+    Handles reasoning blocks, code fences, prose around the object, trailing
+    commas and a reply cut off mid-object. Raises ``StructuredOutputError``
+    (with ``found_json=False`` when there is no object at all).
+    """
+    text = _FENCE.sub("", strip_think(text or "")).strip()
+    start = text.find("{")
+    if start < 0:
+        raise StructuredOutputError(["reply contains no JSON object"], found_json=False)
+    end = text.rfind("}")
+    candidates = [text[start:end + 1]] if end > start else []
+    candidates.append(_close_truncated(text[start:]))
+    error = ""
+    for candidate in candidates:
+        for attempt in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+            try:
+                return json.loads(attempt)
+            except json.JSONDecodeError as e:
+                error = str(e)
+    raise StructuredOutputError([f"invalid JSON: {error}"])
+
+
+def validate(data: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """Check ``data`` against the subset of JSON Schema used here; returns the problems found."""
+    expected = schema.get("type")
+    if expected and (not isinstance(data, _TYPES[expected]) or (expected == "integer" and isinstance(data, bool))):
+        return [f"{path} should be {expected}, got {type(data).__name__}"]
+    errors: List[str] = []
+    if expected == "object":
+        for name in schema.get("required", []):
+            if name not in data:
+                errors.append(f"{path}.{name} is missing")
+        for name, value in data.items():
+            if name in schema.get("properties", {}):
+                errors.extend(validate(value, schema["properties"][name], f"{path}.{name}"))
+    elif expected == "array" and "items" in schema:
+        for index, item in enumerate(data):
+            errors.extend(validate(item, schema["items"], f"{path}[{index}]"))
+    return errors
+
+
+def parse_structured(text: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract and validate a reply; unknown properties are dropped, not rejected."""
+    data = extract_json(text)
+    errors = validate(data, schema)
+    if errors:
+        raise StructuredOutputError(errors)
+    allowed = schema.get("properties")
+    return {k: v for k, v in data.items() if k in allowed} if allowed else data
+
+
+def repair_prompt(reply: str, errors: List[str], valid_keys: Optional[List[str]] = None, limit: int = 4000) -> str:
+    """A short follow-up asking the model to fix its own reply instead of redoing the analysis."""
+    prompt = (
+        "Your previous reply could not be used:\n"
+        + "\n".join(f"- {e}" for e in errors)
+        + f"\n\nPrevious reply:\n{reply[:limit]}\n\n"
+        "Reply again with only the corrected JSON object (same fields, no other text)."
+    )
+    if valid_keys:
+        prompt += f"\ntop_key and notable_keys must be ticket keys from: {', '.join(valid_keys)}"
+    return prompt
@@ -0,0 +1,269 @@
+"""Background sync daemon serving ready-made sessions over a Unix socket.
+
+``python sync_daemon.py`` keeps a ticket snapshot fresh with a delta sync
+every ``SYNC_INTERVAL`` seconds. Whenever the ticket set changes it
+re-runs the workload analysis and warms the suggestion cache for the top
+tickets. ``WorkAssistant.start_session`` asks the daemon for that snapshot
+and shows it straight away, instead of syncing and analyzing itself.
+
+The protocol is one JSON request per connection (``{"op": "snapshot"}``)
+answered with one JSON line. Supported ops are ``status``, ``snapshot``,
+``sync`` (sync now and wait for it), ``resync`` (start a sync and answer
+straight away) and ``stop``.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from lazy_import import LazyModule
+
+requests = LazyModule("requests")
+
+DEFAULT_SOCKET = ".sync_daemon.sock"
+
+
+def socket_path() -> str:
+    return os.getenv("DAEMON_SOCKET") or DEFAULT_SOCKET
+
+
+class DaemonClient:
+    """Talks to a running daemon; every call returns None when none is listening."""
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 2.0) -> None:
+        self.path = path or socket_path()
+        self.timeout = timeout
+
+    def request(self, op: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout or self.timeout)
+                sock.connect(self.path)
+                sock.sendall(json.dumps({"op": op}).encode("utf-8") + b"\n")
+                with sock.makefile("rb") as reply:
+                    line = reply.readline()
+        except OSError:
+            # Not running (or a stale socket file left by a crash)
+            return None
+        if not line:
+            return None
+        return json.loads(line)
+
+    def status(self) -> Optional[Dict[str, Any]]:
+        return self.request("status")
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Tickets and analysis from the last sync, or None without a daemon or a finished sync."""
+        reply = self.request("snapshot")
+        return reply if reply and reply.get("ok") and reply.get("tickets") is not None else None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        daemon: "SyncDaemon" = self.server.sync_daemon  # type: ignore[attr-defined]
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+            op = request.get("op")
+        except ValueError:
+            op = None
+        if op == "snapshot":
+            payload = daemon.snapshot_bytes()
+        elif op == "status":
+            payload = json.dumps({"ok": True, **daemon.status()}).encode("utf-8")
+        elif op == "sync":
+            daemon.sync_once()
+            payload = json.dumps({"ok": True, **daemon.status()}).encode("utf-8")
+        elif op == "resync":
+            threading.Thread(target=daemon.sync_once, name="sync-daemon-resync", daemon=True).start()
+            payload = b'{"ok": true}'
+        elif op == "stop":
+            payload = b'{"ok": true}'
+            threading.Thread(target=daemon.stop, daemon=True).start()
+        else:
+            payload = json.dumps({"ok": False, "error": f"unknown op {op!r}"}).encode("utf-8")
+        self.wfile.write(payload + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class SyncDaemon:
+    """Periodic sync plus precomputed analysis, served over ``socket_path``.
+
+    ``assistant`` is a ``WorkAssistant`` used headless: its session file
+    should not be the one interactive sessions write to.
+    """
+
+    def __init__(self, assistant: Any, path: Optional[str] = None, interval: Optional[float] = None) -> None:
+        self.assistant = assistant
+        self.path = path or socket_path()
+        self.interval = interval if interval is not None else float(os.getenv("SYNC_INTERVAL", "300"))
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._snapshot = b'{"ok": false, "error": "first sync still running"}'
+        self._stop = threading.Event()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self.ticket_hash: Optional[str] = None
+        self.synced_at: Optional[datetime] = None
+        self.syncs = 0
+        self.analyses = 0
+        self.last_error: Optional[str] = None
+
+    def sync_once(self) -> bool:
+        """Sync tickets; returns True when the ticket set changed and the analysis was redone."""
+        wa = self.assistant
+        with self._sync_lock:
+            try:
+                wa.current_tickets = self._fetch_tickets()
+                ticket_hash = wa._calculate_ticket_hash(wa.current_tickets)
+                changed = ticket_hash != self.ticket_hash
+                if changed:
+                    wa.current_analysis = wa.llm._compute_analysis(wa.current_tickets) if wa.current_tickets else None
+                    self.analyses += 1
+                    # Warms the shared suggestion cache for the likely next picks
+                    wa._start_prefetch()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            self.syncs += 1
+            self.last_error = None
+            self.ticket_hash = ticket_hash
+            self.synced_at = datetime.now()
+            snapshot = {
+                "ok": True,
+                "synced_at": self.synced_at.isoformat(),
+                "ticket_hash": ticket_hash,
+                "tickets": [t.to_dict() for t in wa.current_tickets],
+                "analysis": wa.current_analysis.to_dict() if wa.current_analysis else None,
+            }
+            # Encoded once per sync, so serving a session costs one socket write
+            encoded = json.dumps(snapshot, default=str).encode("utf-8")
+            with self._lock:
+                self._snapshot = encoded
+            return changed
+
+    def _fetch_tickets(self) -> List[Any]:
+        """``WorkAssistant._sync_tickets`` without its spinners and console output.
+
+        Those belong to the interactive thread. Errors propagate, so a failed
+        sync keeps the last snapshot.
+        """
+        wa = self.assistant
+        since = wa.session.sync_cursor
+        if since is not None and os.getenv("SYNC_MODE", "delta") == "delta":
+            try:
+                return wa._snapshot_tickets(wa._merge_changes(since))
+            except (requests.RequestException, ValueError) as e:
+                # Same fallback as an interactive sync: refetch everything
+                print(f"Delta sync failed ({type(e).__name__}: {e}); fetching all tickets", file=sys.stderr)
+        tickets = wa.jira.search_tickets()
+        wa.session.update_session(tickets)
+        return tickets
+
+    def snapshot_bytes(self) -> bytes:
+        with self._lock:
+            return self._snapshot
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "synced_at": self.synced_at.isoformat() if self.synced_at else None,
+            "tickets": len(self.assistant.current_tickets),
+            "syncs": self.syncs,
+            "analyses": self.analyses,
+            "interval": self.interval,
+            "last_error": self.last_error,
+        }
+
+    def start(self) -> None:
+        """Bind the socket and start serving and syncing in background threads."""
+        if DaemonClient(self.path).status():
+            raise RuntimeError(f"A sync daemon is already listening on {self.path}")
+        if os.path.exists(self.path):
+            os.remove(self.path)  # stale socket from a daemon that did not shut down cleanly
+        # Created owner-only: a chmod after bind would leave a window with default permissions
+        umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.path, _Handler)
+        finally:
+            os.umask(umask)
+        self._server.sync_daemon = self  # type: ignore[attr-defined]
+        threading.Thread(target=self._server.serve_forever, name="sync-daemon-socket", daemon=True).start()
+        self._thread = threading.Thread(target=self._sync_loop, name="sync-daemon-sync", daemon=True)
+        self._thread.start()
+
+    def _sync_loop(self) -> None:
+        while not self._stop.is_set():
+            self.sync_once()
+            self._stop.wait(self.interval)
+
+    def wait(self) -> None:
+        while not self._stop.wait(0.5):
+            pass
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        self.assistant._cancel_prefetch()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Keep tickets and analysis fresh for instant sessions")
+    parser.add_argument("--socket", default=None, help=f"socket path (DAEMON_SOCKET, default {DEFAULT_SOCKET})")
+    parser.add_argument("--interval", type=float, default=None, help="seconds between syncs (SYNC_INTERVAL, 300)")
+    parser.add_argument("--session", default=os.getenv("DAEMON_SESSION_FILE", "daemon_state.json"),
+                        help="session file for the daemon's own snapshot")
+    parser.add_argument("--status", action="store_true", help="print the running daemon's status and exit")
+    parser.add_argument("--stop", action="store_true", help="stop the running daemon")
+    args = parser.parse_args(argv)
+
+    client = DaemonClient(args.socket)
+    if args.status or args.stop:
+        reply = client.request("stop" if args.stop else "status")
+        if reply is None:
+            print(f"No sync daemon listening on {client.path}")
+            return 1
+        print(json.dumps(reply, indent=2))
+        return 0
+
+    import assistant as work_assistant
+    from assistant import WorkAssistant
+    from session_manager import SessionManager
+
+    # Headless: no interactive thread owns the terminal, so rich output is off
+    work_assistant.console.quiet = True
+
+    assistant = WorkAssistant(session_manager=SessionManager(args.session))
+    daemon = SyncDaemon(assistant, args.socket, args.interval)
+    try:
+        daemon.start()
+    except RuntimeError as e:
+        print(e)
+        return 1
+    print(f"Sync daemon listening on {daemon.path}, syncing every {daemon.interval:.0f}s (Ctrl+C to stop)")
+    try:
+        daemon.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import copy
+
+import pytest
+
+from adf import adf_to_text
+from assistant import JiraClient
+from benchmarks.synthetic import generate_issues
+
+
+def _p(*content):
+    return {"type": "paragraph", "content": list(content)}
+
+
+def _t(text):
+    return {"type": "text", "text": text}
+
+
+def _doc(*content):
+    return {"type": "doc", "version": 1, "content": list(content)}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    for var in ("JIRA_BASE_URL", "JIRA_EMAIL", "JIRA_API_TOKEN"):
+        monkeypatch.setenv(var, "test")
+    return JiraClient()
+
+
+def test_renders_common_nodes():
+    doc = _doc(
+        {"type": "heading", "attrs": {"level": 2}, "content": [_t("Problem")]},
+        _p(_t("Broken for "), {"type": "mention", "attrs": {"id": "1", "text": "@Jane"}},
+           {"type": "hardBreak"}, _t("see"), {"type": "inlineCard", "attrs": {"url": "https://x/y"},
+                                             "content": [_t("ignored")]}),
+        {"type": "bulletList", "content": [
+            {"type": "listItem", "content": [
+                _p(_t("one")),
+                {"type": "orderedList", "attrs": {"order": 3}, "content": [
+                    {"type": "listItem", "content": [_p(_t("nested"))]},
+                ]},
+            ]},
+            {"type": "listItem", "content": [_p(_t("two"))]},
+        ]},
+        {"type": "codeBlock", "attrs": {"language": "bash"}, "content": [_t("kubectl get pods")]},
+        {"type": "table", "content": [
+            {"type": "tableRow", "content": [
+                {"type": "tableHeader", "content": [_p(_t("Env"))]},
+                {"type": "tableHeader", "content": [_p(_t("State"))]},
+            ]},
+            {"type": "tableRow", "content": [
+                {"type": "tableCell", "content": [_p(_t("prod"))]},
+                {"type": "tableCell", "content": [_p({"type": "status", "attrs": {"text": "DOWN"}})]},
+            ]},
+        ]},
+        {"type": "taskList", "content": [
+            {"type": "taskItem", "attrs": {"state": "DONE"}, "content": [_t("page on-call")]},
+        ]},
+    )
+    assert adf_to_text(doc) == "\n".join([
+        "Problem",
+        "Broken for @Jane",
+        "see [Link: https://x/y]",
+        "- one",
+        "  3. nested",
+        "- two",
+        "```bash",
+        "kubectl get pods",
+        "```",
+        "Env | State",
+        "prod | [DOWN]",
+        "[x] page on-call",
+    ])
+
+
+def test_deeply_nested_document_does_not_recurse():
+    node = _t("bottom")
+    for _ in range(50000):
+        node = {"type": "blockquote", "content": [node]}
+    assert adf_to_text(_doc(node)) == "bottom"
+
+
+def test_max_length_stops_early():
+    doc = _doc(*[_p(_t(f"paragraph {n}")) for n in range(10000)])
+    assert adf_to_text(doc, max_length=25) == "paragraph 0\nparagraph 1\np"
+
+
+def test_extract_text_keeps_old_contract(client):
+    assert client._extract_text_from_adf(_doc()) == "No description available"
+    assert client._extract_text_from_adf("plain") == "plain"
+
+
+def test_parse_is_cached_by_key_and_updated(client):
+    issue = next(generate_issues(1, adf=True))
+    first = client._parse_ticket(issue)
+    assert client._parse_ticket(copy.deepcopy(issue)) is first
+    assert client.parse_cache_hits == 1
+
+    changed = copy.deepcopy(issue)
+    changed["fields"]["updated"] = "2030-01-01T00:00:00.000+0000"
+    changed["fields"]["summary"] = "Edited"
+    assert client._parse_ticket(changed).summary == "Edited"
+
+
+def test_parse_cache_is_bounded(client):
+    client.parse_cache_size = 5
+    for issue in generate_issues(20):
+        client._parse_ticket(issue)
+    assert len(client._parsed) == 5
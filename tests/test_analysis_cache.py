@@ -1,3 +1,4 @@
+import tempfile
 import unittest
 from unittest.mock import MagicMock
 from datetime import datetime, timedelta
@@ -6,10 +7,13 @@ import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from assistant import LLMClient, Ticket, WorkloadAnalysis, WorkAssistant
+from session_manager import SessionManager
 
 
 class AnalysisCacheTests(unittest.TestCase):
     def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        os.environ["CACHE_DB"] = os.path.join(self.tmp.name, "cache.db")
         now = datetime.now()
         self.ticket = Ticket(
             key="T1",
@@ -34,6 +38,10 @@ class AnalysisCacheTests(unittest.TestCase):
             summary="summary",
         )
 
+    def tearDown(self):
+        del os.environ["CACHE_DB"]
+        self.tmp.cleanup()
+
     def test_cache_hit_returns_previous_analysis(self):
         client = LLMClient()
         client._compute_analysis = MagicMock(return_value=self.analysis)
@@ -53,7 +61,8 @@ class AnalysisCacheTests(unittest.TestCase):
     def test_re_analyze_command_clears_cache(self):
         client = LLMClient()
         client._compute_analysis = MagicMock(return_value=self.analysis)
-        assistant = WorkAssistant(jira_client=MagicMock(), llm_client=client)
+        assistant = WorkAssistant(jira_client=MagicMock(), llm_client=client,
+                                  session_manager=SessionManager(os.path.join(self.tmp.name, "session.json")))
         assistant.current_tickets = [self.ticket]
         assistant.current_analysis = client.analyze_workload([self.ticket])
         assistant._handle_user_input("re analyze")
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+
+import assistant
+import http_client
+from batch_cli import EXIT_ERROR, EXIT_NOT_FOUND, EXIT_OK, EXIT_PARTIAL, EXIT_USAGE, RecordWriter, _run_queues, cli
+from benchmarks.fake_servers import Faults, FakeJira, FakeOllama
+from benchmarks.synthetic import generate_issues
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    monkeypatch.setenv("JIRA_EMAIL", "stand-in@example.com")
+    monkeypatch.setenv("JIRA_API_TOKEN", "stand-in")
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.chdir(tmp_path)  # session_state.json lands here
+    # The group silences the shared console; undo that after each test
+    monkeypatch.setattr(assistant.console, "quiet", False)
+    return monkeypatch
+
+
+@pytest.fixture
+def servers(env):
+    issues = list(generate_issues(12))
+    with FakeJira(issues) as jira, FakeOllama(faults=Faults(tokens_per_second=5000)) as ollama:
+        env.setenv("JIRA_BASE_URL", jira.url)
+        env.setenv("OLLAMA_HOST", ollama.url)
+        yield jira, issues
+
+
+def _run(*args):
+    return CliRunner().invoke(cli, list(args), catch_exceptions=False)
+
+
+def test_analyze_runs_queues_concurrently(servers):
+    jira, issues = servers
+    queues = [f'assignee = "engineer{n}" AND statusCategory != Done' for n in range(3)]
+    result = _run("analyze", *[arg for q in queues for arg in ("--jql", q)])
+    assert result.exit_code == EXIT_OK, result.stderr
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted(r["queue"] for r in records) == sorted(queues)
+    keys = {issue["key"] for issue in issues}
+    for record in records:
+        assert record["tickets"] == 12
+        assert record["top_priority"] in keys
+        assert record["summary"]
+
+    result = _run("analyze", "--json")
+    [record] = json.loads(result.stdout)
+    assert "queue" not in record and record["top_priority"] in keys
+
+
+def test_list_formats_and_find_filter(servers):
+    result = _run("list", "--format", "csv", "--find", "sort:key limit:3")
+    assert result.exit_code == EXIT_OK
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert len(rows) == 3 and rows[0]["key"] and rows[0]["priority"]
+
+    result = _run("list", "--json", "--find", "key:NOPE-1")
+    assert json.loads(result.stdout) == []
+
+    assert _run("list", "--find", "stale>>").exit_code == EXIT_USAGE
+    assert _run("list", "--cached", "--jql", "project = X").exit_code == EXIT_USAGE
+
+
+def test_sync_then_list_cached(servers):
+    first = json.loads(_run("sync").stdout)
+    assert (first["mode"], first["tickets"]) == ("full", 12)
+    second = json.loads(_run("sync").stdout)
+    assert (second["mode"], second["tickets"]) == ("delta", 12)
+    jira, _ = servers
+    requests_before = jira.stats()["requests"]
+    assert len(_run("list", "--cached").stdout.splitlines()) == 12
+    assert jira.stats()["requests"] == requests_before
+
+
+def test_suggest_and_comment(servers):
+    jira, issues = servers
+    key = issues[0]["key"]
+    result = _run("suggest", key)
+    assert result.exit_code == EXIT_OK
+    assert json.loads(result.stdout)["suggestion"]
+    assert _run("suggest", "NOPE-404").exit_code == EXIT_NOT_FOUND
+
+    draft = json.loads(_run("comment", key, "--context", "waiting on review").stdout)
+    assert draft["posted"] is False and draft["comment"]
+    assert jira.comments == {}
+    posted = json.loads(_run("comment", key, "--body", "Deployed to staging", "--yes").stdout)
+    assert posted["posted"] is True
+    assert jira.comments == {key: ["Deployed to staging"]}
+    assert _run("comment", key).exit_code == EXIT_USAGE
+
+
+def test_jira_errors_set_the_exit_code(env, monkeypatch):
+    monkeypatch.setattr(http_client.get_http_client(), "_sleep", lambda s: None)
+    with FakeJira([], faults=Faults(error_rate=1.0)) as jira:
+        env.setenv("JIRA_BASE_URL", jira.url)
+        result = _run("list")
+    assert result.exit_code == EXIT_ERROR
+    assert "503" in result.stderr
+    assert result.stdout == ""
+
+    env.delenv("JIRA_BASE_URL")
+    assert _run("list").exit_code == EXIT_ERROR
+
+
+def test_partial_failures_stream_the_rest():
+    out = io.StringIO()
+
+    def job(queue):
+        if queue == "bad":
+            raise RuntimeError("boom")
+        return [{"key": queue}]
+
+    code = _run_queues(["a", "bad", "b"], job, RecordWriter("json", ["queue", "key"], out), workers=3)
+    assert code == EXIT_PARTIAL
+    assert sorted(r["queue"] for r in json.loads(out.getvalue())) == ["a", "b"]
@@ -0,0 +1,30 @@
+import json
+
+from benchmarks import bench_suite
+from benchmarks.synthetic import generate_issues
+
+
+def test_generator_is_deterministic_and_rich():
+    first = list(generate_issues(20, seed=3, adf=True, changelog=True))
+    assert first == list(generate_issues(20, seed=3, adf=True, changelog=True))
+    assert all(issue["fields"]["description"]["type"] == "doc" for issue in first)
+    histories = [h for issue in first for h in issue["changelog"]["histories"]]
+    assert histories and all({"author", "created", "items"} <= set(h) for h in histories)
+    # The richer shapes don't disturb the base fields
+    plain = list(generate_issues(20, seed=3))
+    assert [i["fields"]["summary"] for i in plain] == [i["fields"]["summary"] for i in first]
+
+
+def test_every_case_runs_at_small_scale(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench_suite, "_WORKDIR", str(tmp_path))
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    report = bench_suite.run_suite([10], repeat=1)
+    assert set(report["results"]) == {f"{name}@10" for name in bench_suite.CASES}
+    assert all(r["per_item_us"] > 0 for r in report["results"].values())
+    json.dumps(report)
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = {"results": {"a@10": {"per_item_us": 10.0}, "b@10": {"per_item_us": 10.0}, "c@10": {"per_item_us": 10.0}}}
+    current = {"results": {"a@10": {"per_item_us": 12.0}, "b@10": {"per_item_us": 13.0}, "c@10": {"per_item_us": 5.0}}}
+    assert bench_suite.compare(baseline, current, threshold=0.25) == ["b@10"]
@@ -0,0 +1,82 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from assistant import JiraClient, Ticket
+
+ENV = {
+    "JIRA_BASE_URL": "https://jira.example",
+    "JIRA_EMAIL": "me@example.com",
+    "JIRA_API_TOKEN": "token",
+    "CACHE_DB": "test_changelog_cache.db",
+}
+
+
+def _history(n: int) -> dict:
+    return {
+        "id": str(n),
+        "author": {"displayName": "Dana", "avatarUrls": {"48x48": "https://avatar"}},
+        "created": f"2024-01-0{n + 1}T10:00:00.000+0000",
+        "items": [{"field": "status", "fromString": "Open", "toString": "In Progress", "fieldtype": "jira"}],
+    }
+
+
+class ChangelogTests(unittest.TestCase):
+    def setUp(self):
+        with patch.dict(os.environ, ENV):
+            self.client = JiraClient()
+        self.client.page_size = 2
+        now = datetime(2024, 1, 5, 12, 0)
+        self.ticket = Ticket(
+            key="T-1", summary="", description="", priority="P2", status="Open", assignee=None,
+            created=now, updated=now, comments_count=0, labels=[], issue_type="Bug", raw_data={},
+        )
+
+    def tearDown(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(ENV["CACHE_DB"] + suffix):
+                os.remove(ENV["CACHE_DB"] + suffix)
+
+    def _pages(self, url, params=None, **kwargs):
+        start = params["startAt"]
+        values = [_history(n) for n in range(start, min(start + 2, 3))]
+        resp = MagicMock()
+        resp.json.return_value = {"startAt": start, "total": 3, "isLast": start + 2 >= 3, "values": values}
+        return resp
+
+    def test_changelog_paginates_and_compacts(self):
+        with patch.object(self.client.http, "get", side_effect=self._pages) as mock_get:
+            histories = self.client.get_changelog(self.ticket)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(len(histories), 3)
+        self.assertEqual(histories[0], {
+            "created": "2024-01-01T10:00:00.000+0000",
+            "author": "Dana",
+            "items": [{"field": "status", "from": "Open", "to": "In Progress"}],
+        })
+
+    def test_changelog_cached_until_ticket_updates(self):
+        with patch.object(self.client.http, "get", side_effect=self._pages) as mock_get:
+            self.client.get_changelog(self.ticket)
+            self.client.get_changelog(self.ticket)
+            self.assertEqual(mock_get.call_count, 2)
+            self.ticket.updated = datetime(2024, 1, 6, 9, 0)
+            self.client.get_changelog(self.ticket)
+            self.assertEqual(mock_get.call_count, 4)
+
+    def test_search_does_not_expand_changelog(self):
+        resp = MagicMock()
+        resp.json.return_value = {"startAt": 0, "maxResults": 100, "total": 0, "issues": []}
+        with patch.object(self.client.http, "get", return_value=resp) as mock_get:
+            self.client.get_my_tickets()
+        params = mock_get.call_args.kwargs["params"]
+        self.assertNotIn("expand", params)
+        self.assertEqual(params["fields"], JiraClient.TICKET_FIELDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from assistant import JiraClient, Ticket, WorkAssistant
+from session_manager import SessionManager
+
+
+def _ticket(key: str, updated: datetime, summary: str = "") -> Ticket:
+    return Ticket(
+        key=key,
+        summary=summary or key,
+        description="",
+        priority="P2",
+        status="Open",
+        assignee=None,
+        created=updated - timedelta(days=3),
+        updated=updated,
+        comments_count=0,
+        labels=[],
+        issue_type="Bug",
+        raw_data={},
+    )
+
+
+def test_merge_updates_by_key_and_drops_closed(tmp_path):
+    sm = SessionManager(str(tmp_path / "state.json"))
+    now = datetime(2024, 5, 1, 12, 0)
+    sm.update_session([_ticket("A-1", now), _ticket("A-2", now), _ticket("A-3", now)])
+
+    later = now + timedelta(hours=1)
+    missing = sm.merge_tickets([_ticket("A-2", later, "edited")], ["A-2", "A-1"])
+
+    assert missing == []
+    assert [t["key"] for t in sm.get_tickets()] == ["A-2", "A-1"]
+    assert sm.get_tickets()[0]["summary"] == "edited"
+    assert sm.sync_cursor == later
+
+
+def test_merge_reports_unknown_live_keys(tmp_path):
+    sm = SessionManager(str(tmp_path / "state.json"))
+    sm.update_session([_ticket("A-1", datetime(2024, 5, 1))])
+    assert sm.merge_tickets([], ["A-1", "A-9"]) == ["A-9"]
+
+
+def test_and_jql_keeps_order_by():
+    jql = JiraClient._and_jql(JiraClient.DEFAULT_JQL, 'updated >= "2024-05-01 12:00"')
+    assert jql == (
+        '(assignee = currentUser() AND statusCategory != Done) AND updated >= "2024-05-01 12:00"'
+        " ORDER BY priority DESC, updated DESC"
+    )
+
+
+def test_sync_only_fetches_changes_when_snapshot_exists(tmp_path):
+    sm = SessionManager(str(tmp_path / "state.json"))
+    now = datetime(2024, 5, 1, 12, 0)
+    sm.update_session([_ticket("A-1", now), _ticket("A-2", now)])
+
+    jira = MagicMock()
+    jira.get_updated_tickets.return_value = [_ticket("A-1", now + timedelta(minutes=5), "changed")]
+    jira.get_ticket_keys.return_value = ["A-1", "A-2"]
+    assistant = WorkAssistant(jira_client=jira, llm_client=MagicMock(), session_manager=sm)
+
+    tickets = assistant._sync_tickets()
+
+    jira.get_my_tickets.assert_not_called()
+    jira.get_updated_tickets.assert_called_once_with(now)
+    assert [t.key for t in tickets] == ["A-1", "A-2"]
+    assert tickets[0].summary == "changed"
+
+
+def test_sync_falls_back_to_full_fetch_without_snapshot(tmp_path):
+    sm = SessionManager(str(tmp_path / "state.json"))
+    jira = MagicMock()
+    jira.get_my_tickets.return_value = [_ticket("A-1", datetime(2024, 5, 1))]
+    assistant = WorkAssistant(jira_client=jira, llm_client=MagicMock(), session_manager=sm)
+
+    tickets = assistant._sync_tickets()
+
+    jira.get_updated_tickets.assert_not_called()
+    assert [t.key for t in tickets] == ["A-1"]
+    assert sm.sync_cursor == datetime(2024, 5, 1)
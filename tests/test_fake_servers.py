@@ -0,0 +1,111 @@
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from assistant import JiraClient, LLMClient, WorkAssistant
+from benchmarks.fake_servers import Faults, FakeJira, FakeOllama, FakeOpenAI, Recorder, issues_from_session
+from benchmarks.synthetic import generate_issues
+from http_client import HttpClient
+from session_manager import SessionManager
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    monkeypatch.setenv("JIRA_EMAIL", "stand-in@example.com")
+    monkeypatch.setenv("JIRA_API_TOKEN", "stand-in")
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    return monkeypatch
+
+
+def test_assistant_runs_end_to_end(tmp_path, env):
+    issues = list(generate_issues(230, adf=True, changelog=True))
+    with FakeJira(issues) as jira, FakeOllama(faults=Faults(tokens_per_second=5000)) as ollama:
+        env.setenv("JIRA_BASE_URL", jira.url)
+        env.setenv("OLLAMA_HOST", ollama.url)
+        wa = WorkAssistant(session_manager=SessionManager(str(tmp_path / "state.json")))
+        wa.prefetch_workers = 0
+        with patch("assistant.Prompt.ask", side_effect=["quit"]), patch("assistant.Confirm.ask", return_value=False):
+            wa.start_session()
+
+        assert len(wa.current_tickets) == 230
+        assert wa.current_analysis.top_priority.key in {issue["key"] for issue in issues}
+        # Three search pages and one whole-queue prompt (map-reduce is opt-in)
+        assert jira.stats()["requests"] == 3
+        assert len(ollama.prompts) == 1
+
+        assert wa.jira.add_comment("CPE-7", "Looking into it")
+        assert jira.comments == {"CPE-7": ["Looking into it"]}
+        assert [h["author"] for h in wa.jira.get_changelog(wa.jira.get_tickets_by_key(["CPE-7"])[0])]
+
+
+def test_injected_errors_are_retried(env):
+    with FakeJira(list(generate_issues(250)), faults=Faults(error_rate=0.3, seed=4)) as jira:
+        env.setenv("JIRA_BASE_URL", jira.url)
+        client = JiraClient()
+        client.http = HttpClient(max_retries=10, sleep=lambda s: None)
+        assert len(client.get_my_tickets()) == 250
+        assert jira.stats()["injected_errors"] > 0
+        host = client.http.stats()[jira.url.split("//")[1]]
+        assert host.retries == jira.stats()["injected_errors"]
+
+
+def test_latency_and_streaming_speed(env):
+    with FakeOllama(faults=Faults(latency=0.05, tokens_per_second=200),
+                    responder=lambda prompt, json_mode: "one two three four five six seven eight") as ollama:
+        env.setenv("OLLAMA_HOST", ollama.url)
+        llm = LLMClient()
+        tokens = []
+        start = time.perf_counter()
+        assert llm._complete("hello", on_token=tokens.append) == "one two three four five six seven eight"
+        assert len(tokens) == 8
+        # 50 ms latency plus nine chunks at 5 ms each
+        assert time.perf_counter() - start >= 0.09
+
+
+def test_openai_stand_in_speaks_the_sdk_protocol(env):
+    with FakeOpenAI() as server:
+        env.setenv("LLM_PROVIDER", "openai")
+        llm = LLMClient()
+        import openai
+        client = openai.OpenAI(api_key="stand-in", base_url=f"{server.url}/v1")
+        with patch("assistant.openai.chat", client.chat):
+            tokens = []
+            text = llm._complete("Which of CPE-1 and OPS-2?", on_token=tokens.append)
+            assert text.startswith("Start with CPE-1") and "".join(tokens) == text
+            structured = llm._complete("Pick one of CPE-1, OPS-2", schema={"type": "object"})
+        assert '"top_key": "CPE-1"' in structured
+
+
+def test_record_then_replay(tmp_path, env):
+    fixtures = str(tmp_path / "fixtures.json")
+    with FakeOllama(responder=lambda prompt, json_mode: "recorded answer") as upstream:
+        with FakeOllama(recorder=Recorder(fixtures, "record"), upstream=upstream.url) as proxy:
+            env.setenv("OLLAMA_HOST", proxy.url)
+            assert LLMClient()._complete("hi", on_token=[].append) == "recorded answer"
+            reply = requests.get(f"{proxy.url}/api/tags", headers={"Authorization": "Bearer secret"})
+            assert reply.status_code == 200
+    assert "secret" not in open(fixtures).read()
+
+    with FakeOllama(recorder=Recorder(fixtures), responder=lambda prompt, json_mode: "live answer") as replay:
+        env.setenv("OLLAMA_HOST", replay.url)
+        llm = LLMClient()
+        tokens = []
+        assert llm._complete("hi", on_token=tokens.append) == "recorded answer"
+        assert llm._complete("something else") == "live answer"
+        assert replay.stats()["replayed"] == 1
+
+
+def test_issues_from_session_round_trip(tmp_path, env):
+    manager = SessionManager(str(tmp_path / "state.json"))
+    env.setenv("JIRA_BASE_URL", "http://unused")
+    tickets = [JiraClient()._parse_ticket(issue) for issue in generate_issues(5)]
+    manager.update_session(tickets)
+
+    with FakeJira(issues_from_session(manager.path)) as jira:
+        env.setenv("JIRA_BASE_URL", jira.url)
+        served = JiraClient().get_my_tickets()
+    assert [(t.key, t.summary, t.priority, t.updated_ts) for t in served] == \
+        [(t.key, t.summary, t.priority, t.updated_ts) for t in tickets]
@@ -0,0 +1,95 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from http_client import HttpClient
+
+
+def _response(status: int, headers: dict = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    return resp
+
+
+class HttpClientTests(unittest.TestCase):
+    def setUp(self):
+        self.session = MagicMock()
+        self.sleeps = []
+        self.client = HttpClient(max_retries=3, session=self.session, sleep=self.sleeps.append)
+
+    def test_retries_idempotent_get_on_server_error(self):
+        self.session.request.side_effect = [_response(502), _response(503), _response(200)]
+        resp = self.client.get("https://jira.example/rest/api/3/search", endpoint="jira")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.session.request.call_count, 3)
+        stats = self.client.stats()["jira.example"]
+        self.assertEqual(stats.requests, 3)
+        self.assertEqual(stats.retries, 2)
+
+    def test_honours_retry_after(self):
+        self.session.request.side_effect = [_response(429, {"Retry-After": "7"}), _response(200)]
+        self.client.get("https://jira.example/x")
+        self.assertEqual(self.sleeps, [7.0])
+        self.assertEqual(self.client.stats()["jira.example"].throttled, 1)
+
+    def test_post_not_retried_on_server_error(self):
+        self.session.request.return_value = _response(500)
+        resp = self.client.post("https://jira.example/comment", json={})
+        self.assertEqual(resp.status_code, 500)
+        self.session.request.assert_called_once()
+
+    def test_post_retried_when_throttled(self):
+        self.session.request.side_effect = [_response(429), _response(201)]
+        resp = self.client.post("https://jira.example/comment", json={})
+        self.assertEqual(resp.status_code, 201)
+
+    def test_connection_errors_raise_after_max_retries(self):
+        self.session.request.side_effect = requests.ConnectionError("down")
+        with self.assertRaises(requests.ConnectionError):
+            self.client.get("https://ollama.local/api/tags")
+        self.assertEqual(self.session.request.call_count, 4)
+        self.assertEqual(self.client.stats()["ollama.local"].errors, 4)
+
+    def test_endpoint_timeouts_applied(self):
+        self.session.request.return_value = _response(200)
+        self.client.post("http://ollama.local/api/generate", endpoint="llm", idempotent=True)
+        _, kwargs = self.session.request.call_args
+        self.assertEqual(kwargs["timeout"], self.client.timeouts["llm"])
+
+    def test_limit_host_caps_requests_in_flight(self):
+        lock = threading.Lock()
+        in_flight = {"now": 0, "max": 0}
+
+        def request(method, url, **kwargs):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.02)
+            with lock:
+                in_flight["now"] -= 1
+            return _response(200)
+
+        self.session.request.side_effect = request
+        self.client.limit_host("https://jira.example", 2)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda n: self.client.get(f"https://jira.example/{n}"), range(8)))
+            list(pool.map(lambda n: self.client.get(f"https://other.example/{n}"), range(8)))
+        self.assertEqual(self.session.request.call_count, 16)
+        self.assertGreater(in_flight["max"], 2)  # the unlimited host
+        in_flight["max"] = 0
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda n: self.client.get(f"https://jira.example/{n}"), range(8)))
+        self.assertEqual(in_flight["max"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
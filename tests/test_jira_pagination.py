@@ -0,0 +1,80 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from assistant import JiraClient
+
+
+def _issue(n: int) -> dict:
+    return {
+        "key": f"T-{n}",
+        "fields": {
+            "summary": f"Ticket {n}",
+            "description": None,
+            "priority": {"name": "P3"},
+            "status": {"name": "Open"},
+            "assignee": None,
+            "created": "2024-01-01T10:00:00.000+0000",
+            "updated": "2024-01-02T10:00:00.000+0000",
+            "comment": {"total": 0},
+            "labels": [],
+            "issuetype": {"name": "Task"},
+        },
+    }
+
+
+ENV = {"JIRA_BASE_URL": "https://jira.example", "JIRA_EMAIL": "me@example.com", "JIRA_API_TOKEN": "token"}
+
+
+class JiraPaginationTests(unittest.TestCase):
+    def _offset_pages(self, total: int, page_size: int):
+        def fake_get(url, params=None, **kwargs):
+            start = params.get("startAt", 0)
+            size = min(params["maxResults"], page_size)
+            issues = [_issue(n) for n in range(start, min(start + size, total))]
+            resp = MagicMock()
+            resp.json.return_value = {"startAt": start, "maxResults": size, "total": total, "issues": issues}
+            return resp
+        return fake_get
+
+    def test_fetches_every_page_in_jql_order(self):
+        with patch.dict(os.environ, ENV):
+            client = JiraClient()
+        progress = []
+        with patch.object(client.http, "get", side_effect=self._offset_pages(total=250, page_size=50)) as mock_get:
+            tickets = client.get_my_tickets(on_progress=lambda done, total: progress.append((done, total)))
+        self.assertEqual([t.key for t in tickets], [f"T-{n}" for n in range(250)])
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertEqual(progress[-1], (250, 250))
+
+    def test_single_page_makes_one_request(self):
+        with patch.dict(os.environ, ENV):
+            client = JiraClient()
+        with patch.object(client.http, "get", side_effect=self._offset_pages(total=3, page_size=100)) as mock_get:
+            tickets = client.get_my_tickets()
+        self.assertEqual(len(tickets), 3)
+        mock_get.assert_called_once()
+
+    def test_follows_next_page_token(self):
+        with patch.dict(os.environ, ENV):
+            client = JiraClient()
+        pages = {
+            None: {"issues": [_issue(0), _issue(1)], "nextPageToken": "b"},
+            "b": {"issues": [_issue(2)], "isLast": True},
+        }
+
+        def fake_get(url, params=None, **kwargs):
+            resp = MagicMock()
+            resp.json.return_value = pages[params.get("nextPageToken")]
+            return resp
+
+        with patch.object(client.http, "get", side_effect=fake_get):
+            tickets = client.get_my_tickets()
+        self.assertEqual([t.key for t in tickets], ["T-0", "T-1", "T-2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+from cache import Cache
+from lazy_import import LazyModule
+from startup_profile import direct_imports, parse_importtime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_startup_does_not_import_provider_sdks(tmp_path):
+    code = (
+        "import json, sys; import assistant; wa = assistant.WorkAssistant(); wa.load_state(); "
+        "print(json.dumps([m for m in ('openai', 'requests', 'http_client') if m in sys.modules]))"
+    )
+    env = dict(os.environ, CACHE_DB=str(tmp_path / "cache.db"))
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
+
+
+def test_lazy_module_forwards_reads_and_writes():
+    fake = types.ModuleType("fake_sdk")
+    with patch.dict(sys.modules, {"fake_sdk": fake}):
+        lazy = LazyModule("fake_sdk")
+        assert not lazy.is_loaded
+        lazy.api_key = "secret"
+        assert fake.api_key == "secret"
+        assert lazy.api_key == "secret"
+        assert lazy.is_loaded
+
+
+def test_clients_and_session_built_on_first_use():
+    import assistant
+    with patch.object(assistant, "SessionManager") as session_cls, \
+            patch.object(assistant, "JiraClient") as jira_cls, \
+            patch.object(assistant, "LLMClient") as llm_cls:
+        wa = assistant.WorkAssistant()
+        session_cls.assert_not_called()
+        jira_cls.assert_not_called()
+        llm_cls.assert_not_called()
+
+        assert wa.session is wa.session_manager is session_cls.return_value
+        assert wa.jira is jira_cls.return_value
+        session_cls.assert_called_once()
+        llm_cls.assert_not_called()
+
+
+def test_json_cache_parsed_on_first_access(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps({"k": {"v": 1}}))
+    with patch("cache.json.load", wraps=json.load) as load:
+        cache = Cache(str(path))
+        load.assert_not_called()
+        assert cache.get("k") == {"v": 1}
+        load.assert_called_once()
+
+
+def test_direct_imports_from_importtime_output():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |     leaf",
+        "import time:       200 |        300 |   heavy",
+        "import time:        50 |         50 |   light",
+        "import time:       400 |        750 | assistant",
+    ])
+    entries = parse_importtime(stderr)
+    assert entries[0] == (2, "leaf", 100)
+    assert direct_imports(entries, "assistant") == [("heavy", 0.3), ("light", 0.05)]
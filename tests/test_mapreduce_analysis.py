@@ -0,0 +1,97 @@
+import re
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from assistant import LLMClient, Ticket
+
+
+def _ticket(key, summary, priority="P3", status="Open"):
+    now = datetime.now()
+    return Ticket(
+        key=key, summary=summary, description="", priority=priority, status=status, assignee=None,
+        created=now - timedelta(days=10), updated=now, comments_count=0, labels=[], issue_type="Task",
+    )
+
+
+class FakeLLM:
+    def __init__(self, fail_map=False):
+        self.fail_map = fail_map
+        self.map_calls = []
+        self.reduce_calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt, on_token=None, schema=None):
+        match = re.search(r"Ticket: (\S+) - (.*)", prompt)
+        if match:
+            with self.lock:
+                self.map_calls.append(match.group(1))
+            if self.fail_map:
+                raise RuntimeError("provider down")
+            urgency = 5 if "security" in match.group(2).lower() else 2
+            return f"URGENCY: {urgency}\nREASON: {match.group(2)}\nNEXT STEP: Look at {match.group(1)}"
+        self.reduce_calls += 1
+        return "Here is your briefing."
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("ANALYSIS_MODE", "mapreduce")
+    return LLMClient()
+
+
+def test_assessments_ranked_and_summarized(client):
+    tickets = [_ticket("A-1", "Tidy docs", "P2"), _ticket("A-2", "Security patch for login"), _ticket("A-3", "Rename job")]
+    client._complete = fake = FakeLLM()
+
+    analysis = client._compute_analysis(tickets)
+
+    assert sorted(fake.map_calls) == ["A-1", "A-2", "A-3"]
+    assert fake.reduce_calls == 1
+    assert analysis.top_priority.key == "A-2"
+    assert analysis.priority_reasoning == "Security patch for login"
+    assert analysis.next_steps[0] == "Look at A-2"
+    assert [t.key for t in analysis.other_notable] == ["A-1", "A-3"]
+    assert analysis.summary == "Here is your briefing."
+
+
+def test_only_changed_tickets_are_reassessed(client):
+    tickets = [_ticket("A-1", "Tidy docs"), _ticket("A-2", "Rename job"), _ticket("A-3", "Bump deps")]
+    client._complete = FakeLLM()
+    client._compute_analysis(tickets)
+
+    tickets[1].summary = "Rename job and update cron"
+    client.clear_cache()
+    client._complete = fake = FakeLLM()
+    client._compute_analysis(tickets)
+
+    assert fake.map_calls == ["A-2"]
+    assert fake.reduce_calls == 1
+
+
+def test_unchanged_queue_reuses_narrative(client):
+    tickets = [_ticket("A-1", "Tidy docs"), _ticket("A-2", "Rename job")]
+    client._complete = FakeLLM()
+    client._compute_analysis(tickets)
+
+    client._complete = fake = FakeLLM()
+    client._compute_analysis(tickets)
+    assert fake.map_calls == [] and fake.reduce_calls == 0
+
+
+def test_falls_back_when_no_ticket_can_be_assessed(client):
+    tickets = [_ticket("A-1", "Tidy docs", "P1"), _ticket("A-2", "Rename job")]
+    client._complete = FakeLLM(fail_map=True)
+
+    analysis = client._compute_analysis(tickets)
+    assert analysis.top_priority.key == "A-1"
+    assert analysis.summary.startswith("You have 2 tickets")
+
+
+def test_single_mode_sends_one_prompt(client):
+    client.analysis_mode = "single"
+    client._complete = fake = FakeLLM()
+    client._compute_analysis([_ticket("A-1", "Tidy docs"), _ticket("A-2", "Rename job")])
+    assert fake.map_calls == [] and fake.reduce_calls == 1
@@ -0,0 +1,158 @@
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import assistant
+from assistant import LLMClient, Ticket, WorkAssistant
+from cache import SQLiteCache
+from metrics import CACHE_EVICTIONS, CACHE_REQUESTS, MetricsRegistry, cache_summary, llm_summary
+from semantic_cache import SemanticCache
+from session_manager import SessionManager
+
+# The registry is process-wide, so each test uses its own model / namespace labels
+
+
+def test_prometheus_text_format(tmp_path):
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls", ("name",))
+    calls.inc(name='say "hi"\n')
+    calls.inc(2, name="plain")
+    latency = registry.histogram("latency_seconds", "Latency", ("call",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 3.0):
+        latency.observe(value, call="x")
+    registry.gauge("empty", "Never set")
+
+    text = registry.to_prometheus()
+    assert "# TYPE calls_total counter" in text
+    assert 'calls_total{name="say \\"hi\\"\\n"} 1' in text
+    assert 'calls_total{name="plain"} 2' in text
+    assert 'latency_seconds_bucket{call="x",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{call="x",le="1"} 2' in text
+    assert 'latency_seconds_bucket{call="x",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{call="x"} 3.55' in text
+    assert 'latency_seconds_count{call="x"} 3' in text
+    assert "empty" not in text
+
+    path = tmp_path / "metrics.prom"
+    registry.write_prometheus(str(path))
+    assert path.read_text() == text
+
+    with pytest.raises(ValueError):
+        registry.gauge("calls_total", "Calls", ("name",))
+    with pytest.raises(ValueError):
+        calls.inc(other="label")
+
+
+def test_histogram_quantiles_use_recent_observations():
+    registry = MetricsRegistry()
+    latency = registry.histogram("h", "h", ("call",))
+    for value in range(1, 101):
+        latency.observe(value / 100, call="x")
+    assert latency.quantile(0.5, ("x",)) == 0.5
+    assert latency.quantile(0.95, ("x",)) == 0.95
+    assert latency.quantile(0.5, ("missing",)) is None
+
+
+def _ticket(key):
+    now = datetime.now()
+    return Ticket(key=key, summary=f"Ticket {key}", description="Deploy is blocked", priority="P1", status="Open",
+                  assignee=None, created=now - timedelta(days=3), updated=now, comments_count=0, labels=[],
+                  issue_type="Task")
+
+
+@pytest.fixture
+def llm(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    monkeypatch.setenv("OLLAMA_MODEL", f"metrics-{tmp_path.name}")
+    return LLMClient()
+
+
+def _rows(llm):
+    return {row["call"]: row for row in llm_summary() if row["model"] == llm.model}
+
+
+def test_llm_calls_are_recorded_by_call_type(llm):
+    def fake_complete(prompt, on_token=None, schema=None):
+        time.sleep(0.01)
+        for word in ("Check ", "the ", "deploy ", "logs"):
+            on_token(word)
+        return "Check the deploy logs"
+
+    llm._complete = fake_complete
+    tokens = []
+    assert llm.suggest_action(_ticket("CPE-1"), on_token=tokens.append) == "Check the deploy logs"
+    assert "".join(tokens) == "Check the deploy logs"
+    # Served from the cache: no second LLM call
+    llm.suggest_action(_ticket("CPE-1"), on_token=tokens.append)
+
+    llm._complete = MagicMock(side_effect=RuntimeError("down"))
+    llm.draft_comment(_ticket("CPE-1"), "blocked", on_token=tokens.append)
+
+    rows = _rows(llm)
+    suggest = rows["suggest"]
+    assert (suggest["provider"], suggest["calls"], suggest["errors"]) == ("ollama", 1, 0)
+    assert suggest["p50_s"] >= 0.01 and suggest["first_token_p50_s"] <= suggest["p50_s"]
+    assert suggest["prompt_tokens"] > 50 and suggest["completion_tokens"] > 0
+    assert suggest["tokens_per_s_p50"] > 0
+    assert (rows["comment"]["calls"], rows["comment"]["errors"]) == (0, 1)
+
+
+def test_cache_hits_misses_and_evictions_per_namespace(tmp_path):
+    db = str(tmp_path / "cache.db")
+    prefix = tmp_path.name
+    hot = SQLiteCache(f"{prefix}-hot", filename=db, ttl=10)
+    cold = SQLiteCache(f"{prefix}-cold", filename=db, max_bytes=600)
+    hot.set("k", {"v": 1})
+    hot.get("k")
+    hot.get("absent")
+    with patch("cache.time.time", return_value=time.time() + 11):
+        assert hot.get("k") is None
+    for n in range(5):
+        cold.set(f"k{n}", {"text": "x" * 200})
+
+    assert CACHE_REQUESTS.value(namespace=f"{prefix}-hot", result="hit") == 1
+    assert CACHE_REQUESTS.value(namespace=f"{prefix}-hot", result="miss") == 2
+    assert CACHE_EVICTIONS.value(namespace=f"{prefix}-hot", reason="expired") == 1
+    assert CACHE_EVICTIONS.value(namespace=f"{prefix}-cold", reason="lru") == cold.evictions > 0
+
+    summary = {row["namespace"]: row for row in cache_summary()}
+    assert summary[f"{prefix}-hot"]["hit_ratio"] == pytest.approx(1 / 3)
+
+
+def test_semantic_cache_counts_one_lookup_per_call(tmp_path):
+    namespace = f"{tmp_path.name}-semantic"
+    cache = SemanticCache(namespace, filename=str(tmp_path / "cache.db"), threshold=0.5)
+    payload = {"key": "CPE-1", "priority": "P1", "status": "Open", "summary": "deploy blocked by failing tests",
+               "age_days": 3}
+    assert cache.lookup(payload) is None
+    cache.store(payload, {"answer": 1})
+    assert cache.lookup(payload).exact
+    assert not cache.lookup({**payload, "age_days": 4, "summary": "deploy blocked by failing tests again"}).exact
+
+    [row] = [row for row in cache_summary() if row["namespace"] == namespace]
+    assert (row["hits"], row["misses"], row["near_hits"]) == (2, 1, 1)
+
+
+def test_health_shows_metrics_and_writes_the_export(llm, tmp_path, monkeypatch):
+    monkeypatch.delenv("JIRA_BASE_URL", raising=False)
+    monkeypatch.setenv("METRICS_FILE", str(tmp_path / "metrics.prom"))
+    llm._complete = lambda prompt, on_token=None, schema=None: "URGENCY: 4\nREASON: blocked\nNEXT STEP: unblock"
+    llm._assess_ticket(_ticket("CPE-2"))
+    wa = WorkAssistant(jira_client=MagicMock(), llm_client=llm,
+                       session_manager=SessionManager(str(tmp_path / "s.json")))
+
+    monkeypatch.setattr(assistant.console, "width", 200)
+    with assistant.console.capture() as captured:
+        wa._handle_user_input("health")
+    output = captured.get()
+    assert "LLM calls this session" in output and "assess" in output
+    assert "Caches this session" in output
+
+    exported = (tmp_path / "metrics.prom").read_text()
+    assert f'llm_request_seconds_count{{provider="ollama",model="{llm.model}",call="assess"}} 1' in exported
+
+    wa._handle_user_input(f"metrics {tmp_path / 'other.prom'}")
+    assert (tmp_path / "other.prom").exists()
@@ -0,0 +1,105 @@
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from assistant import (CONTEXT_DEFAULT, CONTEXT_HELP, CONTEXT_PLAN, CONTEXT_RESEARCH, LLMClient, Ticket,
+                       WorkAssistant, WorkloadAnalysis)
+from prefetch import SuggestionPrefetcher
+from session_manager import SessionManager
+
+
+def test_concurrency_is_capped():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetch(ticket, context):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    prefetcher = SuggestionPrefetcher(fetch, max_workers=2)
+    prefetcher.start([(n, "") for n in range(8)])
+    prefetcher.join(timeout=5)
+    assert peak[0] == 2
+    assert prefetcher.completed == 8
+
+
+def test_cancel_drops_queued_jobs():
+    release = threading.Event()
+    calls = []
+
+    def fetch(ticket, context):
+        calls.append(ticket)
+        release.wait(5)
+
+    prefetcher = SuggestionPrefetcher(fetch, max_workers=1)
+    prefetcher.start([(n, "") for n in range(5)])
+    time.sleep(0.05)
+    prefetcher.cancel()
+    release.set()
+    prefetcher.join(timeout=5)
+    assert calls == [0]
+    assert not prefetcher.running
+
+
+def _ticket(key):
+    now = datetime.now()
+    return Ticket(key=key, summary=f"Ticket {key}", description="", priority="P2", status="Open", assignee=None,
+                  created=now, updated=now, comments_count=0, labels=[], issue_type="Task")
+
+
+@pytest.fixture
+def assistant(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    llm = LLMClient()
+    llm._complete = MagicMock(side_effect=lambda prompt, on_token=None: "suggestion")
+    wa = WorkAssistant(jira_client=MagicMock(), llm_client=llm,
+                       session_manager=SessionManager(str(tmp_path / "state.json")))
+    top, other = _ticket("A-1"), _ticket("A-2")
+    wa.current_analysis = WorkloadAnalysis(top, "", [], [], [other], "")
+    return wa
+
+
+def test_prefetch_warms_likely_picks_first(assistant):
+    seen = []
+    assistant.llm.suggest_action = lambda ticket, context: seen.append((ticket.key, context))
+    assistant.prefetch_workers = 1
+    assistant._start_prefetch()
+    assistant.prefetcher.join(timeout=5)
+    assert seen[:3] == [("A-1", CONTEXT_DEFAULT), ("A-1", CONTEXT_HELP), ("A-2", CONTEXT_DEFAULT)]
+    assert set(seen[3:]) == {(k, c) for k in ("A-1", "A-2") for c in (CONTEXT_RESEARCH, CONTEXT_PLAN)}
+
+
+def test_prefetched_suggestion_is_served_from_cache(assistant):
+    assistant._start_prefetch()
+    assistant.prefetcher.join(timeout=5)
+    calls = assistant.llm._complete.call_count
+    assert calls == 7
+
+    assistant.llm.suggest_action(assistant.current_analysis.top_priority, CONTEXT_DEFAULT)
+    assert assistant.llm._complete.call_count == calls
+
+
+def test_llm_outage_during_prefetch_is_not_cached(assistant):
+    assistant.llm._complete.side_effect = RuntimeError("LLM down")
+    assistant._start_prefetch()
+    assistant.prefetcher.join(timeout=5)
+    failed_calls = assistant.llm._complete.call_count
+    assert failed_calls == 7
+
+    assistant.llm._complete.side_effect = lambda prompt, on_token=None: "real suggestion"
+    top = assistant.current_analysis.top_priority
+    assert assistant.llm.suggest_action(top, CONTEXT_DEFAULT) == "real suggestion"
+    assert assistant.llm._complete.call_count == failed_calls + 1
+
+
+def test_disabled_prefetch_starts_nothing(assistant):
+    assistant.prefetch_workers = 0
+    assistant._start_prefetch()
+    assert assistant.prefetcher is None
@@ -0,0 +1,83 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from assistant import JiraClient, LLMClient, Ticket
+from benchmarks.synthetic import generate_issues
+from priority_engine import PriorityEngine
+
+PRIORITY_SCORES = {
+    'p0': -1, 'p1': 0, 'p1 - critical': 0, 'critical': 0, 'highest': 0,
+    'high': 1, 'p2': 2, 'medium': 3, 'p3': 4, 'low': 5,
+}
+
+
+def reference_score(ticket):
+    """The ranking key _fallback_analysis used before the engine existed."""
+    priority_score = PRIORITY_SCORES.get((ticket.priority or "").strip().lower(), 6)
+    keyword_boost = 0
+    for keyword in ['security', 'failure', 'critical', 'blocked', 'urgent', 'voc_feedback']:
+        if keyword in ticket.summary.lower() or keyword in ticket.description.lower():
+            keyword_boost -= 2
+            break
+    return (priority_score + keyword_boost, -ticket.stale_days, -ticket.age_days)
+
+
+def _ticket(key, priority="Medium", summary="", description="", stale=0, age=0):
+    now = datetime.now()
+    return Ticket(
+        key=key, summary=summary, description=description, priority=priority, status="Open",
+        assignee=None, created=now - timedelta(days=age), updated=now - timedelta(days=stale),
+        comments_count=0, labels=[], issue_type="Bug",
+    )
+
+
+def _random_tickets(count, seed=7):
+    rng = random.Random(seed)
+    priorities = ["P0", "p1", " Highest ", "High", "Medium", "P3", "Low", "Trivial", ""]
+    words = ["deploy", "Security", "FAILURE", "blocked", "docs", "voc_feedback", "cleanup", "Urgent"]
+    return [
+        _ticket(
+            f"T-{n}", rng.choice(priorities),
+            summary=" ".join(rng.sample(words, 2)) if rng.random() < 0.3 else "routine work",
+            description=rng.choice(words) if rng.random() < 0.2 else "",
+            stale=rng.randrange(60), age=rng.randrange(400),
+        )
+        for n in range(count)
+    ]
+
+
+def test_full_rank_matches_reference_sort():
+    tickets = _random_tickets(500)
+    assert PriorityEngine().rank(tickets) == sorted(tickets, key=reference_score)
+
+
+def test_top_k_matches_sorted_prefix_including_ties():
+    # Many identical scores: selection must keep input order just like sorted()
+    tickets = [_ticket(f"T-{n}", "High") for n in range(50)] + _random_tickets(200)
+    assert PriorityEngine().rank(tickets, limit=4) == sorted(tickets, key=reference_score)[:4]
+
+
+def test_keyword_boost_applies_once():
+    engine = PriorityEngine()
+    both = _ticket("B", "Low", summary="security failure", description="urgent and blocked")
+    one = _ticket("O", "Low", summary="security")
+    assert engine.scorer()(both)[0] == engine.scorer()(one)[0] == 3
+
+
+def test_fallback_analysis_uses_engine_ranking(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    tickets = _random_tickets(300, seed=11)
+    expected = sorted(tickets, key=reference_score)
+    analysis = LLMClient()._fallback_analysis(tickets)
+    assert analysis.top_priority is expected[0]
+    assert analysis.other_notable == expected[1:4]
+
+
+def test_ranks_large_queue_quickly():
+    client = JiraClient()
+    tickets = [client._parse_ticket(issue) for issue in generate_issues(20000, adf=True)]
+    start = time.perf_counter()
+    PriorityEngine().rank(tickets, limit=4)
+    # Generous bound for slow CI; ~100k tickets take a fraction of a second locally
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from assistant import LLMClient, Ticket
+from prompt_packer import PromptPacker, TokenEstimator, context_window
+
+
+def _rows(count):
+    return [
+        {
+            "key": f"OPS-{n}",
+            "summary": f"Investigate flaky deployment step number {n} on the staging cluster",
+            "priority": "P1" if n < 10 else "P3",
+            "status": "Open",
+            "age_days": n % 400,
+            "stale_days": n % 90,
+            "comments_count": n % 7,
+            "labels": ["deploy", "staging"],
+            "issue_type": "Bug",
+            "description": "The pipeline times out while waiting for the health check | retries do not help. " * 4,
+        }
+        for n in range(count)
+    ]
+
+
+def test_table_is_much_smaller_than_indented_json():
+    packer = PromptPacker("gpt-4", context_tokens=128000)
+    rows = _rows(50)
+    packed = packer.pack(rows)
+    assert len(packed.chunks) == 1 and not packed.omitted
+    assert packed.tokens < packer.count(json.dumps(rows, indent=2)) / 2
+    assert packed.chunks[0].splitlines()[0].startswith("key|priority|status")
+
+
+def test_large_queue_is_chunked_then_truncated_from_the_tail():
+    packer = PromptPacker("llama3.1", context_tokens=8192, max_chunks=3)
+    overhead = "instructions " * 200
+    packed = packer.pack(_rows(1000), overhead=overhead)
+
+    assert len(packed.chunks) == 3
+    for table in packed.chunks:
+        assert packer.count(table) <= packed.budget + packer.count(table.splitlines()[0]) + 1
+    kept = [k for keys in packed.chunk_keys for k in keys]
+    assert kept == [f"OPS-{n}" for n in range(len(kept))]
+    assert packed.omitted == [f"OPS-{n}" for n in range(len(kept), 1000)]
+    assert f"{len(packed.omitted)} lower-priority tickets omitted" in packed.report()
+
+
+def test_heuristic_estimate_without_tiktoken():
+    with patch("prompt_packer.tiktoken", None):
+        assert TokenEstimator("gpt-4").count("x" * 35) == 10
+
+
+def test_context_window_lookup(monkeypatch):
+    monkeypatch.delenv("LLM_CONTEXT_TOKENS", raising=False)
+    assert context_window("gpt-4o-mini") == 128000
+    assert context_window("gpt-4") == 8192
+    assert context_window("unknown-model") == 8192
+    monkeypatch.setenv("LLM_CONTEXT_TOKENS", "4096")
+    assert context_window("gpt-4o") == 4096
+
+
+def test_single_analysis_chunks_oversized_queue(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("LLM_CONTEXT_TOKENS", "8192")
+    monkeypatch.setenv("ANALYSIS_MODE", "single")
+    client = LLMClient()
+    now = datetime.now()
+    tickets = [
+        Ticket(key=r["key"], summary=r["summary"], description=r["description"], priority=r["priority"],
+               status=r["status"], assignee=None, created=now - timedelta(days=r["age_days"]), updated=now,
+               comments_count=r["comments_count"], labels=r["labels"], issue_type=r["issue_type"])
+        for r in _rows(1000)
+    ]
+    prompts = []
+
+    def fake_complete(prompt, on_token=None, schema=None):
+        prompts.append(prompt)
+        return "OPS-1 | P1 | Open | blocks deploys"
+
+    client._complete = fake_complete
+    analysis = client._compute_analysis(tickets)
+
+    pack = client.last_pack
+    assert len(pack.chunks) > 1
+    assert len(prompts) == len(pack.chunks) + 1
+    assert all(client.packer.count(p) <= 8192 for p in prompts)
+    assert "Shortlisted from" in prompts[-1]
+    assert analysis.top_priority.key == "OPS-1"
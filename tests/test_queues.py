@@ -0,0 +1,223 @@
+import json
+import random
+import re
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+
+import assistant
+import queues
+from assistant import JiraClient, LLMClient
+from batch_cli import EXIT_OK, EXIT_PARTIAL, EXIT_USAGE, cli
+from benchmarks.fake_servers import FakeJira, FakeOllama
+from benchmarks.synthetic import generate_issues, make_issue
+from queues import MultiQueue, QueueProfile, Site, load_profiles
+
+
+def _keys(*numbers):
+    return "key in ({})".format(", ".join(f"CPE-{n}" for n in numbers))
+
+
+def _assess(prompt, on_token=None, **kwargs):
+    if prompt.startswith("Assess"):
+        key = re.search(r"Ticket: (\S+)", prompt).group(1)
+        urgency = 5 if key == "CPE-7" else 2
+        return f"URGENCY: {urgency}\nREASON: {key} reason\nNEXT STEP: look at {key}"
+    return "Start with the most urgent ticket."
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    monkeypatch.setenv("JIRA_EMAIL", "stand-in@example.com")
+    monkeypatch.setenv("JIRA_API_TOKEN", "stand-in")
+    monkeypatch.setenv("PLATFORM_EMAIL", "platform@example.com")
+    monkeypatch.setenv("PLATFORM_TOKEN", "stand-in")
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    monkeypatch.setenv("ANALYSIS_MODE", "mapreduce")
+    monkeypatch.setenv("LLM_STREAM", "0")
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(assistant.console, "quiet", False)
+    return monkeypatch
+
+
+@pytest.fixture
+def sites(env):
+    # Both sites number their issues CPE-1.., with different content
+    other = [make_issue(random.Random(1), n) for n in range(1, 6)]
+    with FakeJira(list(generate_issues(12))) as main, FakeJira(other) as platform:
+        env.setenv("JIRA_BASE_URL", main.url)
+        yield main, platform
+
+
+def _profiles(platform):
+    site = Site("platform", platform.url, "PLATFORM_EMAIL", "PLATFORM_TOKEN", max_connections=2)
+    return [
+        QueueProfile("mine", Site("default"), _keys(1, 2, 3, 4, 5, 6)),
+        QueueProfile("backlog", Site("default"), _keys(4, 5, 6, 7, 8, 9)),
+        QueueProfile("oncall", site, _keys(1, 2)),
+    ]
+
+
+def _llm():
+    llm = LLMClient()
+    llm._complete = MagicMock(side_effect=_assess)
+    return llm
+
+
+def _prompts(llm, prefix):
+    return [c.args[0] for c in llm._complete.call_args_list if c.args[0].startswith(prefix)]
+
+
+def test_overlapping_issues_are_fetched_and_assessed_once(sites):
+    main, platform = sites
+    llm = _llm()
+    result = MultiQueue(_profiles(platform), llm=llm).run(analyze=False)
+
+    assert result.errors == {}
+    assert result.counts == {"mine": 6, "backlog": 6, "oncall": 2}
+    # One key search per queue, then one fetch of the distinct issues per site
+    assert main.stats()["requests"] == 3
+    assert platform.stats()["requests"] == 2
+    assert len(_prompts(llm, "Assess")) == 11
+    assert len(result.items) == 11
+
+    top = result.items[0]
+    assert (top.site, top.ticket.key, top.queues, top.assessment["urgency"]) == ("default", "CPE-7", ["backlog"], 5)
+    by_ident = {(item.site, item.ticket.key): item for item in result.items}
+    assert by_ident[("default", "CPE-4")].queues == ["mine", "backlog"]
+    # Same key on two sites stays two tickets
+    assert by_ident[("default", "CPE-1")].ticket.summary != by_ident[("platform", "CPE-1")].ticket.summary
+    assert by_ident[("platform", "CPE-1")].queues == ["oncall"]
+
+
+def test_queue_analyses_reuse_the_shared_assessments(sites):
+    _, platform = sites
+    llm = _llm()
+    MultiQueue(_profiles(platform), llm=llm).run(analyze=False)
+    assessed = len(_prompts(llm, "Assess"))
+
+    result = MultiQueue(_profiles(platform), llm=llm).run()
+    assert len(_prompts(llm, "Assess")) == assessed
+    assert set(result.analyses) == {"mine", "backlog", "oncall"}
+    assert result.analyses["backlog"].top_priority.key == "CPE-7"
+    assert len(_prompts(llm, "You are my intelligent work assistant")) == 3
+
+
+def test_a_failing_site_does_not_sink_the_others(sites, env):
+    _, platform = sites
+    env.delenv("PLATFORM_TOKEN")
+    result = MultiQueue(_profiles(platform), llm=_llm()).run(analyze=False)
+    assert set(result.errors) == {"oncall"}
+    assert "PLATFORM_TOKEN" in result.errors["oncall"]
+    # The default site's credentials are never sent to another host
+    assert platform.stats()["requests"] == 0
+    assert {item.site for item in result.items} == {"default"}
+
+
+def test_sites_are_assessed_concurrently(sites, env):
+    _, platform = sites
+    env.setenv("ANALYSIS_WORKERS", "1")  # one call at a time per site
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def slow_assess(prompt, on_token=None, **kwargs):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.05)
+        with lock:
+            in_flight["now"] -= 1
+        return _assess(prompt)
+
+    llm = LLMClient()
+    llm._complete = MagicMock(side_effect=slow_assess)
+    result = MultiQueue(_profiles(platform), llm=llm).run(analyze=False)
+    assert result.errors == {}
+    assert in_flight["max"] == 2
+
+
+def test_failures_only_fail_the_queues_they_touch(sites, env):
+    main, platform = sites
+    env.setattr(queues, "KEY_CHUNK", 3)
+    fetch = JiraClient.get_tickets_by_key
+
+    def flaky_fetch(client, keys):
+        if client.base_url == main.url and "CPE-8" in keys:
+            raise RuntimeError("chunk lost")
+        return fetch(client, keys)
+
+    env.setattr(JiraClient, "get_tickets_by_key", flaky_fetch)
+    result = MultiQueue(_profiles(platform), llm=_llm()).run(analyze=False)
+    # Chunks are CPE-1..3, 4..6 and 7..9: only 'backlog' needed the lost one
+    assert set(result.errors) == {"backlog"} and "chunk lost" in result.errors["backlog"]
+    assert result.counts == {"mine": 6, "oncall": 2}
+
+    env.setattr(JiraClient, "get_tickets_by_key", fetch)
+    multi = MultiQueue(_profiles(platform), llm=_llm())
+    assess = multi._assess_site
+
+    def failing_assess(site, tickets):
+        if site == "platform":
+            raise RuntimeError("assessments unavailable")
+        return assess(site, tickets)
+
+    multi._assess_site = failing_assess
+    result = multi.run(analyze=False)
+    assert set(result.errors) == {"oncall"}
+    assert {item.site for item in result.items} == {"default"} and len(result.items) == 9
+
+
+def test_load_profiles(tmp_path, env):
+    path = tmp_path / "queues.json"
+    [mine] = load_profiles(str(path))
+    assert (mine.name, mine.site.name) == ("mine", "default")
+
+    path.write_text(json.dumps({
+        "sites": {"platform": {"url": "https://platform.example/", "token_env": "PLATFORM_TOKEN"}},
+        "queues": {"mine": "assignee = currentUser()", "oncall": {"site": "platform", "jql": "labels = oncall"}},
+    }))
+    mine, oncall = load_profiles(str(path))
+    assert (mine.site.name, mine.jql) == ("default", "assignee = currentUser()")
+    assert (oncall.site.url, oncall.site.token_env, oncall.site.email_env) == (
+        "https://platform.example", "PLATFORM_TOKEN", "JIRA_EMAIL")
+
+    for bad in (
+        {"queues": {}},
+        {"queues": {"x": {"site": "nowhere", "jql": "a"}}},
+        {"queues": {"x": {"jql": "a", "order": 1}}},
+        {"sites": {"s": {"url": "https://s.example", "api_token": "secret"}}, "queues": {"x": "a"}},
+    ):
+        path.write_text(json.dumps(bad))
+        with pytest.raises(ValueError):
+            load_profiles(str(path))
+
+
+def test_queues_command(sites, env, tmp_path):
+    main, platform = sites
+    path = tmp_path / "queues.json"
+    path.write_text(json.dumps({
+        "sites": {"platform": {"url": platform.url, "email_env": "PLATFORM_EMAIL", "token_env": "PLATFORM_TOKEN"}},
+        "queues": {"mine": _keys(1, 2, 3), "backlog": _keys(3, 4), "oncall": {"site": "platform", "jql": _keys(1)}},
+    }))
+    env.setenv("QUEUES_FILE", str(path))
+    with FakeOllama() as ollama:
+        env.setenv("OLLAMA_HOST", ollama.url)
+        result = CliRunner().invoke(cli, ["queues", "--json"], catch_exceptions=False)
+        assert result.exit_code == EXIT_OK, result.stderr
+        records = json.loads(result.stdout)
+        assert [r["rank"] for r in records] == [1, 2, 3, 4, 5]
+        assert {(r["site"], r["key"]) for r in records if r["queues"] == ["mine", "backlog"]} == {("default", "CPE-3")}
+
+        result = CliRunner().invoke(cli, ["queues", "--only", "oncall", "--by-queue"], catch_exceptions=False)
+        [record] = [json.loads(line) for line in result.stdout.splitlines()]
+        assert (record["queue"], record["site"], record["tickets"]) == ("oncall", "platform", 1)
+
+        assert CliRunner().invoke(cli, ["queues", "--only", "nope"]).exit_code == EXIT_USAGE
+        env.delenv("PLATFORM_TOKEN")
+        result = CliRunner().invoke(cli, ["queues"], catch_exceptions=False)
+        assert result.exit_code == EXIT_PARTIAL
+        assert "oncall" in result.stderr and len(result.stdout.splitlines()) == 4
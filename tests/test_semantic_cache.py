@@ -0,0 +1,118 @@
+import threading
+import time
+
+from semantic_cache import SemanticCache
+
+
+def _tickets(**overrides):
+    tickets = [
+        {
+            "key": "OPS-1",
+            "summary": "Nightly backup job fails on the reporting cluster",
+            "priority": "P1",
+            "status": "In Progress",
+            "age_days": 12,
+            "stale_days": 3,
+            "labels": ["backup"],
+            "description": "The nightly backup for the reporting cluster exits with code 137 "
+                           "after the snapshot step. Logs point at memory pressure on the "
+                           "storage node while compressing the archive, and retries do not help.",
+        },
+        {
+            "key": "OPS-2",
+            "summary": "Rotate TLS certificates for the internal API gateway",
+            "priority": "P3",
+            "status": "Open",
+            "age_days": 40,
+            "stale_days": 20,
+            "labels": [],
+            "description": "Certificates expire next quarter; schedule the rotation with the platform team.",
+        },
+    ]
+    tickets[0].update(overrides)
+    return tickets
+
+
+def _cache(tmp_path, **kwargs):
+    return SemanticCache("semantic", filename=str(tmp_path / "cache.db"), **kwargs)
+
+
+def test_volatile_fields_give_exact_hit(tmp_path):
+    cache = _cache(tmp_path)
+    cache.store(_tickets(), {"analysis_text": "focus on OPS-1"})
+
+    hit = cache.lookup(_tickets(age_days=13, stale_days=4))
+    assert hit is not None and hit.exact
+    assert hit.value == {"analysis_text": "focus on OPS-1"}
+    assert hit.ignored_fields == ["age_days", "stale_days"]
+
+
+def test_small_wording_change_is_near_hit(tmp_path):
+    cache = _cache(tmp_path, threshold=0.8)
+    cache.store(_tickets(), {"analysis_text": "focus on OPS-1"})
+
+    edited = _tickets(description=_tickets()[0]["description"].replace("do not help", "don't help"))
+    hit = cache.lookup(edited)
+    assert hit is not None and not hit.exact
+    assert 0.8 <= hit.similarity < 1.0
+
+
+def test_anchor_changes_always_miss(tmp_path):
+    cache = _cache(tmp_path, threshold=0.5)
+    cache.store(_tickets(), {"analysis_text": "focus on OPS-1"})
+
+    assert cache.lookup(_tickets(priority="P2")) is None
+    assert cache.lookup(_tickets(status="Done")) is None
+    assert cache.lookup(_tickets()[:1]) is None
+    swapped = _tickets(priority="P3")
+    swapped[1]["priority"] = "P1"
+    assert cache.lookup(swapped) is None
+
+
+def test_stats_track_hit_and_false_hit_rates(tmp_path):
+    cache = _cache(tmp_path, threshold=0.8)
+    cache.store(_tickets(), {"analysis_text": "a"})
+    cache.lookup(_tickets(age_days=99))
+    cache.lookup(_tickets(description=_tickets()[0]["description"] + " Still failing."))
+    cache.lookup(_tickets(priority="P4"))
+    cache.report_false_hit()
+
+    stats = cache.stats()
+    assert stats["lookups"] == 3
+    assert stats["exact_hits"] == 1 and stats["near_hits"] == 1
+    assert stats["hit_rate"] == 2 / 3
+    assert stats["false_hit_rate"] == 1.0
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    _cache(tmp_path, threshold=0.8).store(_tickets(), {"analysis_text": "a"})
+    edited = _tickets(summary="Nightly backup job fails on reporting cluster")
+    assert _cache(tmp_path, threshold=0.8).lookup(edited) is not None
+
+
+def test_counters_are_exact_under_concurrent_lookups(tmp_path):
+    cache = _cache(tmp_path)
+    cache.store(_tickets(), {"analysis_text": "a"})
+    threads = [threading.Thread(target=lambda: [cache.lookup(_tickets()) for _ in range(50)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats["lookups"] == stats["exact_hits"] == 400
+
+
+def test_expired_entries_leave_the_index(tmp_path):
+    cache = _cache(tmp_path, threshold=0.8, ttl=0.01)
+    cache.store(_tickets(), {"analysis_text": "a"})
+    time.sleep(0.02)
+    assert cache.lookup(_tickets(summary="Nightly backup job fails on reporting cluster")) is None
+    assert cache._bands == {} and cache._index == {}
+
+    # Entries nobody looks up again are dropped when the index is rebuilt from live ones
+    for n in range(600):
+        cache.store(_tickets(key=f"OPS-{n + 10}"), {"analysis_text": str(n)})
+        if n % 100 == 99:
+            time.sleep(0.02)
+    assert len(cache._bands) <= 256
+    assert set().union(*cache._index.values()) == set(cache._bands)
@@ -0,0 +1,99 @@
+import json
+import os
+from datetime import datetime
+
+from session_manager import SessionManager
+
+
+def test_mutations_append_to_journal_not_snapshot(tmp_path):
+    state_file = tmp_path / "state.json"
+    sm = SessionManager(str(state_file))
+    sm.save()
+    snapshot = state_file.read_bytes()
+
+    sm.add_message("list")
+    sm.set_current_focus("ABC-1")
+    sm.add_ticket_note("ABC-1", "Investigating")
+
+    assert state_file.read_bytes() == snapshot
+    lines = (tmp_path / "state.json.journal").read_text().splitlines()
+    assert [json.loads(line)["op"] for line in lines] == ["message", "set", "note"]
+
+
+def test_reload_replays_journal_and_ignores_torn_line(tmp_path):
+    state_file = tmp_path / "state.json"
+    sm = SessionManager(str(state_file))
+    sm.add_message("first")
+    sm.set_current_focus("ABC-1")
+    with open(tmp_path / "state.json.journal", "a", encoding="utf-8") as f:
+        f.write('{"op":"message","text":"half')
+
+    reloaded = SessionManager(str(state_file))
+    assert reloaded.data["conversation_history"] == ["first"]
+    assert reloaded.get_current_focus() == "ABC-1"
+
+
+def test_entries_recorded_after_a_torn_line_survive_reload(tmp_path):
+    state_file = tmp_path / "state.json"
+    sm = SessionManager(str(state_file))
+    sm.add_message("a")
+    sm.add_message("b")
+    with open(tmp_path / "state.json.journal", "a", encoding="utf-8") as f:
+        f.write('{"op":"message","text":"half')
+
+    after_crash = SessionManager(str(state_file))
+    after_crash.add_message("c")
+    after_crash.add_message("d")
+
+    reloaded = SessionManager(str(state_file))
+    assert reloaded.data["conversation_history"] == ["a", "b", "c", "d"]
+    seqs = [json.loads(line)["seq"] for line in (tmp_path / "state.json.journal").read_text().splitlines()]
+    assert seqs == [1, 2, 3, 4]
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    state_file = tmp_path / "state.json"
+    sm = SessionManager(str(state_file), compact_every=3)
+    for n in range(3):
+        sm.add_message(f"m{n}")
+
+    assert (tmp_path / "state.json.journal").read_text() == ""
+    assert json.loads(state_file.read_text())["conversation_history"] == ["m0", "m1", "m2"]
+
+
+def test_replay_skips_entries_already_in_snapshot(tmp_path):
+    state_file = tmp_path / "state.json"
+    sm = SessionManager(str(state_file))
+    sm.add_message("once")
+    journal = (tmp_path / "state.json.journal").read_text()
+    sm.save()
+    # Simulate a crash after the snapshot was written but before the journal was truncated
+    (tmp_path / "state.json.journal").write_text(journal)
+
+    assert SessionManager(str(state_file)).data["conversation_history"] == ["once"]
+
+
+def test_history_is_bounded_and_rotated(tmp_path):
+    state_file = tmp_path / "state.json"
+    sm = SessionManager(str(state_file), max_history=2)
+    for n in range(5):
+        sm.add_message(f"m{n}")
+    sm.save()
+
+    assert sm.data["conversation_history"] == ["m3", "m4"]
+    archived = (tmp_path / "state.json.history").read_text().splitlines()
+    assert [json.loads(line) for line in archived] == ["m0", "m1", "m2"]
+
+
+def test_merge_is_journaled_and_replayed(tmp_path):
+    state_file = tmp_path / "state.json"
+    sm = SessionManager(str(state_file))
+    sm.update_session([{"key": "A-1", "summary": "a", "updated": 1}, {"key": "A-2", "summary": "b", "updated": 1}])
+    size = os.path.getsize(state_file)
+
+    sm.merge_tickets([{"key": "A-2", "summary": "edited", "updated": 2}], ["A-2"])
+
+    assert os.path.getsize(state_file) == size
+    reloaded = SessionManager(str(state_file))
+    assert reloaded.get_tickets() == [{"key": "A-2", "summary": "edited", "updated": 2}]
+    assert reloaded.last_scan.date() == datetime.now().date()
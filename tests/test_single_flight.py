@@ -0,0 +1,139 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from assistant import JiraClient, LLMClient, Ticket, WorkAssistant
+from benchmarks.fake_servers import Faults, FakeJira
+from benchmarks.synthetic import generate_issues
+from metrics import SINGLE_FLIGHT
+from session_manager import SessionManager
+from single_flight import SingleFlight, get_flight, request_key
+
+
+def _wait_for_shared(group, before, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while SINGLE_FLIGHT.value(group=group, result="shared") <= before:
+        assert time.monotonic() < deadline, "second caller never joined the call in flight"
+        time.sleep(0.005)
+
+
+def _in_threads(count, fn):
+    results = [None] * count
+
+    def run(n):
+        results[n] = fn()
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test-share")
+    release = threading.Event()
+    fn = MagicMock(side_effect=lambda: release.wait(5) and "answer")
+
+    threads, results = _in_threads(4, lambda: flight.do("k", fn))
+    _wait_for_shared("test-share", 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert fn.call_count == 1
+    assert sorted(results) == [("answer", False)] + [("answer", True)] * 3
+    assert SINGLE_FLIGHT.value(group="test-share", result="leader") == 1
+    assert flight.in_flight() == 0
+    # Not a cache: the next call runs again
+    assert flight.do("k", lambda: "fresh") == ("fresh", False)
+
+
+def test_errors_reach_every_waiting_caller():
+    flight = SingleFlight("test-errors")
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", fail)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads, _ = _in_threads(2, call)
+    _wait_for_shared("test-errors", 0)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert errors == ["upstream down"] * 2
+    assert flight.in_flight() == 0
+
+
+def test_request_key_normalizes_param_order():
+    assert request_key("u", "/search", {"a": 1, "b": 2}) == request_key("u", "/search", {"b": 2, "a": 1})
+    assert request_key("u", "/search", {"a": 1}) != request_key("other", "/search", {"a": 1})
+
+
+def _ticket(key="CPE-1"):
+    now = datetime.now()
+    return Ticket(key=key, summary="Login fails", description="", priority="P1", status="Open", assignee=None,
+                  created=now - timedelta(days=3), updated=now, comments_count=0, labels=[], issue_type="Bug")
+
+
+def test_duplicate_suggestions_in_flight_call_the_llm_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    llm = LLMClient()
+    release = threading.Event()
+    llm._complete = MagicMock(side_effect=lambda prompt, *args, **kwargs: release.wait(5) and "Reproduce it first.")
+    before = SINGLE_FLIGHT.value(group="llm", result="shared")
+    streamed = []
+
+    threads, results = _in_threads(1, lambda: llm.suggest_action(_ticket(), "research"))
+    while get_flight("llm").in_flight() == 0:
+        time.sleep(0.005)
+    follower, follower_result = _in_threads(1, lambda: llm.suggest_action(_ticket(), "research",
+                                                                          on_token=streamed.append))
+    _wait_for_shared("llm", before)
+    release.set()
+    for thread in threads + follower:
+        thread.join()
+
+    assert llm._complete.call_count == 1
+    assert results == follower_result == ["Reproduce it first."]
+    assert streamed == ["Reproduce it first."]
+
+
+def test_identical_jira_searches_in_flight_fetch_once(monkeypatch):
+    monkeypatch.setenv("JIRA_EMAIL", "stand-in@example.com")
+    monkeypatch.setenv("JIRA_API_TOKEN", "stand-in")
+    with FakeJira(list(generate_issues(5)), faults=Faults(latency=0.3)) as jira:
+        client = JiraClient(jira.url)
+        barrier = threading.Barrier(3)
+
+        def search():
+            barrier.wait()
+            return client.search_tickets()
+
+        threads, results = _in_threads(3, search)
+        for thread in threads:
+            thread.join()
+        assert jira.stats()["requests"] == 1
+        assert [[t.key for t in tickets] for tickets in results] == [[f"CPE-{n}" for n in range(1, 6)]] * 3
+
+
+def test_refresh_clears_the_analysis_cache_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    llm = MagicMock()
+    wa = WorkAssistant(jira_client=MagicMock(), llm_client=llm,
+                       session_manager=SessionManager(str(tmp_path / "session.json")))
+    wa._sync_tickets = MagicMock(return_value=[_ticket()])
+    wa._run_analysis = MagicMock()
+    wa.current_analysis = MagicMock(summary="Start with CPE-1")
+    wa._refresh_analysis()
+    llm.clear_cache.assert_called_once()
+    wa._run_analysis.assert_called_once()
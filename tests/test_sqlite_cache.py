@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+from cache import SQLiteCache
+
+
+def test_namespaces_are_isolated(tmp_path):
+    db = str(tmp_path / "cache.db")
+    a = SQLiteCache("a", filename=db)
+    b = SQLiteCache("b", filename=db)
+    a.set("k", {"v": 1})
+    b.set("k", {"v": 2})
+    a.clear()
+    assert a.get("k") is None
+    assert b.get("k") == {"v": 2}
+
+
+def test_ttl_expires_entries(tmp_path):
+    cache = SQLiteCache("ns", filename=str(tmp_path / "cache.db"), ttl=10)
+    cache.set("k", {"v": 1})
+    assert cache.get("k") == {"v": 1}
+    with patch("cache.time.time", return_value=time.time() + 11):
+        assert cache.get("k") is None
+    assert cache.total_bytes() == 0
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache("ns", filename=str(tmp_path / "cache.db"), max_bytes=1000)
+    cache.TOUCH_INTERVAL = 0
+    payload = {"text": "x" * 200}
+    cache.set("old", payload)
+    cache.set("hot", payload)
+    time.sleep(0.01)
+    cache.get("old")  # now more recently used than "hot"
+    for n in range(3):
+        cache.set(f"new{n}", payload)
+
+    assert cache.total_bytes() <= 1000
+    assert cache.get("hot") is None
+    assert cache.get("old") == payload
+    assert cache.evictions >= 1
+
+
+def test_usage_tracks_overwrites(tmp_path):
+    cache = SQLiteCache("ns", filename=str(tmp_path / "cache.db"))
+    cache.set("k", {"text": "x" * 100})
+    big = cache.total_bytes()
+    cache.set("k", {"text": "x"})
+    assert cache.total_bytes() < big
+    cache.delete("k")
+    assert cache.total_bytes() == 0
+
+
+def test_concurrent_writers(tmp_path):
+    db = str(tmp_path / "cache.db")
+
+    def write(worker: int) -> None:
+        cache = SQLiteCache("ns", filename=db)
+        for n in range(50):
+            cache.set(f"{worker}:{n}", {"n": n})
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(dict(SQLiteCache("ns", filename=db).items())) == 200
+
+
+def test_recreated_file_does_not_reuse_stale_connection(tmp_path):
+    db = tmp_path / "cache.db"
+    cache = SQLiteCache("ns", filename=str(db))
+    cache.set("k", {"v": 1})
+    for path in tmp_path.iterdir():
+        path.unlink()
+    assert SQLiteCache("ns", filename=str(db)).get("k") is None
+
+
+def test_legacy_json_cache_file_is_left_alone(tmp_path, monkeypatch):
+    legacy = tmp_path / "legacy_cache.json"
+    legacy.write_text(json.dumps({"T1:ctx": {"suggestion": "old", "timestamp": "2024-01-01T00:00:00"}}))
+    monkeypatch.setenv("CACHE_FILE", str(legacy))
+    monkeypatch.delenv("CACHE_DB", raising=False)
+    monkeypatch.delenv("CACHE_BACKEND", raising=False)
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    monkeypatch.chdir(tmp_path)
+
+    from assistant import LLMClient
+    client = LLMClient()
+    client.cache.set("k", {"v": 1})
+    assert client.cache.get("k") == {"v": 1}
+    assert client.cache.filename == ".cache.db"
+    assert json.loads(legacy.read_text())["T1:ctx"]["suggestion"] == "old"
@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from assistant import LLMClient, Ticket
+from streaming import ThinkFilter, strip_think
+
+
+def _feed_all(chunks):
+    think = ThinkFilter()
+    return "".join(think.feed(c) for c in chunks) + think.flush()
+
+
+def test_think_filter_hides_reasoning_split_across_chunks():
+    chunks = ["Hel", "lo <th", "ink>secret", " plan</thi", "nk> world", " <", "b>"]
+    assert _feed_all(chunks) == "Hello  world <b>"
+
+
+def test_think_filter_emits_text_before_tag_completes():
+    think = ThinkFilter()
+    assert think.feed("Answer: <t") == "Answer: "
+    assert think.feed("able>") == "<table>"
+
+
+def test_unclosed_think_block_stays_hidden():
+    assert _feed_all(["ok <think>still reasoning"]) == "ok "
+    assert strip_think("<think>a</think>\n\nDone") == "Done"
+
+
+def _ticket():
+    now = datetime.now()
+    return Ticket(key="T-1", summary="Fix login", description="", priority="P2", status="Open", assignee=None,
+                  created=now, updated=now, comments_count=0, labels=[], issue_type="Bug")
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    return LLMClient()
+
+
+def test_openai_streams_tokens_and_caches_full_text(client):
+    client.provider = "openai"
+    tokens = []
+    stream = iter([_chunk("<think>hm</think>"), _chunk("Step "), _chunk(None), _chunk("one")])
+    with patch("assistant.openai.chat.completions.create", return_value=stream) as create:
+        text = client.suggest_action(_ticket(), on_token=tokens.append)
+    assert create.call_args.kwargs["stream"] is True
+    assert tokens == ["<think>hm</think>", "Step ", "one"]
+    assert text == "<think>hm</think>Step one"
+
+    with patch("assistant.openai.chat.completions.create") as create:
+        assert client.suggest_action(_ticket()) == text
+    create.assert_not_called()
+
+
+def test_ollama_streams_json_lines(client):
+    client.provider = "ollama"
+    client.ollama_host = "http://ollama"
+    lines = [json.dumps({"response": r, "done": d}).encode() for r, d in (("Draft", False), (" ready", False), ("", True))]
+    response = MagicMock()
+    response.iter_lines.return_value = lines
+    tokens = []
+    with patch.object(client.http, "post", return_value=response) as post:
+        text = client._complete("prompt", on_token=tokens.append)
+    assert post.call_args.kwargs["stream"] is True
+    assert post.call_args.kwargs["json"]["stream"] is True
+    assert tokens == ["Draft", " ready"]
+    assert text == "Draft ready"
+    response.close.assert_called_once()
+
+
+def test_draft_comment_goes_through_client(client):
+    client._complete = MagicMock(return_value="<think>x</think>Progress update")
+    assert client.draft_comment(_ticket(), "status update") == "Progress update"
+    client._complete = MagicMock(side_effect=RuntimeError("down"))
+    assert client.draft_comment(_ticket(), "status update").startswith("Status update: Working on Fix login")
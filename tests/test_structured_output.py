@@ -0,0 +1,121 @@
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from assistant import LLMClient, Ticket
+from structured_output import ANALYSIS_SCHEMA, StructuredOutputError, extract_json, parse_structured, validate
+
+
+def _ticket(key, summary="", priority="P3"):
+    now = datetime.now()
+    return Ticket(
+        key=key, summary=summary, description="", priority=priority, status="Open", assignee=None,
+        created=now - timedelta(days=3), updated=now, comments_count=0, labels=[], issue_type="Task",
+    )
+
+
+def _reply(**overrides):
+    data = {
+        "top_key": "A-2", "reasoning": "Blocks the release.", "next_steps": ["Rerun the job"],
+        "can_help_with": ["Draft an update"], "notable_keys": ["A-3", "A-9", "A-2"], "summary": "Start with A-2.",
+    }
+    data.update(overrides)
+    return json.dumps(data)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("ANALYSIS_MODE", "single")
+    monkeypatch.setenv("ANALYSIS_FORMAT", "json")
+    return LLMClient()
+
+
+TICKETS = [_ticket("A-1"), _ticket("A-2"), _ticket("A-3")]
+
+
+def test_extract_json_repairs_common_slips():
+    assert extract_json('<think>hmm</think>```json\n{"a": [1, 2,],}\n```') == {"a": [1, 2]}
+    assert extract_json('Sure! Here it is: {"a": "b"} Hope that helps.') == {"a": "b"}
+    assert extract_json('{"a": ["x", "y') == {"a": ["x", "y"]}
+    with pytest.raises(StructuredOutputError) as err:
+        extract_json("Focus on A-1 today.")
+    assert err.value.found_json is False
+
+
+def test_validate_reports_missing_and_mistyped_fields():
+    errors = validate({"top_key": 3, "next_steps": ["ok", 1]}, ANALYSIS_SCHEMA)
+    assert "$.top_key should be string, got int" in errors
+    assert "$.next_steps[1] should be string, got int" in errors
+    assert "$.summary is missing" in errors
+    assert parse_structured(_reply(extra="dropped"), ANALYSIS_SCHEMA).get("extra") is None
+
+
+def test_structured_reply_fills_the_analysis(client):
+    calls = []
+
+    def fake_complete(prompt, on_token=None, schema=None):
+        calls.append(schema)
+        return _reply()
+
+    client._complete = fake_complete
+    analysis = client._compute_analysis(TICKETS)
+    assert calls == [ANALYSIS_SCHEMA]
+    assert analysis.top_priority.key == "A-2"
+    assert analysis.next_steps == ["Rerun the job"]
+    assert analysis.can_help_with == ["Draft an update"]
+    assert [t.key for t in analysis.other_notable] == ["A-3"]
+    assert analysis.summary == "Start with A-2."
+
+    # Served from the cache with the structured fields intact
+    client._complete = None
+    again = client._compute_analysis(TICKETS)
+    assert again.top_priority.key == "A-2" and again.next_steps == ["Rerun the job"]
+
+
+def test_invalid_reply_is_repaired_with_one_follow_up(client):
+    replies = iter([_reply(top_key="NOPE-1"), _reply(top_key="a-3")])
+    prompts = []
+
+    def fake_complete(prompt, on_token=None, schema=None):
+        prompts.append(prompt)
+        return next(replies)
+
+    client._complete = fake_complete
+    analysis = client._compute_analysis(TICKETS)
+    assert len(prompts) == 2
+    assert "NOPE-1" in prompts[1] and "A-1" in prompts[1]
+    assert analysis.top_priority.key == "A-3"
+
+
+def test_prose_reply_falls_back_to_text_parsing(client):
+    prompts = []
+
+    def fake_complete(prompt, on_token=None, schema=None):
+        prompts.append(prompt)
+        return "Let's look at A-3 first, then A-1."
+
+    client._complete = fake_complete
+    analysis = client._compute_analysis(TICKETS)
+    assert len(prompts) == 1
+    assert analysis.top_priority.key == "A-3"
+    assert [t.key for t in analysis.other_notable] == ["A-1"]
+
+
+def test_recommended_ticket_is_first_mention_not_list_order(client):
+    tickets = [_ticket("CPE-31"), _ticket("CPE-3117")]
+    text = "Start with CPE-3117, it blocks CPE-31."
+    assert client._extract_recommended_ticket(text, tickets).key == "CPE-3117"
+
+
+def test_openai_request_uses_response_format(client):
+    client.provider = "openai"
+    response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=_reply()))])
+    with patch("assistant.openai.chat.completions.create", return_value=response) as create:
+        assert client._complete("prompt", on_token=print, schema=ANALYSIS_SCHEMA) == _reply()
+    kwargs = create.call_args.kwargs
+    assert kwargs["response_format"]["json_schema"]["schema"] is ANALYSIS_SCHEMA
+    assert "stream" not in kwargs
@@ -1,20 +1,18 @@
 import os
 import json
+import tempfile
 import unittest
 from datetime import datetime, timedelta
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from assistant import LLMClient, Ticket
 
 class SuggestionCacheTests(unittest.TestCase):
     def setUp(self):
-        os.environ["CACHE_FILE"] = "test_cache.json"
+        self.tmp = tempfile.TemporaryDirectory()
+        os.environ["CACHE_DB"] = os.path.join(self.tmp.name, "cache.db")
         os.environ["LLM_PROVIDER"] = "openai"
-        try:
-            os.remove("test_cache.json")
-        except FileNotFoundError:
-            pass
         self.client = LLMClient()
         now = datetime.now()
         self.ticket = Ticket(
@@ -33,10 +31,9 @@ class SuggestionCacheTests(unittest.TestCase):
         )
 
     def tearDown(self):
-        if os.path.exists("test_cache.json"):
-            os.remove("test_cache.json")
-        del os.environ["CACHE_FILE"]
+        del os.environ["CACHE_DB"]
         del os.environ["LLM_PROVIDER"]
+        self.tmp.cleanup()
 
     def _mock_resp(self, text: str):
         return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
@@ -71,5 +68,23 @@ class SuggestionCacheTests(unittest.TestCase):
             self.assertEqual(second, "second")
             self.assertEqual(mock_create.call_count, 2)
 
+def test_different_contexts_never_share_an_answer(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    client = LLMClient()
+    client._complete = MagicMock(side_effect=lambda prompt, *args, **kwargs: f"answer {client._complete.call_count}")
+    now = datetime.now()
+    # A long description keeps the one-word context change far above the similarity threshold
+    description = " ".join(f"step{n % 40} of the failing export pipeline" for n in range(50))
+    ticket = Ticket(key="T1", summary="Export fails", description=description, priority="P1", status="Open",
+                    assignee=None, created=now, updated=now, comments_count=0, labels=[], issue_type="Bug")
+
+    contexts = ["research", "plan", "help", "What should I do next?"]
+    answers = [client.suggest_action(ticket, context) for context in contexts]
+    assert client._complete.call_count == len(contexts)
+    assert len(set(answers)) == len(contexts)
+    assert client.suggest_action(ticket, "plan") == answers[1]
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from assistant import Ticket
+from session_manager import SessionManager
+
+
+def _make(key: str, status: str = "In Progress", raw=None) -> Ticket:
+    return Ticket(
+        key=key,
+        summary="s",
+        description="d",
+        priority="P2",
+        status="".join(status),  # a fresh, non-interned copy
+        assignee=None,
+        created=datetime(2024, 1, 1, 9, 30),
+        updated=datetime(2024, 2, 1, 10, 45),
+        comments_count=1,
+        labels=["VOC_Feedback"],
+        issue_type="Bug",
+        raw_data=raw,
+    )
+
+
+class TicketModelTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmp.name, "session.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_slotted_and_interned(self):
+        a, b = _make("A"), _make("B", status="In Pro" + "gress")
+        self.assertFalse(hasattr(a, "__dict__"))
+        self.assertIs(a.status, b.status)
+        self.assertIs(a.labels[0], b.labels[0])
+
+    def test_timestamps_round_trip_as_epoch(self):
+        ticket = _make("A")
+        self.assertIsInstance(ticket.created_ts, int)
+        self.assertEqual(ticket.created, datetime(2024, 1, 1, 9, 30))
+        self.assertEqual(Ticket.from_dict(ticket.to_dict()), ticket)
+
+    def test_from_dict_accepts_iso_strings(self):
+        data = _make("A").to_dict()
+        data["updated"] = "2024-02-01T10:45:00"
+        self.assertEqual(Ticket.from_dict(data).updated, datetime(2024, 2, 1, 10, 45))
+
+    def test_raw_payload_stored_once_by_content(self):
+        sm = SessionManager(self.state_file)
+        raw = {"key": "A", "fields": {"summary": "s"}}
+        sm.data["tickets"] = [sm._serialize_ticket(_make("A", raw=raw)), sm._serialize_ticket(_make("B", raw=dict(raw)))]
+        self.assertEqual(len(sm.data["raw_store"]), 1)
+        self.assertNotIn("raw_data", sm.data["tickets"][0])
+        self.assertEqual(sm.resolve_raw(sm.data["tickets"][1])["raw_data"], raw)
+
+    def test_tickets_without_raw_store_nothing(self):
+        sm = SessionManager(self.state_file)
+        data = sm._serialize_ticket(_make("A"))
+        self.assertNotIn("raw_ref", data)
+        self.assertFalse(sm.data.get("raw_store"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import random
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from assistant import Ticket, WorkAssistant
+from session_manager import SessionManager
+from ticket_store import QueryError, TicketStore, parse_query
+
+NOW = 1_750_000_000
+DAY = 86400
+
+
+def _ticket(key, status="Open", priority="Medium", labels=(), stale=0, age=0, comments=0,
+            summary="", issue_type="Bug", now=NOW):
+    return Ticket(
+        key=key, summary=summary, description="", priority=priority, status=status, assignee=None,
+        created=now - age * DAY, updated=now - stale * DAY, comments_count=comments,
+        labels=list(labels), issue_type=issue_type,
+    )
+
+
+@pytest.fixture
+def store():
+    return TicketStore([
+        _ticket("CPE-10", "In Progress", "P1", ["VOC_Feedback"], stale=45, age=100, summary="Login fails"),
+        _ticket("CPE-9", "In Progress", "Low", ["voc_feedback", "ui"], stale=31, age=40),
+        _ticket("CPE-11", "Open", "Highest", [], stale=30, age=5, comments=3, summary="Security review"),
+        _ticket("OPS-1", "Done", "High", ["ui"], stale=2, age=300, issue_type="Task"),
+    ])
+
+
+def keys(tickets):
+    return [t.key for t in tickets]
+
+
+def test_get_is_case_insensitive(store):
+    assert store.get("cpe-9").key == "CPE-9"
+    assert store.get(" OPS-1 ").key == "OPS-1"
+    assert store.get("CPE-404") is None
+
+
+def test_filters_combine_with_and_and_repeat_with_or(store):
+    assert keys(store.find('status:"In Progress" label:VOC_Feedback stale>30', now=NOW)) == ["CPE-10", "CPE-9"]
+    assert keys(store.find("status:open status:done", now=NOW)) == ["CPE-11", "OPS-1"]
+    assert keys(store.find("label:ui -status:done", now=NOW)) == ["CPE-9"]
+    assert keys(store.find("type:task", now=NOW)) == ["OPS-1"]
+
+
+def test_range_bounds_match_ticket_day_counts(store):
+    assert keys(store.find("stale>30", now=NOW)) == ["CPE-10", "CPE-9"]
+    assert keys(store.find("stale>=30 stale<=31", now=NOW)) == ["CPE-9", "CPE-11"]
+    assert keys(store.find("age=40", now=NOW)) == ["CPE-9"]
+    assert keys(store.find("comments>0", now=NOW)) == ["CPE-11"]
+
+
+def test_sort_limit_and_text(store):
+    assert keys(store.find("sort:-priority", now=NOW)) == ["CPE-10", "CPE-11", "OPS-1", "CPE-9"]
+    assert keys(store.find("key:cpe-10 key:CPE-9 sort:key", now=NOW)) == ["CPE-9", "CPE-10"]
+    assert keys(store.find("sort:-stale limit:2", now=NOW)) == ["CPE-10", "CPE-9"]
+    assert keys(store.find("security", now=NOW)) == ["CPE-11"]
+
+
+@pytest.mark.parametrize("query", ['status:"open', "stale>soon", "colour:red", "sort:weight", "-stale>3", "status>1"])
+def test_bad_queries_raise(query):
+    with pytest.raises(QueryError):
+        parse_query(query)
+
+
+def test_queries_on_50k_tickets_take_milliseconds():
+    rng = random.Random(3)
+    tickets = [
+        _ticket(f"CPE-{n}", rng.choice(["Open", "In Progress", "Blocked", "Done"]),
+                rng.choice(["P1", "High", "Medium", "Low"]),
+                rng.sample(["VOC_Feedback", "ui", "backend", "infra"], rng.randrange(3)),
+                stale=rng.randrange(120), age=rng.randrange(800))
+        for n in range(50000)
+    ]
+    store = TicketStore(tickets)
+    start = time.perf_counter()
+    found = store.find('status:"In Progress" label:VOC_Feedback stale>30 sort:-priority', now=NOW)
+    elapsed = time.perf_counter() - start
+    expected = [t for t in tickets if t.status == "In Progress" and "VOC_Feedback" in t.labels
+                and (NOW - t.updated_ts) // DAY > 30]
+    assert set(keys(found)) == set(keys(expected))
+    # Loose bound for slow CI; this is a few milliseconds locally
+    assert elapsed < 0.25
+
+
+def test_assistant_focus_and_list_use_the_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    wa = WorkAssistant(jira_client=MagicMock(), llm_client=MagicMock(),
+                       session_manager=SessionManager(str(tmp_path / "state.json")))
+    now = int(time.time())
+    wa.current_tickets = [_ticket("A-1", stale=1, now=now), _ticket("A-2", stale=90, now=now)]
+    wa._ask_llm = MagicMock()
+    assert wa._find_ticket("a-2").key == "A-2"
+
+    wa._handle_user_input("focus stale>60")
+    assert wa.current_focus.key == "A-2"
+
+    # Replacing the ticket list rebuilds the indexes
+    wa.current_tickets = [_ticket("B-1")]
+    assert wa._find_ticket("A-1") is None
+    assert wa._find_ticket("b-1").key == "B-1"
+    wa._handle_user_input("list status:open")
+    wa._handle_user_input("find colour:red")
@@ -0,0 +1,126 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+import tracing
+from assistant import LLMClient, Ticket, WorkAssistant
+from session_manager import SessionManager
+from tracing import Tracer, profile_call, to_chrome_trace
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    fresh = Tracer()
+    monkeypatch.setattr(tracing, "_shared", fresh)
+    return fresh
+
+
+def _llm_call(tracer):
+    with tracer.span("llm"):
+        pass
+
+
+def test_nested_spans_form_one_operation(tracer):
+    with tracer.span("rescan"):
+        with tracer.span("sync"):
+            with tracer.span("jira.search"):
+                pass
+            with tracer.span("jira.search"):
+                pass
+        with ThreadPoolExecutor(2) as pool:
+            for future in [pool.submit(tracer.bind(_llm_call), tracer) for _ in range(3)]:
+                future.result()
+
+    [operation] = tracer.recent()
+    assert operation.name == "rescan"
+    assert list(operation.phases()) == ["sync", "sync/jira.search", "llm"]
+    assert len(operation.phases()["sync/jira.search"]) == 2
+    assert len(operation.phases()["llm"]) == 3
+    assert operation.untraced_ms() <= operation.duration_ms
+
+
+def test_background_threads_do_not_start_operations(tracer):
+    worker = threading.Thread(target=_llm_call, args=(tracer,))
+    worker.start()
+    worker.join()
+    assert tracer.recent() == []
+
+
+def test_breakdown_groups_phases_under_their_operation(tracer):
+    for _ in range(2):
+        with tracer.span("focus"):
+            with tracer.span("jira.changelog"):
+                pass
+            with tracer.span("llm"):
+                pass
+    with tracer.span("rescan"):
+        with tracer.span("sync"):
+            with tracer.span("session.save"):
+                pass
+    rows = tracer.breakdown()
+    assert [(path, calls) for path, calls, _, _ in rows] == [
+        ("focus/jira.changelog", 2), ("focus/llm", 2), ("rescan/sync", 1), ("rescan/sync/session.save", 1),
+    ]
+    assert [op.name for op in tracer.recent(1)] == ["rescan"]
+
+
+def test_trace_file_is_loadable_as_chrome_trace(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer(trace_file=str(path))
+    with tracer.span("rescan", tickets=3):
+        with tracer.span("sync"):
+            pass
+    tracer.close()
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert events[0]["ph"] == "M" and events[0]["name"] == "thread_name"
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert spans["rescan"]["cat"] == "operation" and spans["rescan"]["args"]["tickets"] == 3
+    assert spans["sync"]["args"]["operation"] == "rescan"
+    assert spans["sync"]["ts"] >= spans["rescan"]["ts"] and spans["sync"]["dur"] <= spans["rescan"]["dur"]
+
+    out = tmp_path / "trace.json"
+    assert to_chrome_trace(str(path), str(out)) == 3
+    assert len(json.loads(out.read_text())["traceEvents"]) == 3
+
+
+def test_profile_call_reports_slowest_functions():
+    def busy():
+        return sum(i * i for i in range(20000))
+
+    result, rows = profile_call(busy, top=5)
+    assert result == busy()
+    assert len(rows) <= 5
+    assert any("busy" in where for where, _, _, _ in rows)
+
+
+def _ticket(key):
+    now = datetime.now()
+    return Ticket(key=key, summary=f"Ticket {key}", description="", priority="P2", status="Open", assignee=None,
+                  created=now - timedelta(days=3), updated=now, comments_count=0, labels=[], issue_type="Task")
+
+
+def test_rescan_is_broken_down_by_phase(tracer, tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("SYNC_MODE", "full")
+    monkeypatch.setenv("ANALYSIS_MODE", "single")
+    monkeypatch.setenv("LLM_STREAM", "0")
+    jira = MagicMock()
+    jira.get_my_tickets.return_value = [_ticket("A-1"), _ticket("A-2")]
+    llm = LLMClient()
+    llm._complete = lambda prompt, on_token=None, schema=None: "Start with A-2."
+    wa = WorkAssistant(jira_client=jira, llm_client=llm, session_manager=SessionManager(str(tmp_path / "s.json")))
+
+    wa._handle_user_input("rescan")
+    [operation] = tracer.recent()
+    assert operation.name == "rescan"
+    assert {"cache.clear", "sync", "sync/session.save", "analysis", "hash", "cache.store"} <= set(operation.phases())
+
+    wa._handle_user_input("stats 5")
+    wa._handle_user_input("stats soon")
+    assert wa._handle_user_input("profile rescan") is False
+    assert [op.name for op in tracer.recent()] == ["rescan", "rescan"]
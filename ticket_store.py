@@ -0,0 +1,227 @@
+import re
+import shlex
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from priority_engine import priority_rank
+
+_DAY = 86400
+
+# Exact-match fields: query name -> how a ticket's values for it are read
+INDEXED_FIELDS: Dict[str, Callable[[Any], List[str]]] = {
+    "status": lambda t: [t.status],
+    "priority": lambda t: [t.priority],
+    "label": lambda t: list(t.labels),
+    "type": lambda t: [t.issue_type],
+    "assignee": lambda t: [t.assignee],
+}
+# Numeric fields usable with > >= < <= = (ages are in whole days)
+RANGE_FIELDS = ("stale", "age", "comments")
+SORT_FIELDS = ("priority", "stale", "age", "comments", "key", "status", "updated", "created")
+ALIASES = {"labels": "label", "issue_type": "type", "issuetype": "type", "comment": "comments"}
+
+_TOKEN = re.compile(r"^(-?)([a-z_]+)(>=|<=|>|<|=|:)(.*)$", re.IGNORECASE)
+_KEY = re.compile(r"^(.*?)-(\d+)$")
+
+
+class QueryError(ValueError):
+    """A ``find`` query that can't be parsed; the message is shown to the user."""
+
+
+def _norm(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def _key_order(key: str) -> Tuple[str, int]:
+    # CPE-9 before CPE-10
+    match = _KEY.match(key)
+    return (match.group(1), int(match.group(2))) if match else (key, 0)
+
+
+@dataclass
+class TicketQuery:
+    """Parsed form of a query such as ``status:"In Progress" stale>30 sort:-priority``."""
+
+    include: Dict[str, List[str]] = field(default_factory=dict)
+    exclude: Dict[str, List[str]] = field(default_factory=dict)
+    ranges: List[Tuple[str, Optional[int], Optional[int]]] = field(default_factory=list)
+    text: List[str] = field(default_factory=list)
+    sort: List[Tuple[str, bool]] = field(default_factory=list)
+    limit: Optional[int] = None
+
+
+def _day_bounds(op: str, number: int) -> Tuple[Optional[int], Optional[int]]:
+    """Inclusive [low, high] for a comparison; None means unbounded."""
+    return {
+        ">": (number + 1, None), ">=": (number, None),
+        "<": (None, number - 1), "<=": (None, number),
+        "=": (number, number), ":": (number, number),
+    }[op]
+
+
+def parse_query(query: str) -> TicketQuery:
+    """Parse the ``find`` syntax.
+
+    ``field:value`` matches exactly (case-insensitive); repeating a field ORs
+    its values and ``-field:value`` excludes. ``stale``, ``age`` and
+    ``comments`` take comparisons (``stale>30``). ``sort:-priority,stale``
+    orders results (``-`` = descending, most urgent first for priority) and
+    ``limit:N`` caps them. Bare words must all appear in the key or summary.
+    """
+    try:
+        tokens = shlex.split(query)
+    except ValueError as e:
+        raise QueryError(f"Couldn't parse query: {e}")
+
+    parsed = TicketQuery()
+    for token in tokens:
+        match = _TOKEN.match(token)
+        if not match:
+            parsed.text.append(token.lower())
+            continue
+        negate, name, op, value = match.groups()
+        name = ALIASES.get(name.lower(), name.lower())
+        if negate and name not in INDEXED_FIELDS:
+            raise QueryError(f"Only {', '.join(INDEXED_FIELDS)} can be excluded with '-'")
+        if name in INDEXED_FIELDS:
+            if op != ":" and op != "=":
+                raise QueryError(f"'{name}' only supports ':' (e.g. {name}:value)")
+            target = parsed.exclude if negate else parsed.include
+            target.setdefault(name, []).append(_norm(value))
+        elif name in RANGE_FIELDS:
+            try:
+                number = int(value)
+            except ValueError:
+                raise QueryError(f"'{name}' needs a whole number, got '{value}'")
+            parsed.ranges.append((name, *_day_bounds(op, number)))
+        elif name == "key" and op in (":", "="):
+            parsed.include.setdefault("key", []).append(value.upper())
+        elif name == "sort" and op == ":":
+            for part in filter(None, value.split(",")):
+                descending = part.startswith("-")
+                sort_field = part.lstrip("-+").lower()
+                if sort_field not in SORT_FIELDS:
+                    raise QueryError(f"Can't sort by '{sort_field}'. Try one of: {', '.join(SORT_FIELDS)}")
+                parsed.sort.append((sort_field, descending))
+        elif name == "limit" and op == ":":
+            try:
+                parsed.limit = max(0, int(value))
+            except ValueError:
+                raise QueryError(f"'limit' needs a whole number, got '{value}'")
+        elif name == "text" and op == ":":
+            parsed.text.append(value.lower())
+        else:
+            known = ", ".join(list(INDEXED_FIELDS) + list(RANGE_FIELDS) + ["key", "text", "sort", "limit"])
+            raise QueryError(f"Unknown filter '{name}'. Known filters: {known}")
+    return parsed
+
+
+class _RangeIndex:
+    """Ticket positions ordered by one integer value, for bisected range lookups."""
+
+    def __init__(self, values: Sequence[int]) -> None:
+        order = sorted(range(len(values)), key=values.__getitem__)
+        self.values = [values[i] for i in order]
+        self.positions = order
+
+    def between(self, low: Optional[int], high: Optional[int]) -> Set[int]:
+        start = 0 if low is None else bisect_left(self.values, low)
+        end = len(self.values) if high is None else bisect_right(self.values, high)
+        return set(self.positions[start:end])
+
+
+class TicketStore:
+    """In-memory ticket collection with a key index and secondary indexes.
+
+    Built once per ticket list: keys hash to positions; status, priority,
+    label, type and assignee map to position sets; ``updated``/``created``
+    timestamps and comment counts are kept sorted so staleness and age
+    windows are two bisections. A query intersects the smallest sets first
+    and only scans the survivors for free text.
+    """
+
+    def __init__(self, tickets: Sequence[Any]) -> None:
+        self.tickets = list(tickets)
+        self._by_key: Dict[str, int] = {}
+        self._indexes: Dict[str, Dict[str, Set[int]]] = {name: {} for name in INDEXED_FIELDS}
+        for position, ticket in enumerate(self.tickets):
+            self._by_key.setdefault(ticket.key.upper(), position)
+            for name, read in INDEXED_FIELDS.items():
+                index = self._indexes[name]
+                for value in read(ticket):
+                    index.setdefault(_norm(value), set()).add(position)
+        self._updated = _RangeIndex([t.updated_ts for t in self.tickets])
+        self._created = _RangeIndex([t.created_ts for t in self.tickets])
+        self._comments = _RangeIndex([t.comments_count or 0 for t in self.tickets])
+
+    def __len__(self) -> int:
+        return len(self.tickets)
+
+    def get(self, key: str) -> Optional[Any]:
+        position = self._by_key.get(key.strip().upper())
+        return self.tickets[position] if position is not None else None
+
+    def values(self, name: str) -> List[str]:
+        """Distinct normalized values of an indexed field, e.g. for hints."""
+        return sorted(value for value in self._indexes[name] if value)
+
+    def _range(self, name: str, low: Optional[int], high: Optional[int], now: int) -> Set[int]:
+        if name == "comments":
+            return self._comments.between(low, high)
+        index = self._updated if name == "stale" else self._created
+        # days = (now - ts) // DAY, so days in [low, high] <=> ts in (now - (high+1)*DAY, now - low*DAY]
+        ts_low = None if high is None else now - (high + 1) * _DAY + 1
+        ts_high = None if low is None else now - low * _DAY
+        return index.between(ts_low, ts_high)
+
+    def find(self, query: str, now: Optional[int] = None) -> List[Any]:
+        return self.run(parse_query(query), now)
+
+    def run(self, query: TicketQuery, now: Optional[int] = None) -> List[Any]:
+        now = int(time.time()) if now is None else now
+        candidates: List[Set[int]] = []
+        for name, wanted in query.include.items():
+            if name == "key":
+                positions = {self._by_key[key] for key in wanted if key in self._by_key}
+            else:
+                index = self._indexes[name]
+                positions = set().union(*(index.get(value, set()) for value in wanted))
+            candidates.append(positions)
+        for name, low, high in query.ranges:
+            candidates.append(self._range(name, low, high, now))
+
+        if candidates:
+            candidates.sort(key=len)
+            matched = candidates[0].intersection(*candidates[1:])
+        else:
+            matched = set(range(len(self.tickets)))
+        for name, unwanted in query.exclude.items():
+            index = self._indexes[name]
+            for value in unwanted:
+                matched -= index.get(value, set())
+
+        results = [self.tickets[i] for i in sorted(matched)]
+        if query.text:
+            results = [
+                t for t in results
+                if all(term in f"{t.key} {t.summary}".lower() for term in query.text)
+            ]
+        for sort_field, descending in reversed(query.sort):
+            results.sort(key=self._sort_key(sort_field, now), reverse=descending)
+        return results[:query.limit] if query.limit is not None else results
+
+    @staticmethod
+    def _sort_key(name: str, now: int) -> Callable[[Any], Any]:
+        return {
+            # Importance, so that sort:-priority puts the most urgent first
+            "priority": lambda t: -priority_rank(t.priority),
+            "stale": lambda t: (now - t.updated_ts) // _DAY,
+            "age": lambda t: (now - t.created_ts) // _DAY,
+            "comments": lambda t: t.comments_count or 0,
+            "key": lambda t: _key_order(t.key),
+            "status": lambda t: _norm(t.status),
+            "updated": lambda t: t.updated_ts,
+            "created": lambda t: t.created_ts,
+        }[name]
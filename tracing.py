@@ -0,0 +1,251 @@
+"""Lightweight spans for timing the phases of a session.
+
+A span opened on the main thread with no span already open starts an
+*operation* (``start_session``, ``rescan``, ``focus``...); spans opened inside
+it become its phases. Worker threads join the operation through ``bind()``;
+spans on unrelated background threads (e.g. the suggestion prefetch) are only
+exported, never counted towards an operation.
+
+The last ``TRACE_HISTORY`` operations are kept for the ``stats`` command.
+With ``TRACE_FILE`` set, every span is also appended to that file as a
+Chrome trace event, one JSON object per line. ``python tracing.py
+trace.jsonl trace.json`` wraps them up for chrome://tracing or Perfetto.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class Span:
+    name: str
+    path: str                 # slash-joined names from the operation down, e.g. "rescan/sync/jira.search"
+    start: float              # time.perf_counter()
+    end: float = 0.0
+    thread: int = 0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+
+@dataclass
+class Operation:
+    name: str
+    root: Span
+    started_at: datetime
+    spans: List[Span] = field(default_factory=list)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    def phases(self) -> Dict[str, List[float]]:
+        """Durations in ms by phase path (relative to the operation), in the order phases first started."""
+        prefix = len(self.root.path) + 1
+        phases: Dict[str, List[float]] = {}
+        for span in sorted(self.spans, key=lambda s: s.start):
+            phases.setdefault(span.path[prefix:], []).append(span.duration_ms)
+        return phases
+
+    def untraced_ms(self) -> float:
+        """Operation time not covered by any top-level phase on the operation's own thread."""
+        depth = self.root.path.count("/") + 1
+        covered = sum(s.duration_ms for s in self.spans
+                      if s.thread == self.root.thread and s.path.count("/") == depth)
+        return max(0.0, self.duration_ms - covered)
+
+
+class Tracer:
+    """Records spans; see the module docstring for how operations are formed."""
+
+    def __init__(self, history: Optional[int] = None, trace_file: Optional[str] = None) -> None:
+        self.history = history or int(os.getenv("TRACE_HISTORY", "50"))
+        self.trace_file = trace_file if trace_file is not None else (os.getenv("TRACE_FILE") or None)
+        self.operations: Deque[Operation] = deque(maxlen=self.history)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._epoch = time.perf_counter()
+        self._out = None
+        self._named_threads: set = set()
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Span]:
+        local = self._local
+        stack: Optional[List[Span]] = getattr(local, "stack", None)
+        if stack is None:
+            stack = local.stack = []
+        operation: Optional[Operation] = getattr(local, "operation", None)
+        parent = stack[-1] if stack else None
+        span = Span(name, f"{parent.path}/{name}" if parent else name, time.perf_counter(),
+                    thread=threading.get_ident(), attrs=attrs)
+        started = None
+        if parent is None and operation is None and threading.current_thread() is threading.main_thread():
+            started = operation = local.operation = Operation(name, span, datetime.now())
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            with self._lock:
+                if started is not None:
+                    local.operation = None
+                    self.operations.append(started)
+                elif operation is not None:
+                    operation.spans.append(span)
+            if self.trace_file:
+                self._export(span, operation)
+
+    def bind(self, fn: Callable) -> Callable:
+        """Wrap ``fn`` so spans it opens on a worker thread nest under the caller's current span."""
+        stack = getattr(self._local, "stack", None)
+        if not stack:
+            return fn
+        parent, operation = stack[-1], getattr(self._local, "operation", None)
+
+        @functools.wraps(fn)
+        def run(*args: Any, **kwargs: Any) -> Any:
+            local = self._local
+            saved = getattr(local, "stack", None), getattr(local, "operation", None)
+            local.stack, local.operation = [parent], operation
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                local.stack, local.operation = saved
+        return run
+
+    def recent(self, last: Optional[int] = None) -> List[Operation]:
+        with self._lock:
+            operations = list(self.operations)
+        return operations[-last:] if last else operations
+
+    def breakdown(self, last: Optional[int] = None) -> List[Tuple[str, int, float, float]]:
+        """``(phase path, calls, total ms, max ms)`` over the last operations, grouped as a tree.
+
+        Phases are keyed by operation name, so ``rescan/sync`` and
+        ``start_session/sync`` stay apart.
+        """
+        order: Dict[str, int] = {}
+        totals: Dict[str, List[float]] = {}
+        for operation in self.recent(last):
+            for path, durations in operation.phases().items():
+                key = f"{operation.name}/{path}"
+                order.setdefault(key, len(order))
+                totals.setdefault(key, []).extend(durations)
+                # Make sure every ancestor sorts before its children
+                parts = key.split("/")
+                for n in range(1, len(parts)):
+                    order.setdefault("/".join(parts[:n]), order[key])
+
+        def tree_order(key: str) -> Tuple[int, ...]:
+            parts = key.split("/")
+            return tuple(order["/".join(parts[:n])] for n in range(1, len(parts) + 1))
+
+        return [(key, len(totals[key]), sum(totals[key]), max(totals[key]))
+                for key in sorted(totals, key=tree_order)]
+
+    def _export(self, span: Span, operation: Optional[Operation]) -> None:
+        event = {
+            "name": span.name, "cat": "operation" if operation and span is operation.root else "phase",
+            "ph": "X", "ts": round((span.start - self._epoch) * 1e6, 1), "dur": round((span.end - span.start) * 1e6, 1),
+            "pid": os.getpid(), "tid": span.thread,
+            "args": {**span.attrs, **({"operation": operation.name} if operation else {})},
+        }
+        lines = [json.dumps(event, default=str)]
+        with self._lock:
+            if span.thread not in self._named_threads:
+                # Lets trace viewers label each lane with the thread's name
+                self._named_threads.add(span.thread)
+                lines.insert(0, json.dumps({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": span.thread,
+                                            "args": {"name": threading.current_thread().name}}))
+            if self._out is None:
+                self._out = open(self.trace_file, "a", encoding="utf-8", buffering=1)
+            self._out.write("\n".join(lines) + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._out is not None:
+                self._out.close()
+                self._out = None
+
+
+def profile_call(call: Callable[[], Any], top: int = 15) -> Tuple[Any, List[Tuple[str, int, float, float]]]:
+    """Run ``call`` under cProfile; returns its result and the ``top`` functions by cumulative time.
+
+    Each row is ``(function, calls, own seconds, cumulative seconds)``.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = call()
+    finally:
+        profiler.disable()
+    stats = pstats.Stats(profiler).stats
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.items():
+        where = f"{os.path.basename(filename)}:{line}({function})" if line else function
+        rows.append((where, calls, own, cumulative))
+    rows.sort(key=lambda row: -row[3])
+    return result, rows[:top]
+
+
+_shared: Optional[Tracer] = None
+_shared_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = Tracer()
+    return _shared
+
+
+def span(name: str, **attrs: Any):
+    return get_tracer().span(name, **attrs)
+
+
+def traced(name: str) -> Callable:
+    """Decorate a function so each call is a span on the shared tracer."""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with get_tracer().span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def bind(fn: Callable) -> Callable:
+    return get_tracer().bind(fn)
+
+
+def to_chrome_trace(jsonl_path: str, out_path: str) -> int:
+    """Wrap a JSONL span export as a ``{"traceEvents": [...]}`` file; returns the event count."""
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python tracing.py TRACE.jsonl OUT.json")
+    print(f"Wrote {to_chrome_trace(sys.argv[1], sys.argv[2])} events to {sys.argv[2]}")